@@ -3,133 +3,86 @@
 Analyze SwiftyBox test results and generate comprehensive reports
 """
 
-import re
+import argparse
+import os
 import sys
+import time
 from collections import defaultdict
-from dataclasses import dataclass
-from typing import List, Dict
-
-@dataclass
-class TestSuite:
-    name: str
-    total: int
-    passed: int
-    failed: int
-    duration: float
-
-@dataclass
-class TestFailure:
-    suite: str
-    test_name: str
-    reason: str
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+
+from testlog import (CaseFinished, EventParser, TestCase, TestRun, TestSuite,
+                     command_name, is_xunit, iter_events, load_checkpoint, load_run,
+                     read_complete_lines, resume_run, save_checkpoint)
+from testaggregate import expand_logs, format_aggregate, is_multi_log, summarize_logs
+from testdiff import case_index, diff_indexes, format_diff
+from testindex import case_ranges, extract_cases, load_indexed_run, match_cases
+from testreports import RunSummary, summarize_run, write_reports
+from stageprofile import StageProfile, add_profile_argument
 
 def parse_test_results(filename: str = "test-results.txt"):
-    """Parse Swift test output and extract statistics"""
-
-    suites = []
-    failures = []
-    current_suite = None
-
-    with open(filename, 'r') as f:
-        content = f.read()
-
-    # Extract test suite summaries
-    suite_pattern = r"Test Suite '(\w+)' (passed|failed) at.*?Executed (\d+) tests?, with (\d+) failures?"
-    for match in re.finditer(suite_pattern, content, re.MULTILINE | re.DOTALL):
-        name = match.group(1)
-        status = match.group(2)
-        total = int(match.group(3))
-        failed = int(match.group(4))
-        passed = total - failed
-
-        # Skip meta suites
-        if name not in ['All tests', 'debug.xctest']:
-            suites.append(TestSuite(
-                name=name,
-                total=total,
-                passed=passed,
-                failed=failed,
-                duration=0.0
-            ))
-
-    # Extract individual test failures
-    failure_pattern = r"Test Case '(\w+)\.(\w+)' failed"
-    for match in re.finditer(failure_pattern, content):
-        suite = match.group(1)
-        test = match.group(2)
-        failures.append(TestFailure(
-            suite=suite,
-            test_name=test,
-            reason="See detailed output"
-        ))
-
-    return suites, failures
-
-def analyze_by_category(suites: List[TestSuite]) -> Dict[str, List[TestSuite]]:
-    """Group test suites by implementation category"""
-
-    # Command categories based on PROGRESS.md
-    nofork_commands = {
-        'EchoTests', 'TrueTests', 'FalseTests', 'PwdTests', 'BasenameTests',
-        'DirnameTests', 'PrintfTests', 'TestTests', 'SeqTests', 'YesTests',
-        'LogNameTests', 'WhoamiTests', 'HostnameTests', 'UnameTests',
-        'UsleepTests', 'SleepTests', 'NohupTests', 'EnvTests', 'WcTests',
-        'HeadTests', 'TailTests', 'CatTests', 'TacTests', 'CutTests',
-        'TrTests', 'TeeTests', 'GrepTests', 'SedTests', 'AwkTests',
-        'XargsTests', 'ReadlinkTests', 'RealpathTests', 'FactorTests',
-        'ExprTests', 'MktempTests', 'DateTests', 'IdTests', 'HostidTests',
-        'Md5sumTests', 'Sha1sumTests', 'Sha256sumTests', 'Sha512sumTests',
-        'RevTests', 'ExpandTests', 'UnexpandTests', 'HexdumpTests',
-        'ShufTests', 'StatTests', 'DuTests', 'DfTests'
-    }
-
-    file_ops = {
-        'LsTests', 'CpTests', 'MvTests', 'RmTests', 'LnTests',
-        'ChmodTests', 'ChownTests', 'ChgrpTests', 'MkdirTests',
-        'RmdirTests', 'TouchTests'
-    }
-
-    text_processing = {
-        'SortTests', 'UniqTests', 'CommTests', 'FoldTests',
-        'PasteTests', 'NlTests', 'DiffTests', 'PatchTests',
-        'CmpTests', 'StringsTests', 'OdTests'
-    }
-
-    unimplemented = {
-        'AshTests', 'CalTests', 'TarTests', 'GzipTests', 'GunzipTests',
-        'Bunzip2Tests', 'BzcatTests', 'UncompressTests', 'DdTests',
-        'FindTests', 'WhichTests', 'TreeTests', 'PidofTests',
-        'WgetTests', 'XxdTests', 'TsortTests', 'SumTests', 'UptimeTests'
-    }
-
-    categories = {
-        'NOFORK (Phases 1-5)': [],
-        'File Operations (Phase 6)': [],
-        'Text Processing (Phase 7+)': [],
-        'Unimplemented': [],
-        'Other': []
-    }
-
-    for suite in suites:
-        if suite.name in nofork_commands:
-            categories['NOFORK (Phases 1-5)'].append(suite)
-        elif suite.name in file_ops:
-            categories['File Operations (Phase 6)'].append(suite)
-        elif suite.name in text_processing:
-            categories['Text Processing (Phase 7+)'].append(suite)
-        elif suite.name in unimplemented:
-            categories['Unimplemented'].append(suite)
-        else:
-            categories['Other'].append(suite)
-
-    return categories
-
-def print_summary(suites: List[TestSuite], failures: List[TestFailure]):
+    """Parse Swift test output into (suites, failures); see testlog.load_run for the full run"""
+
+    run = load_run(filename)
+    return run.suites, run.failures
+
+def follow_log(filename: str, checkpoint: str, interval: float = 2.0) -> TestRun:
+    """Tail a growing log and print running totals until the run finishes
+
+    Only bytes appended since the last poll are parsed. Progress is saved to
+    `checkpoint` after every poll, so a later invocation can resume from it.
+    """
+
+    offset, parser, run = load_checkpoint(checkpoint, filename)
+    passed = sum(1 for c in run.cases if c.status == 'passed')
+    failed = sum(1 for c in run.cases if c.status == 'failed')
+    failing_commands = {command_name(f.suite) for f in run.failures}
+
+    print(f"Following {filename} (Ctrl-C to stop)...")
+    try:
+        while not parser.finished:
+            if not os.path.exists(filename):
+                time.sleep(interval)
+                continue
+            if os.path.getsize(filename) < offset:
+                print("Log was truncated, starting over")
+                offset, parser, run = 0, EventParser(), TestRun()
+                passed = failed = 0
+                failing_commands = set()
+
+            lines, offset = read_complete_lines(filename, offset)
+            if not lines:
+                time.sleep(interval)
+                continue
+
+            for event in iter_events(lines, parser):
+                run.add(event)
+                if isinstance(event, CaseFinished):
+                    if event.status == 'passed':
+                        passed += 1
+                    elif event.status == 'failed':
+                        failed += 1
+                        failing_commands.add(command_name(event.suite))
+                        print(f"  ❌ {event.suite}.{event.test_name}")
+            save_checkpoint(checkpoint, filename, offset, parser, run)
+
+            print(f"[{time.strftime('%H:%M:%S')}] {passed} passed, {failed} failed, "
+                  f"{len(run.suites)} suites done"
+                  + (f" | failing: {', '.join(sorted(failing_commands))}" if failing_commands else ""))
+    except KeyboardInterrupt:
+        print("\nStopped following; checkpoint saved to", checkpoint)
+
+    return run
+
+def print_summary(summary: RunSummary):
     """Print comprehensive test summary"""
 
-    total_tests = sum(s.total for s in suites)
-    total_passed = sum(s.passed for s in suites)
-    total_failed = sum(s.failed for s in suites)
+    suites, failures = summary.run.suites, summary.run.failures
+    total_tests = summary.totals.total
+    total_passed = summary.totals.passed
+    total_failed = summary.totals.failed
 
     print("=" * 80)
     print("SWIFTYBOX TEST RESULTS SUMMARY")
@@ -141,16 +94,13 @@ def print_summary(suites: List[TestSuite], failures: List[TestFailure]):
     print(f"Failed:            {total_failed} ({100*total_failed/total_tests:.1f}%)")
     print()
 
-    # Group by category
-    categories = analyze_by_category(suites)
-
-    for cat_name, cat_suites in categories.items():
+    for cat_name, cat_suites in summary.categories.items():
         if not cat_suites:
             continue
 
-        cat_total = sum(s.total for s in cat_suites)
-        cat_passed = sum(s.passed for s in cat_suites)
-        cat_failed = sum(s.failed for s in cat_suites)
+        cat_total = summary.category_totals[cat_name].total
+        cat_passed = summary.category_totals[cat_name].passed
+        cat_failed = summary.category_totals[cat_name].failed
 
         print("-" * 80)
         print(f"{cat_name}")
@@ -186,90 +136,202 @@ def print_summary(suites: List[TestSuite], failures: List[TestFailure]):
             print(f"{i:2}. {suite.name:25} {suite.failed:3} failures ({suite.passed}/{suite.total} passed)")
     print()
 
-def generate_failure_tracker(suites: List[TestSuite], failures: List[TestFailure]):
-    """Generate TEST_FAILURE_TRACKER.md"""
-
-    content = """# Test Failure Tracker
+    clusters = summary.clusters
+    if clusters:
+        print("=" * 80)
+        print(f"TOP FAILURE CLUSTERS ({len(failures)} failures in {len(clusters)} clusters)")
+        print("=" * 80)
+        for cluster in clusters[:10]:
+            commands = cluster.commands
+            shown = ", ".join(commands[:6]) + (f" +{len(commands) - 6} more" if len(commands) > 6 else "")
+            print(f"{len(cluster.failures):4}x [{cluster.cluster_id}] {cluster.signature[:100]}")
+            print(f"       commands: {shown}")
+        print()
 
-**Generated:** Automated analysis
-**Status:** Initial test run complete
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
 
-## Overview
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
 
-"""
+def print_timing_report(suites: List[TestSuite], cases: List[TestCase], top: int = 20):
+    """Print per-command latency percentiles, slowest cases and suite wall-time share"""
 
-    total_tests = sum(s.total for s in suites)
-    total_passed = sum(s.passed for s in suites)
-    total_failed = sum(s.failed for s in suites)
+    durations_by_command = defaultdict(list)
+    for case in cases:
+        durations_by_command[command_name(case.suite)].append(case.duration)
 
-    content += f"- **Total Tests:** {total_tests}\n"
-    content += f"- **Passed:** {total_passed} ({100*total_passed/total_tests:.1f}%)\n"
-    content += f"- **Failed:** {total_failed} ({100*total_failed/total_tests:.1f}%)\n"
-    content += f"- **Test Suites:** {len(suites)}\n\n"
+    print("=" * 80)
+    print("PER-COMMAND TEST LATENCY (seconds)")
+    print("=" * 80)
+    print(f"{'Command':25} {'Cases':>6} {'p50':>8} {'p95':>8} {'max':>8} {'total':>9}")
+    by_total = sorted(durations_by_command.items(), key=lambda item: -sum(item[1]))
+    for command, durations in by_total:
+        durations.sort()
+        print(f"{command:25} {len(durations):6} {percentile(durations, 50):8.3f} "
+              f"{percentile(durations, 95):8.3f} {durations[-1]:8.3f} {sum(durations):9.3f}")
+    print()
 
-    # Category breakdown
-    categories = analyze_by_category(suites)
+    print("=" * 80)
+    print(f"TOP {top} SLOWEST TEST CASES")
+    print("=" * 80)
+    slowest = sorted(cases, key=lambda x: -x.duration)[:top]
+    for i, case in enumerate(slowest, 1):
+        status = "✅" if case.passed else "❌"
+        print(f"{i:2}. {case.duration:8.3f}s {status} {case.suite}.{case.test_name}")
+    print()
 
-    content += "## Status by Category\n\n"
+    wall_time = sum(s.duration for s in suites)
+    print("=" * 80)
+    print("SUITE SHARE OF TOTAL WALL TIME")
+    print("=" * 80)
+    print(f"Total: {wall_time:.3f}s across {len(suites)} suites")
+    for suite in sorted(suites, key=lambda x: -x.duration):
+        share = 100 * suite.duration / wall_time if wall_time > 0 else 0.0
+        print(f"  {suite.name:25} {suite.duration:8.3f}s {share:5.1f}%")
+    print()
 
-    for cat_name, cat_suites in categories.items():
-        if not cat_suites:
-            continue
+def extract_command(argv: List[str]) -> int:
+    """`extract LOG TEST...`: print the log output of individual test cases"""
+    parser = argparse.ArgumentParser(
+        prog="analyze-test-results.py extract",
+        description="Print everything a test case logged, using the log's side-car index "
+                    "(<log>.index, built by any analysis of the log or on first use)")
+    parser.add_argument("log", help="swift test output")
+    parser.add_argument("tests", nargs="+", metavar="TEST",
+                        help="Suite.test, -[Module.Suite test], or a Suite for all its cases")
+    args = parser.parse_args(argv)
 
-        cat_total = sum(s.total for s in cat_suites)
-        cat_passed = sum(s.passed for s in cat_suites)
-        cat_failed = sum(s.failed for s in cat_suites)
-
-        content += f"### {cat_name}\n\n"
-        content += f"- Suites: {len(cat_suites)}\n"
-        content += f"- Tests: {cat_total}\n"
-        content += f"- Passed: {cat_passed} ({100*cat_passed/cat_total:.1f}%)\n" if cat_total > 0 else "- Passed: 0\n"
-        content += f"- Failed: {cat_failed} ({100*cat_failed/cat_total:.1f}%)\n\n" if cat_total > 0 else "- Failed: 0\n\n"
-
-        # List suites
-        for suite in sorted(cat_suites, key=lambda x: x.name):
-            status = "✅" if suite.failed == 0 else "❌"
-            content += f"{status} **{suite.name}**: {suite.passed}/{suite.total} passed"
-            if suite.failed > 0:
-                content += f" ({suite.failed} failed)"
-            content += "\n"
-        content += "\n"
-
-    # Detailed failures
-    content += "## Detailed Failure List\n\n"
-    content += "Test suites with failures (sorted by failure count):\n\n"
-
-    failed_suites = sorted([s for s in suites if s.failed > 0], key=lambda x: -x.failed)
-
-    for suite in failed_suites:
-        content += f"### {suite.name}\n\n"
-        content += f"- **Failed:** {suite.failed}/{suite.total}\n"
-        content += f"- **Passed:** {suite.passed}/{suite.total}\n"
-        content += f"- **File:** `Tests/SwiftyBoxTests/Consolidated/{suite.name}.swift`\n\n"
-        content += "**Action Items:**\n"
-        content += "- [ ] Review test expectations\n"
-        content += "- [ ] Fix implementation issues\n"
-        content += "- [ ] Re-run tests\n\n"
-
-    return content
+    try:
+        ranges = case_ranges(args.log)
+    except FileNotFoundError:
+        print(f"Error: Could not find {args.log}", file=sys.stderr)
+        return 1
+    keys = []
+    for name in args.tests:
+        matched = match_cases(ranges, name)
+        if not matched:
+            print(f"Error: no test case {name} in {args.log}", file=sys.stderr)
+            return 1
+        keys.extend(matched)
+
+    out = sys.stdout.buffer
+    for key, output in extract_cases(args.log, ranges, keys):
+        if len(keys) > 1:
+            out.write(f"==> {key} <==\n".encode())
+        out.write(output)
+    return 0
 
 if __name__ == "__main__":
-    filename = sys.argv[1] if len(sys.argv) > 1 else "test-results.txt"
+    if sys.argv[1:2] == ["extract"]:
+        sys.exit(extract_command(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(description="Analyze SwiftyBox test results",
+                                     epilog="Use `%(prog)s extract LOG TEST...` to print the "
+                                            "output of individual test cases")
+    # Use '-' to read from a pipe: swift test 2>&1 | analyze-test-results.py -
+    parser.add_argument("filename", nargs="?", default="test-results.txt",
+                        help="swift test output or --xunit-output XML to analyze "
+                             "(default: test-results.txt); "
+                             "a directory or quoted glob aggregates many logs")
+    parser.add_argument("--timing", action="store_true",
+                        help="Also print per-command latency and slowest test cases")
+    parser.add_argument("--top", type=int, default=20,
+                        help="Number of slowest test cases in the timing report")
+    parser.add_argument("--tracker-update", metavar="PATH",
+                        help="Also write the per-command tracker update (test-tracker-update.md)")
+    parser.add_argument("--baseline-table", metavar="PATH",
+                        help="Also write the baseline markdown table")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Also write the run as a JSON report")
+    parser.add_argument("--junit", metavar="PATH",
+                        help="Also write the run as JUnit XML for CI dashboards")
+    parser.add_argument("--follow", action="store_true",
+                        help="Tail a log that is still being written and report progress live")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="Resume parsing from (and update) this checkpoint "
+                             "(default with --follow: <log>.checkpoint)")
+    parser.add_argument("--interval", type=float, default=2.0,
+                        help="Seconds between polls in --follow mode")
+    parser.add_argument("--diff", metavar="BASE_LOG",
+                        help="Compare BASE_LOG against the log instead of reporting; "
+                             "exits 1 if any test regressed")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Worker processes when aggregating many logs (default: CPU count)")
+    parser.add_argument("--pattern", default="*.log",
+                        help="Log file pattern when the argument is a directory (default: *.log)")
+    parser.add_argument("--no-index", action="store_true",
+                        help="Do not save the case byte-range index (<log>.index) used by "
+                             "`extract` next to the log")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    filename = args.filename
+    profile = StageProfile.from_arg(args.profile)
+
+    if args.follow and filename == "-":
+        parser.error("--follow needs a log file, not stdin")
+    if (args.follow or args.checkpoint) and os.path.isfile(filename) and is_xunit(filename):
+        parser.error("--follow and --checkpoint need a text log, not xUnit XML")
+    checkpoint = args.checkpoint or (f"{filename}.checkpoint" if args.follow else None)
+
+    if is_multi_log(filename):
+        logs = expand_logs(filename, args.pattern)
+        if not logs:
+            print(f"Error: no logs match {filename}")
+            sys.exit(1)
+        with profile.stage("aggregate"):
+            aggregate = summarize_logs(logs, args.jobs)
+        print(format_aggregate(aggregate))
+        profile.finish()
+        sys.exit(0)
+
+    if args.diff:
+        try:
+            with profile.stage("diff"):
+                diff = diff_indexes(case_index(args.diff), case_index(filename))
+        except FileNotFoundError as e:
+            print(f"Error: Could not find {e.filename}")
+            sys.exit(1)
+        print(format_diff(diff, args.diff, filename))
+        profile.finish()
+        sys.exit(1 if diff.regressions else 0)
 
     try:
-        suites, failures = parse_test_results(filename)
-        print_summary(suites, failures)
-
-        # Generate tracker
-        tracker_content = generate_failure_tracker(suites, failures)
-        with open("TEST_FAILURE_TRACKER.md", "w") as f:
-            f.write(tracker_content)
-
-        print("=" * 80)
-        print("✅ Generated TEST_FAILURE_TRACKER.md")
-        print("=" * 80)
-
+        with profile.stage("parse"):
+            if args.follow:
+                run = follow_log(filename, checkpoint, args.interval)
+            elif checkpoint:
+                run = resume_run(filename, checkpoint)
+            elif args.no_index:
+                run = load_run(filename)
+            else:
+                run = load_indexed_run(filename)
     except FileNotFoundError:
         print(f"Error: Could not find {filename}")
         print("Please run: swift test 2>&1 | tee test-results.txt")
         sys.exit(1)
+
+    # Every report below is rendered from the single parse and the single
+    # aggregation pass below
+    with profile.stage("summarize"):
+        summary = summarize_run(run)
+    with profile.stage("console"):
+        print_summary(summary)
+        if args.timing:
+            print_timing_report(run.suites, run.cases, top=args.top)
+
+    outputs = {"tracker": "TEST_FAILURE_TRACKER.md"}
+    for fmt, path in (("tracker-update", args.tracker_update), ("baseline", args.baseline_table),
+                      ("json", args.json), ("junit", args.junit)):
+        if path:
+            outputs[fmt] = path
+    with profile.stage("reports"):
+        write_reports(summary, outputs)
+
+    print("=" * 80)
+    for path in outputs.values():
+        print(f"✅ Generated {path}")
+    print("=" * 80)
+    profile.finish()
@@ -1,60 +1,31 @@
 #!/usr/bin/env python3
 """Parse baseline test results and generate summary"""
 
-import re
+import argparse
 import sys
+from pathlib import Path
 
-def parse_baseline(filename):
-    with open(filename, 'r') as f:
-        content = f.read()
-
-    # Find all test suite results
-    pattern = r"Test Suite '(\w+)Tests' (passed|failed) at.*\n\s+Executed (\d+) tests?, with (\d+) failures?"
-    matches = re.findall(pattern, content)
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
 
-    results = {}
-    for command, status, total, failures in matches:
-        total = int(total)
-        failures = int(failures)
-        passing = total - failures
+from stageprofile import StageProfile, add_profile_argument
+from testlog import load_run
+from testreports import baseline_results, write_baseline_table
 
-        results[command] = {
-            'total': total,
-            'passing': passing,
-            'failing': failures,
-            'status': '✅' if failures == 0 else '❌' if passing == 0 else '⚠️'
-        }
-
-    return results
+def parse_baseline(filename):
+    return baseline_results(load_run(filename))
 
 def print_summary(results):
-    print("# Baseline Test Results by Command\n")
-    print("| Command | Total | Passing | Failing | Status |")
-    print("|---------|-------|---------|---------|--------|")
-
-    for cmd in sorted(results.keys()):
-        r = results[cmd]
-        print(f"| {cmd} | {r['total']} | {r['passing']} | {r['failing']} | {r['status']} |")
-
-    # Summary stats
-    total_tests = sum(r['total'] for r in results.values())
-    total_passing = sum(r['passing'] for r in results.values())
-    total_failing = sum(r['failing'] for r in results.values())
-
-    fully_passing = sum(1 for r in results.values() if r['failing'] == 0 and r['total'] > 0)
-    partially_passing = sum(1 for r in results.values() if r['passing'] > 0 and r['failing'] > 0)
-    fully_failing = sum(1 for r in results.values() if r['passing'] == 0 and r['total'] > 0)
-
-    print(f"\n## Summary")
-    print(f"- **Total Commands**: {len(results)}")
-    print(f"- **Total Tests**: {total_tests}")
-    print(f"- **Passing Tests**: {total_passing} ({100*total_passing//total_tests}%)")
-    print(f"- **Failing Tests**: {total_failing} ({100*total_failing//total_tests}%)")
-    print(f"\n### Commands by Status")
-    print(f"- ✅ **Fully Passing**: {fully_passing} commands")
-    print(f"- ⚠️ **Partially Passing**: {partially_passing} commands")
-    print(f"- ❌ **Fully Failing**: {fully_failing} commands")
+    write_baseline_table(results, sys.stdout)
 
 if __name__ == '__main__':
-    results = parse_baseline('baseline-results.txt')
-    print_summary(results)
+    parser = argparse.ArgumentParser(description="Summarize baseline test results by command")
+    parser.add_argument("log", nargs="?", default="baseline-results.txt",
+                        help="swift test output (default: baseline-results.txt)")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    profile = StageProfile.from_arg(args.profile)
+    with profile.stage("parse"):
+        results = parse_baseline(args.log)
+    with profile.stage("table"):
+        print_summary(results)
+    profile.finish()
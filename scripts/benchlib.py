@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the swiftybox benchmarks.
+
+Processes are started with os.posix_spawn (no shell, no fork of a large
+interpreter image) and reaped with os.wait4, which returns the child's own
+resource usage. Wall time is measured with perf_counter_ns from just before
+the spawn to just after the reap.
+"""
+
+import hashlib
+import math
+import os
+import platform
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from statistics import mean, median, pstdev
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+REGISTRY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                        "Sources", "swiftybox", "CommandRegistry.swift")
+DEFAULT_BINARY = ".build/release/swiftybox"
+
+_REGISTRY_ENTRY_RE = re.compile(r'^\s*"([^"]+)":\s*\w+Command\.\w+', re.MULTILINE)
+
+
+class SpawnResult(NamedTuple):
+    wall_ns: int
+    status: int            # exit code, or -signal
+    user_time: float       # seconds
+    system_time: float     # seconds
+    max_rss_kb: int
+
+
+def registered_applets(registry: str = REGISTRY) -> List[str]:
+    """Applet names with a Swift implementation in CommandRegistry.swift, in order"""
+    with open(registry) as f:
+        source = f.read()
+    # Only the Swift table; the BusyBox wrapper table repeats a few names
+    end = source.find("self.busyboxCommands")
+    return _REGISTRY_ENTRY_RE.findall(source[:end if end >= 0 else len(source)])
+
+
+def spawn(path: str, argv: Sequence[str], stdin: Optional[str] = None,
+          stdout: Optional[str] = None, stderr: Optional[str] = None) -> SpawnResult:
+    """Run one process to completion; stdin/stdout/stderr default to /dev/null"""
+    actions = [
+        (os.POSIX_SPAWN_OPEN, 0, stdin or os.devnull, os.O_RDONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 1, stdout or os.devnull, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644),
+        (os.POSIX_SPAWN_OPEN, 2, stderr or os.devnull, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644),
+    ]
+    start = time.perf_counter_ns()
+    pid = os.posix_spawn(path, list(argv), os.environ, file_actions=actions)
+    _, status, usage = os.wait4(pid, 0)
+    wall = time.perf_counter_ns() - start
+    return SpawnResult(wall, os.waitstatus_to_exitcode(status), usage.ru_utime,
+                       usage.ru_stime, _max_rss_kb(usage.ru_maxrss))
+
+
+def rss_floor_kb() -> int:
+    """Peak RSS reported for a child that does nothing.
+
+    A spawned child's ru_maxrss includes the spawning process's memory from
+    before the exec, so measured peaks are only meaningful above this floor.
+    Keep the benchmark process itself small to keep the floor low.
+    """
+    return spawn("/bin/sh", ["sh", "-c", ":"]).max_rss_kb
+
+
+def _max_rss_kb(ru_maxrss: int) -> int:
+    # Linux reports kilobytes, macOS bytes
+    return ru_maxrss // 1024 if sys.platform == "darwin" else ru_maxrss
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def latency_summary(samples_ns: Sequence[int]) -> Dict[str, float]:
+    """min/median/p95/p99/mean/stdev of wall-time samples, in microseconds"""
+    values = sorted(ns / 1000 for ns in samples_ns)
+    return {
+        "samples": len(values),
+        "min_us": round(values[0], 1),
+        "median_us": round(median(values), 1),
+        "p95_us": round(percentile(values, 95), 1),
+        "p99_us": round(percentile(values, 99), 1),
+        "mean_us": round(mean(values), 1),
+        "stdev_us": round(pstdev(values), 1),
+    }
+
+
+def scaling_exponents(points: List[Tuple[int, Dict]], key: str,
+                      floor: float = 0.0) -> List[Optional[float]]:
+    """Log-log slope of `key` (less `floor`) between consecutive sizes (1.0 = linear)"""
+    exponents = []
+    for (s1, r1), (s2, r2) in zip(points, points[1:]):
+        v1, v2 = r1[key] - floor, r2[key] - floor
+        exponents.append(round(math.log(v2 / v1) / math.log(s2 / s1), 2)
+                         if v1 > 0 and v2 > 0 else None)
+    return exponents
+
+
+def binary_info(path: str) -> Dict[str, object]:
+    """Identify the benchmarked binary so results can be compared over time"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return {"path": os.path.abspath(path), "size": os.path.getsize(path),
+            "sha256": digest.hexdigest()}
+
+
+def environment_info() -> Dict[str, object]:
+    uname = platform.uname()
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": uname.node,
+        "system": f"{uname.system} {uname.release}",
+        "machine": uname.machine,
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+    }
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Applet startup-latency benchmark: swiftybox vs the system's own tools.
+
+Every applet registered in CommandRegistry.swift is started with a small,
+side-effect-free argument list (see LATENCY_ARGS), directly via
+posix_spawn rather than through a shell loop. Each side gets warmup runs,
+then swiftybox and system samples are taken alternately so drift (thermal,
+page cache, other load) affects both equally. Results are min, median,
+p95 and p99 wall time per applet, printed as a table and optionally
+written as JSON for tracking across builds.
+
+swiftybox is invoked the way installed symlinks invoke it, with the applet
+name as argv[0]; --invoke subcommand uses `swiftybox <applet> ...` instead.
+
+Usage:
+    swift build -c release
+    python3 scripts/benchmark-latency.py --json latency.json
+    python3 scripts/benchmark-latency.py --binary ./swiftybox-static --applets echo true cat
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from benchlib import (DEFAULT_BINARY, REGISTRY, binary_info, environment_info,
+                      latency_summary, registered_applets, spawn)
+
+# Quick, side-effect-free invocations, run inside a scratch directory that
+# holds one small file ("input"). Applets that are left out either modify
+# the filesystem or never exit on their own.
+LATENCY_ARGS: Dict[str, List[str]] = {
+    "echo": ["test"], "pwd": [], "true": [], "false": [], "sleep": ["0"],
+    "basename": ["/usr/lib/file.txt"], "dirname": ["/usr/lib/file.txt"], "env": [],
+    "seq": ["10"], "wc": ["input"], "cat": ["input"], "head": ["input"], "tail": ["input"],
+    "grep": ["line", "input"], "egrep": ["l+ine", "input"], "tr": ["a", "b"],
+    "cut": ["-c1", "input"], "tee": [], "sync": [],
+    "whoami": [], "logname": [], "hostid": [], "hostname": [], "tty": [],
+    "readlink": ["-f", "input"], "realpath": ["input"], "which": ["sh"],
+    "printf": ["%s\\n", "x"], "test": ["-f", "input"], "[": ["-f", "input", "]"],
+    "printenv": ["PATH"], "uname": ["-a"], "arch": [], "nproc": [], "clear": [],
+    "usleep": ["0"], "free": [], "pwdx": [str(os.getpid())], "fsync": ["input"],
+    "ls": ["-l"], "sort": ["input"], "uniq": ["input"], "comm": ["input", "input"],
+    "fold": ["input"], "paste": ["input"], "nl": ["input"],
+    "md5sum": ["input"], "sha256sum": ["input"], "sha512sum": ["input"], "cksum": ["input"],
+    "date": [], "id": [], "expr": ["1", "+", "1"], "mktemp": ["-u"],
+    "tac": ["input"], "rev": ["input"], "expand": ["input"], "unexpand": ["input"],
+    "hexdump": ["-C", "input"], "shuf": ["-n", "1", "input"], "stat": ["input"],
+    "du": ["-s", "."], "df": ["."],
+}
+
+
+def measure(path: str, argv: List[str], warmup: int, samples: int,
+            other: Optional[tuple] = None) -> tuple:
+    """Collect wall-time samples for one command (and, interleaved, another)"""
+    commands = [(path, argv)] + ([other] if other else [])
+    for cmd_path, cmd_argv in commands:
+        for _ in range(warmup):
+            spawn(cmd_path, cmd_argv)
+    results = [([], set()) for _ in commands]
+    for _ in range(samples):
+        for (cmd_path, cmd_argv), (times, statuses) in zip(commands, results):
+            result = spawn(cmd_path, cmd_argv)
+            times.append(result.wall_ns)
+            statuses.add(result.status)
+    return tuple(results)
+
+
+def format_table(results: List[Dict]) -> str:
+    lines = [f"{'Applet':12} {'':10} {'min':>9} {'median':>9} {'p95':>9} {'p99':>9}   (µs)"]
+    for row in results:
+        for side in ("swiftybox", "system"):
+            stats = row.get(side)
+            if stats is None:
+                continue
+            label = row["applet"] if side == "swiftybox" else ""
+            lines.append(f"{label:12} {side:10} {stats['min_us']:9.1f} {stats['median_us']:9.1f} "
+                         f"{stats['p95_us']:9.1f} {stats['p99_us']:9.1f}")
+        if row.get("system"):
+            ratio = row["swiftybox"]["median_us"] / row["system"]["median_us"]
+            lines.append(f"{'':12} {'ratio':10} {ratio:8.2f}x")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark applet startup latency")
+    parser.add_argument("--binary", default=DEFAULT_BINARY,
+                        help=f"swiftybox binary (default: {DEFAULT_BINARY}, a release build)")
+    parser.add_argument("--applets", nargs="+", metavar="APPLET",
+                        help="Applets to benchmark (default: every one in CommandRegistry.swift)")
+    parser.add_argument("--samples", type=int, default=200, help="Timed runs per command (default: 200)")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed runs first (default: 20)")
+    parser.add_argument("--invoke", choices=["argv0", "subcommand"], default="argv0",
+                        help="Call swiftybox as `<applet> ...` via argv[0] (like a symlink) "
+                             "or as `swiftybox <applet> ...`")
+    parser.add_argument("--no-system", action="store_true",
+                        help="Skip the system binaries")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON")
+    args = parser.parse_args()
+
+    if not os.access(args.binary, os.X_OK):
+        print(f"Error: {args.binary} is not an executable; build with `swift build -c release` "
+              f"or pass --binary", file=sys.stderr)
+        sys.exit(2)
+    binary = os.path.abspath(args.binary)
+    registered = registered_applets(REGISTRY)
+    applets = args.applets or registered
+
+    results = []
+    skipped = []
+    scratch = tempfile.mkdtemp(prefix="swiftybox-bench-")
+    cwd = os.getcwd()
+    try:
+        with open(os.path.join(scratch, "input"), "w") as f:
+            f.write("".join(f"line {i}\tof the latency input\n" for i in range(20, 0, -1)))
+        os.chdir(scratch)
+        for applet in applets:
+            if applet not in registered:
+                skipped.append((applet, "not in CommandRegistry.swift"))
+                continue
+            if applet not in LATENCY_ARGS:
+                skipped.append((applet, "no side-effect-free invocation"))
+                continue
+            extra = LATENCY_ARGS[applet]
+            if args.invoke == "argv0":
+                ours = (binary, [applet] + extra)
+            else:
+                ours = (binary, ["swiftybox", applet] + extra)
+            system_path = None if args.no_system else shutil.which(applet)
+            theirs = (system_path, [applet] + extra) if system_path else None
+
+            print(f"  {applet} {' '.join(extra)}", file=sys.stderr)
+            measured = measure(*ours, args.warmup, args.samples, theirs)
+            row = {"applet": applet, "args": extra,
+                   "swiftybox": latency_summary(measured[0][0]),
+                   "system_path": system_path, "system": None}
+            row["swiftybox"]["exit_codes"] = sorted(measured[0][1])
+            if theirs:
+                row["system"] = latency_summary(measured[1][0])
+                row["system"]["exit_codes"] = sorted(measured[1][1])
+            results.append(row)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(format_table(results))
+    for applet, reason in skipped:
+        print(f"Skipped {applet}: {reason}", file=sys.stderr)
+
+    if args.json:
+        report = {
+            "benchmark": "latency",
+            "environment": environment_info(),
+            "binary": binary_info(binary),
+            "invoke": args.invoke,
+            "samples": args.samples,
+            "warmup": args.warmup,
+            "results": results,
+            "skipped": [{"applet": a, "reason": r} for a, r in skipped],
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
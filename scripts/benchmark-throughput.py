@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Throughput and scaling benchmark for the data-processing applets.
+
+Deterministic datasets are generated once per (kind, size) into a cache
+directory, then every applet in THROUGHPUT_CASES runs over each dataset it
+applies to, as swiftybox and as the system's own tool. Each run records
+wall time, CPU time (user + system) and peak RSS from the child's own
+rusage (os.wait4), and MB/s over the input size.
+
+Results across sizes form a scaling curve per (applet, dataset, side).
+The log-log slope between consecutive sizes is reported for time and for
+peak RSS. Time exponents well above 1 (e.g. an O(n log n) sort turning
+quadratic) are flagged and make the run exit 1, and RSS exponents near 1
+show an applet holding its whole input in memory, so superlinear behavior
+shows up here before it shows up in production.
+
+Usage:
+    swift build -c release
+    python3 scripts/benchmark-throughput.py --json throughput.json
+    python3 scripts/benchmark-throughput.py --sizes 1M 10M 100M 1G --applets sort wc
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from statistics import median
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from benchlib import (DEFAULT_BINARY, binary_info, environment_info, rss_floor_kb,
+                      scaling_exponents, spawn)
+
+MB = 1 << 20
+SIZE_UNITS = {"K": 1 << 10, "M": MB, "G": 1 << 30}
+
+# applet -> (arguments, datasets it runs on); "{input}" is replaced by the
+# dataset path, and a case without it reads the dataset on stdin
+THROUGHPUT_CASES: Dict[str, Tuple[List[str], List[str]]] = {
+    "sort": (["{input}"], ["random", "sorted", "long"]),
+    "uniq": (["{input}"], ["sorted", "random"]),
+    "wc": (["{input}"], ["random", "long", "binary"]),
+    "grep": (["-c", "lorem", "{input}"], ["random", "long"]),
+    "cut": (["-d", " ", "-f", "2", "{input}"], ["random", "sorted"]),
+    "tr": (["a-z", "A-Z"], ["random", "long"]),
+    "md5sum": (["{input}"], ["random", "binary"]),
+    "sha256sum": (["{input}"], ["random", "binary"]),
+    "tac": (["{input}"], ["random", "long"]),
+}
+
+VOCABULARY = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+              "tempor incididunt ut labore et dolore magna aliqua enim ad minim veniam "
+              "quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo "
+              "consequat duis aute irure in reprehenderit voluptate velit esse cillum "
+              "eu fugiat nulla pariatur excepteur sint occaecat cupidatat non proident "
+              "sunt culpa qui officia deserunt mollit anim id est laborum").split()
+
+CHUNK = 4 * MB
+
+
+def parse_size(text: str) -> int:
+    unit = SIZE_UNITS.get(text[-1:].upper())
+    return int(float(text[:-1]) * unit) if unit else int(text)
+
+
+def format_size(size: int) -> str:
+    for suffix, unit in (("G", 1 << 30), ("M", MB), ("K", 1 << 10)):
+        if size >= unit and size % unit == 0:
+            return f"{size // unit}{suffix}"
+    return str(size)
+
+
+# -- datasets ------------------------------------------------------------------
+
+def _random_lines(rng: random.Random) -> Iterator[bytes]:
+    """Lines of 3-12 random words: many duplicate prefixes, few duplicate lines"""
+    while True:
+        words = rng.choices(VOCABULARY, k=CHUNK // 6)
+        lines = []
+        i = 0
+        while i < len(words):
+            n = rng.randint(3, 12)
+            lines.append(" ".join(words[i:i + n]))
+            i += n
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def _sorted_lines(rng: random.Random) -> Iterator[bytes]:
+    """Distinct lines already in byte order (zero-padded counter plus words)"""
+    counter = 0
+    while True:
+        words = rng.choices(VOCABULARY, k=CHUNK // 48)
+        lines = []
+        for i in range(0, len(words), 6):
+            lines.append(f"{counter:012d} {' '.join(words[i:i + 6])}")
+            counter += 1
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def _long_lines(rng: random.Random) -> Iterator[bytes]:
+    """Lines of 4-64 KB, to stress line buffering"""
+    while True:
+        length = rng.randint(4 << 10, 64 << 10)
+        line = " ".join(rng.choices(VOCABULARY, k=length // 6))
+        yield (line + "\n").encode()
+
+
+def _binary(rng: random.Random) -> Iterator[bytes]:
+    while True:
+        yield rng.randbytes(CHUNK)
+
+
+DATASETS: Dict[str, Callable[[random.Random], Iterator[bytes]]] = {
+    "random": _random_lines,
+    "sorted": _sorted_lines,
+    "long": _long_lines,
+    "binary": _binary,
+}
+
+
+def dataset_path(data_dir: str, kind: str, size: int) -> str:
+    """Generate (or reuse) the dataset of `kind` truncated to exactly `size` bytes
+
+    The generator is seeded from the kind alone, so every size is a prefix
+    of the same stream and the same dataset is produced on every machine.
+    """
+    path = os.path.join(data_dir, f"{kind}-{format_size(size)}.dat")
+    if os.path.exists(path) and os.path.getsize(path) == size:
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    print(f"  generating {path}", file=sys.stderr)
+    rng = random.Random(f"swiftybox-bench-{kind}")
+    remaining = size
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        for chunk in DATASETS[kind](rng):
+            f.write(chunk[:remaining])
+            remaining -= min(len(chunk), remaining)
+            if not remaining:
+                break
+    os.replace(tmp, path)
+    return path
+
+
+# -- measurement ---------------------------------------------------------------
+
+def run_case(path: str, argv: List[str], input_path: str, size: int, repeat: int,
+             warmup: int) -> Dict[str, object]:
+    """Median-of-`repeat` measurements of one command over one input"""
+    uses_stdin = "{input}" not in argv
+    argv = [input_path if a == "{input}" else a for a in argv]
+    stdin = input_path if uses_stdin else None
+    for _ in range(warmup):
+        spawn(path, argv, stdin=stdin)
+    runs = [spawn(path, argv, stdin=stdin) for _ in range(repeat)]
+    wall = median(r.wall_ns for r in runs) / 1e9
+    return {
+        "wall_s": round(wall, 4),
+        "cpu_s": round(median(r.user_time + r.system_time for r in runs), 4),
+        "max_rss_kb": max(r.max_rss_kb for r in runs),
+        "mb_per_s": round(size / MB / wall, 2) if wall > 0 else None,
+        "exit_codes": sorted({r.status for r in runs}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data-processing applet throughput")
+    parser.add_argument("--binary", default=DEFAULT_BINARY,
+                        help=f"swiftybox binary (default: {DEFAULT_BINARY})")
+    parser.add_argument("--applets", nargs="+", choices=sorted(THROUGHPUT_CASES),
+                        metavar="APPLET", help="Applets to run (default: all)")
+    parser.add_argument("--sizes", nargs="+", default=["1M", "10M", "100M"],
+                        help="Dataset sizes, e.g. 1M 10M 100M 1G (default: 1M 10M 100M)")
+    parser.add_argument("--datasets", nargs="+", choices=sorted(DATASETS),
+                        help="Dataset kinds to use (default: all)")
+    parser.add_argument("--data-dir", default=".bench-data",
+                        help="Cache directory for generated datasets (default: .bench-data)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per case (default: 1)")
+    parser.add_argument("--superlinear", type=float, default=1.2,
+                        help="Flag time exponents above this (default: 1.2)")
+    parser.add_argument("--no-system", action="store_true", help="Skip the system binaries")
+    parser.add_argument("--json", metavar="PATH", help="Write results and curves as JSON")
+    args = parser.parse_args()
+
+    if not os.access(args.binary, os.X_OK):
+        print(f"Error: {args.binary} is not an executable; build with `swift build -c release` "
+              f"or pass --binary", file=sys.stderr)
+        sys.exit(2)
+    binary = os.path.abspath(args.binary)
+    sizes = sorted(parse_size(s) for s in args.sizes)
+    applets = args.applets or list(THROUGHPUT_CASES)
+    kinds = set(args.datasets or DATASETS)
+
+    # Generate in a worker so this process never grows: a child's peak RSS
+    # includes its parent's memory from before the exec
+    needed = sorted({(kind, size) for applet in applets for kind in THROUGHPUT_CASES[applet][1]
+                     if kind in kinds for size in sizes})
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        inputs = dict(zip(needed, pool.map(dataset_path, [args.data_dir] * len(needed),
+                                           *zip(*needed)))) if needed else {}
+    floor = rss_floor_kb()
+
+    results = []
+    print(f"{'Applet':10} {'Dataset':8} {'Size':>5} {'Side':10} {'MB/s':>9} {'wall s':>8} "
+          f"{'cpu s':>8} {'RSS MB':>8}")
+    for applet in applets:
+        extra, datasets = THROUGHPUT_CASES[applet]
+        system_path = None if args.no_system else shutil.which(applet)
+        sides = [("swiftybox", binary)] + ([("system", system_path)] if system_path else [])
+        for kind in datasets:
+            if kind not in kinds:
+                continue
+            for size in sizes:
+                input_path = inputs[(kind, size)]
+                for side, path in sides:
+                    measured = run_case(path, [applet] + extra, input_path, size,
+                                        args.repeat, args.warmup)
+                    results.append({"applet": applet, "dataset": kind, "size": size,
+                                    "side": side, **measured})
+                    failed = "  exit " + ",".join(map(str, measured["exit_codes"])) \
+                        if measured["exit_codes"] != [0] else ""
+                    print(f"{applet:10} {kind:8} {format_size(size):>5} {side:10} "
+                          f"{measured['mb_per_s'] or 0:9.1f} {measured['wall_s']:8.3f} "
+                          f"{measured['cpu_s']:8.3f} {measured['max_rss_kb'] / 1024:8.1f}{failed}")
+
+    curves = []
+    series: Dict[Tuple[str, str, str], List[Tuple[int, Dict]]] = {}
+    for row in results:
+        series.setdefault((row["applet"], row["dataset"], row["side"]), []).append((row["size"], row))
+    for (applet, kind, side), points in series.items():
+        if len(points) < 2:
+            continue
+        time_exp = scaling_exponents(points, "wall_s")
+        rss_exp = scaling_exponents(points, "max_rss_kb", floor)
+        superlinear = any(e is not None and e > args.superlinear for e in time_exp)
+        curves.append({"applet": applet, "dataset": kind, "side": side,
+                       "sizes": [s for s, _ in points], "time_exponents": time_exp,
+                       "rss_exponents": rss_exp, "superlinear": superlinear})
+
+    if curves:
+        print(f"\nSCALING (log-log slope between consecutive sizes; 1.0 = linear; "
+              f"RSS above the {floor / 1024:.1f} MB spawn floor)")
+        print(f"{'Applet':10} {'Dataset':8} {'Side':10} {'time':>18} {'RSS':>18}")
+        for curve in curves:
+            flag = "  <-- superlinear" if curve["superlinear"] else ""
+            time_text = " ".join("-" if e is None else f"{e:.2f}" for e in curve["time_exponents"])
+            rss_text = " ".join("-" if e is None else f"{e:.2f}" for e in curve["rss_exponents"])
+            print(f"{curve['applet']:10} {curve['dataset']:8} {curve['side']:10} "
+                  f"{time_text:>18} {rss_text:>18}{flag}")
+
+    if args.json:
+        report = {
+            "benchmark": "throughput",
+            "environment": environment_info(),
+            "binary": binary_info(binary),
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "rss_floor_kb": floor,
+            "results": results,
+            "curves": curves,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nWrote {args.json}")
+
+    sys.exit(1 if any(c["superlinear"] and c["side"] == "swiftybox" for c in curves) else 0)
+
+
+if __name__ == "__main__":
+    main()
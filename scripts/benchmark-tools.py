@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Throughput and memory benchmark for the Python test tooling itself.
+
+Synthetic inputs come from testsynth.py: `swift test` logs in the Linux and
+Darwin formats at each --cases size, and BusyBox `.tests` directories at
+each --tests size. They are generated once into a cache directory, so the
+same size is the same bytes on every run and every machine.
+
+Every tool in TOOLS runs over each input it applies to, in a scratch
+directory, with --profile. Each run records wall time, CPU time and peak
+RSS from the child's own rusage (os.wait4), input MB/s and cases/s, and
+the per-stage wall times the tool printed. Results across sizes form a
+scaling curve per (tool, input kind); time exponents well above 1 are
+flagged and make the run exit 1, as in benchmark-throughput.py.
+
+Usage:
+    python3 scripts/benchmark-tools.py --json tools.json
+    python3 scripts/benchmark-tools.py --cases 10K 100K 1M --tools analyze parse-baseline
+    python3 scripts/benchmark-tools.py --tests 1K 10K 100K --tools import-busybox
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from statistics import median
+from typing import Dict, List, Tuple
+
+from benchlib import environment_info, rss_floor_kb, scaling_exponents, spawn
+from testsynth import FORMATS, write_log, write_tests_dir
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+MB = 1 << 20
+COUNT_UNITS = {"K": 1000, "M": 1000000}
+
+# tool -> (script relative to the package root, arguments, input kind);
+# "{input}" is replaced by the log file or .tests directory
+TOOLS: Dict[str, Tuple[str, List[str], str]] = {
+    "analyze": ("analyze-test-results.py",
+                ["{input}", "--json", "report.json", "--junit", "report.xml"], "log"),
+    "analyze-commands": ("scripts/analyze-test-results.py", ["{input}"], "log"),
+    "parse-baseline": ("parse_baseline.py", ["{input}"], "log"),
+    "import-busybox": ("scripts/import-busybox-tests.py",
+                       ["--all", "--force", "--jobs", "1", "--output-dir", "generated", "{input}"],
+                       "tests"),
+}
+
+PROFILE_LINE_RE = re.compile(r"profile: (.+?)\s+([\d.]+)s")
+
+
+def parse_count(text: str) -> int:
+    unit = COUNT_UNITS.get(text[-1:].upper())
+    return int(float(text[:-1]) * unit) if unit else int(text)
+
+
+def format_count(count: int) -> str:
+    for suffix, unit in (("M", 1000000), ("K", 1000)):
+        if count >= unit and count % unit == 0:
+            return f"{count // unit}{suffix}"
+    return str(count)
+
+
+# -- inputs --------------------------------------------------------------------
+
+def log_input(data_dir: str, fmt: str, cases: int, failure_ratio: float,
+              warnings: float) -> str:
+    """Generate (or reuse) a synthetic log"""
+    path = os.path.join(data_dir, f"{fmt}-{format_count(cases)}-f{failure_ratio:g}-w{warnings:g}.log")
+    if os.path.exists(path):
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    print(f"  generating {path}", file=sys.stderr)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        write_log(f, cases, fmt, failure_ratio=failure_ratio, warnings_per_100=warnings)
+    os.replace(tmp, path)
+    return path
+
+
+def tests_input(data_dir: str, tests: int) -> str:
+    """Generate (or reuse) a directory of synthetic .tests files"""
+    path = os.path.join(data_dir, f"busybox-{format_count(tests)}")
+    if os.path.exists(os.path.join(path, ".complete")):
+        return path
+    print(f"  generating {path}/", file=sys.stderr)
+    shutil.rmtree(path, ignore_errors=True)
+    write_tests_dir(path, tests)
+    open(os.path.join(path, ".complete"), "w").close()
+    return path
+
+
+def input_size(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    return os.path.getsize(path)
+
+
+# -- measurement ---------------------------------------------------------------
+
+def run_tool(script: str, args: List[str], input_path: str, repeat: int) -> Dict[str, object]:
+    """Median-of-`repeat` measurements of one tool over one input, in the cwd"""
+    argv = [sys.executable, os.path.join(ROOT, script)]
+    argv += [input_path if a == "{input}" else a for a in args] + ["--profile"]
+    runs = []
+    stages: Dict[str, List[float]] = {}
+    for _ in range(repeat):
+        runs.append(spawn(sys.executable, argv, stderr="profile.txt"))
+        with open("profile.txt", errors="replace") as f:
+            for match in PROFILE_LINE_RE.finditer(f.read()):
+                stages.setdefault(match.group(1), []).append(float(match.group(2)))
+    return {
+        "wall_s": round(median(r.wall_ns for r in runs) / 1e9, 4),
+        "cpu_s": round(median(r.user_time + r.system_time for r in runs), 4),
+        "max_rss_kb": max(r.max_rss_kb for r in runs),
+        "stages": {name: round(median(times), 4) for name, times in stages.items()},
+        "exit_codes": sorted({r.status for r in runs}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Python test tooling")
+    parser.add_argument("--tools", nargs="+", choices=sorted(TOOLS), metavar="TOOL",
+                        help=f"Tools to run (default: all of {', '.join(TOOLS)})")
+    parser.add_argument("--cases", nargs="+", default=["10K", "100K"],
+                        help="Log sizes in test cases, e.g. 10K 100K 1M (default: 10K 100K)")
+    parser.add_argument("--tests", nargs="+", default=["1K", "10K"],
+                        help="BusyBox testing calls per .tests directory (default: 1K 10K)")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS),
+                        help="Log formats (default: both)")
+    parser.add_argument("--failure-ratio", type=float, default=0.2,
+                        help="Fraction of failing cases in the logs (default: 0.2)")
+    parser.add_argument("--warnings", type=float, default=5.0,
+                        help="Compiler-warning blocks per 100 cases (default: 5)")
+    parser.add_argument("--data-dir", default=".bench-data/tools",
+                        help="Cache directory for generated inputs (default: .bench-data/tools)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3)")
+    parser.add_argument("--superlinear", type=float, default=1.2,
+                        help="Flag time exponents above this (default: 1.2)")
+    parser.add_argument("--json", metavar="PATH", help="Write results and curves as JSON")
+    args = parser.parse_args()
+
+    tools = args.tools or list(TOOLS)
+    data_dir = os.path.abspath(args.data_dir)
+    case_sizes = sorted(parse_count(c) for c in args.cases)
+    test_sizes = sorted(parse_count(t) for t in args.tests)
+    kinds = {TOOLS[tool][2] for tool in tools}
+
+    # Generate in a worker so this process stays small: a child's peak RSS
+    # includes its parent's memory from before the exec
+    inputs: Dict[str, List[Tuple[str, int, str]]] = {"log": [], "tests": []}
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        if "log" in kinds:
+            for fmt in args.formats:
+                for cases in case_sizes:
+                    path = pool.submit(log_input, data_dir, fmt, cases, args.failure_ratio,
+                                       args.warnings).result()
+                    inputs["log"].append((fmt, cases, path))
+        if "tests" in kinds:
+            for tests in test_sizes:
+                path = pool.submit(tests_input, data_dir, tests).result()
+                inputs["tests"].append(("busybox", tests, path))
+    floor = rss_floor_kb()
+
+    results = []
+    scratch = tempfile.mkdtemp(prefix="swiftybox-tools-bench-")
+    cwd = os.getcwd()
+    print(f"{'Tool':17} {'Input':8} {'Cases':>6} {'MB':>7} {'MB/s':>8} {'cases/s':>9} "
+          f"{'wall s':>8} {'RSS MB':>7}  stages")
+    try:
+        os.chdir(scratch)
+        for tool in tools:
+            script, tool_args, kind = TOOLS[tool]
+            for label, count, path in inputs[kind]:
+                size = input_size(path)
+                measured = run_tool(script, tool_args, path, args.repeat)
+                wall = measured["wall_s"]
+                row = {"tool": tool, "input": label, "cases": count, "bytes": size,
+                       "mb_per_s": round(size / MB / wall, 2) if wall > 0 else None,
+                       "cases_per_s": round(count / wall) if wall > 0 else None, **measured}
+                results.append(row)
+                stages = " ".join(f"{name}={seconds:.3f}" for name, seconds in measured["stages"].items()
+                                  if name != "total")
+                failed = "  exit " + ",".join(map(str, measured["exit_codes"])) \
+                    if measured["exit_codes"] != [0] else ""
+                print(f"{tool:17} {label:8} {format_count(count):>6} {size / MB:7.1f} "
+                      f"{row['mb_per_s'] or 0:8.1f} {row['cases_per_s'] or 0:9} {wall:8.3f} "
+                      f"{measured['max_rss_kb'] / 1024:7.1f}  {stages}{failed}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    curves = []
+    series: Dict[Tuple[str, str], List[Tuple[int, Dict]]] = {}
+    for row in results:
+        series.setdefault((row["tool"], row["input"]), []).append((row["cases"], row))
+    for (tool, label), points in series.items():
+        if len(points) < 2:
+            continue
+        time_exp = scaling_exponents(points, "wall_s")
+        rss_exp = scaling_exponents(points, "max_rss_kb", floor)
+        superlinear = any(e is not None and e > args.superlinear for e in time_exp)
+        curves.append({"tool": tool, "input": label, "cases": [c for c, _ in points],
+                       "time_exponents": time_exp, "rss_exponents": rss_exp,
+                       "superlinear": superlinear})
+
+    if curves:
+        print(f"\nSCALING (log-log slope between consecutive sizes; 1.0 = linear; "
+              f"RSS above the {floor / 1024:.1f} MB spawn floor)")
+        print(f"{'Tool':17} {'Input':8} {'time':>18} {'RSS':>18}")
+        for curve in curves:
+            flag = "  <-- superlinear" if curve["superlinear"] else ""
+            time_text = " ".join("-" if e is None else f"{e:.2f}" for e in curve["time_exponents"])
+            rss_text = " ".join("-" if e is None else f"{e:.2f}" for e in curve["rss_exponents"])
+            print(f"{curve['tool']:17} {curve['input']:8} {time_text:>18} {rss_text:>18}{flag}")
+
+    if args.json:
+        report = {
+            "benchmark": "tools",
+            "environment": environment_info(),
+            "repeat": args.repeat,
+            "failure_ratio": args.failure_ratio,
+            "warnings_per_100": args.warnings,
+            "rss_floor_kb": floor,
+            "results": results,
+            "curves": curves,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nWrote {args.json}")
+
+    sys.exit(1 if any(c["superlinear"] for c in curves) else 0)
+
+
+if __name__ == "__main__":
+    main()
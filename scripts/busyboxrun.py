@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Run BusyBox `.tests` cases directly against a binary, without XCTest.
+
+Cases come from the importer's parser (busyboxtests.py) and are executed
+the way TestRunner.testing does it: `busybox ` and `` `which busybox` ``
+in the command are replaced by the binary's path, the command runs under
+`/bin/sh -c` in a fresh temp directory holding the `input` file, stdin is
+written and closed, and a case passes when stdout matches and the exit
+code is 0. The expected output, `input` and stdin go through `echo -ne`
+escape processing first, as testing.sh does (literal=True compares the
+strings as given, like the generated XCTest cases).
+
+Cases run as asyncio subprocesses, at most `jobs` at a time, each with its
+own timeout; a timed-out case has its whole process group killed. Each
+suite is written as one contiguous block of `swift test` log lines once
+its last case finishes (suite `<Command>Tests`, case names as generated by
+import-busybox-tests.py), so the log and the TestRun folded from it work
+with every analyzer, and compare directly with a real `swift test` run.
+"""
+
+import asyncio
+import os
+import re
+import shutil
+import signal
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, TextIO, Tuple
+
+from busyboxtests import BusyBoxTest, parse_busybox_test_file
+from testexec import LogMerger, plural, timestamp
+from testlog import EventParser, RunStarted, TestRun, iter_events
+
+DEFAULT_TIMEOUT = 10.0
+
+# echo -ne escapes (as in BusyBox's echo): \0NNN, \NNN and \xHH take
+# digits, \c ends the output, and an unknown escape is kept as written
+_ECHO_ESCAPE_RE = re.compile(r"\\(0[0-7]{0,3}|[1-7][0-7]{0,2}|x[0-9A-Fa-f]{1,2}|.)", re.DOTALL)
+_ECHO_ESCAPES = {'a': b'\a', 'b': b'\b', 'e': b'\x1b', 'f': b'\f', 'n': b'\n', 'r': b'\r',
+                 't': b'\t', 'v': b'\v', '\\': b'\\'}
+
+# Longest operand shown in an assertion message
+PREVIEW_LIMIT = 200
+
+# Line breaks as text-mode reading of the written log sees them
+_LOG_LINE_RE = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)")
+
+
+def echo_escapes(text: str) -> bytes:
+    """The bytes `echo -ne "$text"` prints"""
+    parts = []
+    pos = 0
+    for match in _ECHO_ESCAPE_RE.finditer(text):
+        parts.append(text[pos:match.start()].encode())
+        pos = match.end()
+        escape = match.group(1)
+        if escape == 'c':
+            return b''.join(parts)
+        if escape[0] == 'x':
+            parts.append(bytes([int(escape[1:], 16)]))
+        elif escape[0].isdigit():
+            parts.append(bytes([int(escape, 8) & 0xFF]))
+        else:
+            parts.append(_ECHO_ESCAPES.get(escape, b'\\' + escape.encode()))
+    parts.append(text[pos:].encode())
+    return b''.join(parts)
+
+
+def substitute_binary(command: str, binary: str) -> str:
+    """TestRunner's `busybox` replacement"""
+    return command.replace("busybox ", f"{binary} ").replace("`which busybox`", binary)
+
+
+def preview(data: bytes) -> str:
+    """One-line rendering of output for an assertion message"""
+    text = data.decode('utf-8', errors='replace')
+    text = text.replace('\\', '\\\\').replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
+    return text if len(text) <= PREVIEW_LIMIT else text[:PREVIEW_LIMIT] + '...'
+
+
+@dataclass
+class Suite:
+    """The runnable cases of one .tests file"""
+    name: str         # XCTest class name, e.g. SortTests
+    command: str
+    source: str       # .tests path, used as the assertion location
+    tests: List[BusyBoxTest]
+
+
+@dataclass
+class CaseResult:
+    test: BusyBoxTest
+    test_name: str
+    status: str       # 'passed', 'failed' or 'skipped'
+    duration: float
+    started: str = ''
+    stdout: bytes = b''
+    expected: bytes = b''
+    exit_code: int = 0
+    reason: str = ''  # why a case was skipped or did not finish
+
+
+def load_suites(test_files: Sequence[Path]) -> Tuple[List[Suite], List[Tuple[Path, int, str]]]:
+    """Parse .tests files into suites, with the (file, line, reason) of every unparseable call"""
+    suites = []
+    unparseable = []
+    for path in test_files:
+        command, tests, rejected = parse_busybox_test_file(path)
+        unparseable += [(path, line, reason) for line, reason in rejected]
+        if tests:
+            suites.append(Suite(f"{command.capitalize()}Tests", command, str(path), tests))
+    return suites, unparseable
+
+
+def skip_reason(test: BusyBoxTest, features: Optional[Set[str]]) -> str:
+    """Why testing.sh would skip the case, or '' to run it.
+
+    With no feature list every `optional` case runs, as in the generated
+    XCTest cases.
+    """
+    if test.skip_guard:
+        return f"SKIP={test.skip_guard}"
+    if features is not None:
+        missing = [f for f in test.optional_features if f not in features]
+        if missing:
+            return f"requires {' '.join(missing)}"
+    return ""
+
+
+class ConformanceRunner:
+    """Runs suites of BusyBox cases concurrently and logs them like `swift test`"""
+
+    def __init__(self, binary: str, jobs: Optional[int] = None,
+                 timeout: float = DEFAULT_TIMEOUT, literal: bool = False,
+                 features: Optional[Set[str]] = None, env: Optional[Dict[str, str]] = None):
+        self.binary = binary
+        self.jobs = jobs or os.cpu_count() or 1
+        self.timeout = timeout
+        self.literal = literal
+        self.features = features
+        self.env = env
+        self.run = TestRun()
+        self._parser = EventParser()
+
+    def _bytes(self, text: str) -> bytes:
+        return text.encode() if self.literal else echo_escapes(text)
+
+    async def run_case(self, test: BusyBoxTest, test_name: str, root: str,
+                       slots: asyncio.Semaphore) -> CaseResult:
+        reason = skip_reason(test, self.features)
+        if reason:
+            return CaseResult(test, test_name, 'skipped', 0.0, timestamp(), reason=reason)
+        expected = self._bytes(test.expected)
+        async with slots:
+            workdir = tempfile.mkdtemp(prefix="swiftybox-test-", dir=root)
+            started = timestamp()
+            start = time.monotonic()
+            try:
+                if test.input_file:
+                    with open(os.path.join(workdir, "input"), "wb") as f:
+                        f.write(self._bytes(test.input_file))
+                proc = await asyncio.create_subprocess_exec(
+                    "/bin/sh", "-c", substitute_binary(test.command, self.binary),
+                    cwd=workdir, env=self.env, stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+                    start_new_session=True)
+                try:
+                    stdout, _ = await asyncio.wait_for(
+                        proc.communicate(self._bytes(test.stdin)), self.timeout)
+                except asyncio.TimeoutError:
+                    # The command may have forked; take down its whole group
+                    try:
+                        os.killpg(proc.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                    await proc.wait()
+                    return CaseResult(test, test_name, 'failed', time.monotonic() - start,
+                                      started, expected=expected, exit_code=-1,
+                                      reason=f"timed out after {self.timeout:g}s")
+            except OSError as e:
+                return CaseResult(test, test_name, 'failed', time.monotonic() - start,
+                                  started, expected=expected, exit_code=-1, reason=str(e))
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+        passed = stdout == expected and proc.returncode == 0
+        return CaseResult(test, test_name, 'passed' if passed else 'failed',
+                          time.monotonic() - start, started, stdout, expected, proc.returncode)
+
+    def suite_block(self, suite: Suite, results: List[CaseResult]) -> List[str]:
+        """The suite's `swift test` log lines, in the Linux XCTest format.
+
+        Captured output is split into lines exactly where reading the log
+        back would split it, so the run folded from these lines matches a
+        later load_run() of the log.
+        """
+        started = min((r.started for r in results), default=timestamp())
+        lines = [f"Test Suite '{suite.name}' started at {started}\n"]
+        failures = skipped = 0
+        for result in results:
+            test = result.test
+            case_id = f"{suite.name}.{result.test_name}"
+            location = f"{suite.source}:{test.line}"
+            lines.append(f"Test Case '{case_id}' started at {result.started}\n")
+            if result.status == 'skipped':
+                skipped += 1
+                lines.append(f"{location}: {case_id} : Test skipped - {result.reason}\n")
+            elif result.status == 'failed':
+                failures += 1
+                # TestRunner's FAIL block, then the assertion XCTest would report
+                actual = result.stdout.decode('utf-8', errors='replace')
+                expected = result.expected.decode('utf-8', errors='replace')
+                lines += [f"FAIL: {test.name}\n", "Expected output:\n", f"{expected}\n",
+                          "Actual output:\n", f"{actual}\n", f"Exit code: {result.exit_code}\n",
+                          "\n"]
+                if result.reason:
+                    message = f"XCTFail failed - {test.name}: {result.reason}"
+                elif result.stdout != result.expected:
+                    message = (f"XCTAssertEqual failed: (\"{preview(result.stdout)}\") is not "
+                               f"equal to (\"{preview(result.expected)}\") - {test.name}")
+                else:
+                    message = (f"XCTAssertEqual failed: (\"{result.exit_code}\") is not equal "
+                               f"to (\"0\") - {test.name}: exit code")
+                lines.append(f"{location}: error: {case_id} : {message}\n")
+            lines.append(f"Test Case '{case_id}' {result.status} ({result.duration:.3f} seconds)\n")
+        duration = sum(r.duration for r in results)
+        skipped_text = f"{plural(skipped, 'test')} skipped and " if skipped else ""
+        lines.append(f"Test Suite '{suite.name}' {'failed' if failures else 'passed'} "
+                     f"at {timestamp()}\n")
+        lines.append(f"\t Executed {plural(len(results), 'test')}, with {skipped_text}"
+                     f"{plural(failures, 'failure')} (0 unexpected) in "
+                     f"{duration:.3f} ({duration:.3f}) seconds\n")
+        return _LOG_LINE_RE.findall("".join(lines))
+
+    async def run_suite(self, suite: Suite, root: str, slots: asyncio.Semaphore,
+                        merger: LogMerger) -> None:
+        results = await asyncio.gather(*(
+            self.run_case(test, test.method_name(i), root, slots)
+            for i, test in enumerate(suite.tests, 1)))
+        lines = self.suite_block(suite, results)
+        merger.write(lines)
+        for event in iter_events(lines, self._parser):
+            self.run.add(event)
+
+    async def run_suites(self, suites: Sequence[Suite], out: TextIO) -> TestRun:
+        """Run every suite, writing the merged log to `out`; returns the folded run"""
+        slots = asyncio.Semaphore(self.jobs)
+        merger = LogMerger(out)
+        self.run.add(RunStarted(timestamp()))
+        merger.start()
+        with tempfile.TemporaryDirectory(prefix="swiftybox-bbtests-") as root:
+            await asyncio.gather(*(self.run_suite(suite, root, slots, merger)
+                                   for suite in suites))
+        merger.finish()
+        return self.run
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+BusyBox testsuite (.tests) parsing.
+
+BusyBox .tests files are POSIX sh scripts built on testing.sh. Rather than
+pattern-matching `testing` calls, a small single-pass lexer tokenizes the
+subset of sh those files use (quoting, escapes, $'..' strings, line
+continuations, heredocs, comments and operators), and `testing` commands
+are read off the token stream together with the `optional` features and
+SKIP guard in effect at the time. Calls whose arguments depend on values
+only known when the script runs (variables, command substitution) are
+reported as unparseable instead of being silently mangled.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+
+class BusyBoxTest:
+    """Represents a single BusyBox test case"""
+
+    def __init__(self, name: str, command: str, expected: str,
+                 input_file: str = "", stdin: str = "", line: int = 0,
+                 optional_features: Sequence[str] = (), skip_guard: str = ""):
+        self.name = name
+        self.command = command
+        self.expected = expected
+        self.input_file = input_file
+        self.stdin = stdin
+        # Source line and the `optional`/SKIP guards in effect at the call
+        self.line = line
+        self.optional_features = list(optional_features)
+        self.skip_guard = skip_guard
+
+    def method_name(self, index: int, prefix: str = "") -> str:
+        """XCTest method name; `index` (and `prefix`, if any) keep it unique"""
+        # Clean up name for Swift method name
+        sanitized = self._sanitize_name(self.name or f"Test{index}")
+        return f"test{prefix}{sanitized}_{index}"
+
+    def to_swift_method(self, index: int, prefix: str = "") -> str:
+        """Convert to Swift XCTest method"""
+        method_name = self.method_name(index, prefix)
+
+        # Escape strings for Swift
+        name_escaped = self._escape_swift_string(self.name)
+        command_escaped = self._escape_swift_string(self.command)
+        expected_escaped = self._escape_swift_string(self.expected)
+        input_escaped = self._escape_swift_string(self.input_file)
+        stdin_escaped = self._escape_swift_string(self.stdin)
+
+        # Build test method
+        lines = []
+        if self.optional_features:
+            lines.append(f"    // BusyBox optional: {' '.join(self.optional_features)}")
+        if self.skip_guard:
+            lines.append(f"    // BusyBox SKIP={self.skip_guard}")
+        lines += [
+            f"    func {method_name}() {{",
+            f"        runner.testing(",
+            f'            "{name_escaped}",',
+            f'            command: "{command_escaped}",',
+        ]
+
+        # Add expected output
+        has_more = self.input_file or self.stdin
+        if has_more:
+            lines.append(f'            expectedOutput: "{expected_escaped}",')
+        else:
+            lines.append(f'            expectedOutput: "{expected_escaped}"')
+
+        # Add optional parameters
+        if self.input_file and self.stdin:
+            lines.append(f'            inputFile: "{input_escaped}",')
+            lines.append(f'            stdin: "{stdin_escaped}"')
+        elif self.input_file:
+            lines.append(f'            inputFile: "{input_escaped}"')
+        elif self.stdin:
+            lines.append(f'            stdin: "{stdin_escaped}"')
+
+        lines.append("        )")
+        lines.append("    }")
+
+        return "\n".join(lines)
+
+    def to_record(self, suite: str) -> Dict[str, object]:
+        """Convert to a JSON-serializable row for the data-driven case file"""
+        record = {
+            "suite": suite,
+            "name": self.name,
+            "command": self.command,
+            "expected": self.expected,
+            "input": self.input_file,
+            "stdin": self.stdin,
+            "line": self.line,
+        }
+        if self.optional_features:
+            record["features"] = self.optional_features
+        if self.skip_guard:
+            record["skip"] = self.skip_guard
+        return record
+
+    @staticmethod
+    def _sanitize_name(name: str) -> str:
+        """Convert test name to valid Swift method name"""
+        # Remove special characters, replace spaces with underscores
+        name = re.sub(r'[^a-zA-Z0-9_]', '_', name)
+        # Remove leading digits
+        name = re.sub(r'^[0-9]+', '', name)
+        # Capitalize first letter of each word
+        parts = name.split('_')
+        return ''.join(p.capitalize() for p in parts if p)
+
+    @staticmethod
+    def _escape_swift_string(s: str) -> str:
+        """Escape string for Swift string literal"""
+        if not s:
+            return ""
+        return (s.replace('\\', '\\\\')
+                 .replace('"', '\\"')
+                 .replace('\n', '\\n')
+                 .replace('\t', '\\t')
+                 .replace('\r', '\\r'))
+
+
+
+class LexError(Exception):
+    def __init__(self, message: str, line: int):
+        super().__init__(f"line {line}: {message}")
+        self.message = message
+        self.line = line
+
+
+class Token(NamedTuple):
+    kind: str           # 'word', 'op' or 'newline'
+    value: str
+    line: int
+    quoted: bool = False
+    dynamic: bool = False   # contains an expansion the importer cannot evaluate
+
+
+_OPERATORS = ('<<-', '&&', '||', ';;', '<<', '>>', '>&', '<&', '&>', '>|',
+              ';', '&', '|', '(', ')', '<', '>')
+_WORD_PLAIN_RE = re.compile(r"[^\s;&|()<>\\'\"$`]+")
+_DQ_PLAIN_RE = re.compile(r'[^"\\$`]+')
+_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_ASSIGNMENT_RE = re.compile(r"([A-Za-z_][A-Za-z0-9_]*)=(.*)", re.DOTALL)
+_ANSI_C_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'a': '\a', 'b': '\b', 'f': '\f',
+                   'v': '\v', 'e': '\x1b', 'E': '\x1b', '\\': '\\', "'": "'", '"': '"', '?': '?'}
+# Words that may precede a simple command without being its name
+_RESERVED_PREFIXES = {'then', 'do', 'else', '{', '!', 'time'}
+
+
+class ShellLexer:
+    """Single-pass tokenizer for the sh subset used by BusyBox testsuites.
+
+    Every character is consumed once; plain runs are taken with compiled
+    regexes and word pieces are collected in lists and joined once, so
+    scanning is linear in the size of the file.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.line = 1
+        self._heredocs: List[Tuple[str, bool]] = []
+        self._want_delimiter = None
+
+    def tokens(self) -> Iterator[Token]:
+        text, n = self.text, len(self.text)
+        while self.pos < n:
+            c = text[self.pos]
+            if c == ' ' or c == '\t':
+                self.pos += 1
+            elif c == '\n':
+                yield Token('newline', '\n', self.line)
+                self.pos += 1
+                self.line += 1
+                if self._heredocs:
+                    self._skip_heredoc_bodies()
+            elif c == '\\' and text.startswith('\n', self.pos + 1):
+                # Line continuation between words
+                self.pos += 2
+                self.line += 1
+            elif c == '#':
+                end = text.find('\n', self.pos)
+                self.pos = n if end < 0 else end
+            elif c in ';&|()<>':
+                op = next(o for o in _OPERATORS if text.startswith(o, self.pos))
+                self.pos += len(op)
+                if op in ('<<', '<<-'):
+                    self._want_delimiter = op == '<<-'
+                yield Token('op', op, self.line)
+            else:
+                token = self._read_word()
+                if self._want_delimiter is not None:
+                    self._heredocs.append((token.value, self._want_delimiter))
+                    self._want_delimiter = None
+                yield token
+
+    # -- words ---------------------------------------------------------------
+
+    def _read_word(self) -> Token:
+        text, n = self.text, len(self.text)
+        line = self.line
+        parts = []
+        quoted = dynamic = False
+        while self.pos < n:
+            match = _WORD_PLAIN_RE.match(text, self.pos)
+            if match:
+                parts.append(match.group())
+                self.pos = match.end()
+                continue
+            c = text[self.pos]
+            if c in ' \t\n;&|()<>':
+                break
+            if c == '\\':
+                if self.pos + 1 >= n:
+                    parts.append('\\')
+                    self.pos += 1
+                elif text[self.pos + 1] == '\n':
+                    self.pos += 2
+                    self.line += 1
+                else:
+                    parts.append(text[self.pos + 1])
+                    self.pos += 2
+            elif c == "'":
+                end = text.find("'", self.pos + 1)
+                if end < 0:
+                    raise LexError("unterminated single quote", self.line)
+                segment = text[self.pos + 1:end]
+                self.line += segment.count('\n')
+                parts.append(segment)
+                self.pos = end + 1
+                quoted = True
+            elif c == '"':
+                segment, dyn = self._read_double_quoted()
+                parts.append(segment)
+                dynamic |= dyn
+                quoted = True
+            elif c == '$' and text.startswith("'", self.pos + 1):
+                parts.append(self._read_ansi_c())
+                quoted = True
+            elif c == '$':
+                segment, dyn = self._read_dollar()
+                parts.append(segment)
+                dynamic |= dyn
+            else:  # '`'
+                parts.append(self._read_backtick())
+                dynamic = True
+        return Token('word', ''.join(parts), line, quoted, dynamic)
+
+    def _read_double_quoted(self) -> Tuple[str, bool]:
+        text, n = self.text, len(self.text)
+        start_line = self.line
+        self.pos += 1
+        parts = []
+        dynamic = False
+        while True:
+            if self.pos >= n:
+                raise LexError("unterminated double quote", start_line)
+            match = _DQ_PLAIN_RE.match(text, self.pos)
+            if match:
+                segment = match.group()
+                self.line += segment.count('\n')
+                parts.append(segment)
+                self.pos = match.end()
+                continue
+            c = text[self.pos]
+            if c == '"':
+                self.pos += 1
+                return ''.join(parts), dynamic
+            if c == '\\':
+                nxt = text[self.pos + 1:self.pos + 2]
+                if nxt == '\n':
+                    self.line += 1
+                    self.pos += 2
+                elif nxt and nxt in '$`"\\':
+                    parts.append(nxt)
+                    self.pos += 2
+                else:
+                    parts.append('\\')
+                    self.pos += 1
+            elif c == '$':
+                segment, dyn = self._read_dollar()
+                parts.append(segment)
+                dynamic |= dyn
+            else:  # '`'
+                parts.append(self._read_backtick())
+                dynamic = True
+
+    def _read_ansi_c(self) -> str:
+        """Decode a $'...' string"""
+        text, n = self.text, len(self.text)
+        start_line = self.line
+        self.pos += 2
+        parts = []
+        while True:
+            if self.pos >= n:
+                raise LexError("unterminated $'...' string", start_line)
+            c = text[self.pos]
+            if c == "'":
+                self.pos += 1
+                return ''.join(parts)
+            if c != '\\':
+                self.line += c == '\n'
+                parts.append(c)
+                self.pos += 1
+                continue
+            nxt = text[self.pos + 1:self.pos + 2]
+            if nxt in _ANSI_C_ESCAPES:
+                parts.append(_ANSI_C_ESCAPES[nxt])
+                self.pos += 2
+            elif nxt == 'x':
+                digits = re.match(r"[0-9A-Fa-f]{1,2}", text[self.pos + 2:self.pos + 4])
+                if digits:
+                    parts.append(chr(int(digits.group(), 16)))
+                    self.pos += 2 + len(digits.group())
+                else:
+                    parts.append('\\x')
+                    self.pos += 2
+            elif nxt.isdigit() and nxt in '01234567':
+                digits = re.match(r"[0-7]{1,3}", text[self.pos + 1:self.pos + 4]).group()
+                parts.append(chr(int(digits, 8)))
+                self.pos += 1 + len(digits)
+            else:
+                parts.append('\\' + nxt)
+                self.pos += 1 + len(nxt)
+
+    def _read_dollar(self) -> Tuple[str, bool]:
+        """Consume a $-expansion, returning its literal text and whether it expands"""
+        text = self.text
+        start = self.pos
+        nxt = text[start + 1:start + 2]
+        if nxt == '{':
+            end = self._find_closing(start + 2, '{', '}')
+        elif nxt == '(':
+            end = self._find_closing(start + 2, '(', ')')
+        elif nxt and (nxt.isdigit() or nxt in '@*#?$!-'):
+            end = start + 2
+        else:
+            match = _NAME_RE.match(text, start + 1)
+            if not match:
+                # A lone '$' is literal
+                self.pos += 1
+                return '$', False
+            end = match.end()
+        segment = text[start:end]
+        self.line += segment.count('\n')
+        self.pos = end
+        return segment, True
+
+    def _find_closing(self, pos: int, opening: str, closing: str) -> int:
+        """Index just past the bracket closing an expansion, skipping quoted text"""
+        text, n = self.text, len(self.text)
+        depth = 1
+        while pos < n:
+            c = text[pos]
+            if c == '\\':
+                pos += 2
+                continue
+            if c == "'" and opening == '(':
+                end = text.find("'", pos + 1)
+                pos = n if end < 0 else end + 1
+                continue
+            if c == opening:
+                depth += 1
+            elif c == closing:
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            pos += 1
+        raise LexError(f"unterminated ${opening}...{closing}", self.line)
+
+    def _read_backtick(self) -> str:
+        text = self.text
+        pos = self.pos + 1
+        while True:
+            end = text.find('`', pos)
+            if end < 0:
+                raise LexError("unterminated backquote", self.line)
+            if text[end - 1] != '\\':
+                break
+            pos = end + 1
+        segment = text[self.pos:end + 1]
+        self.line += segment.count('\n')
+        self.pos = end + 1
+        return segment
+
+    def _skip_heredoc_bodies(self) -> None:
+        """Skip the bodies of heredocs started on the line just ended"""
+        text, n = self.text, len(self.text)
+        for delimiter, strip_tabs in self._heredocs:
+            while self.pos < n:
+                end = text.find('\n', self.pos)
+                end = n if end < 0 else end
+                body_line = text[self.pos:end]
+                self.pos = min(end + 1, n)
+                self.line += 1
+                if (body_line.lstrip('\t') if strip_tabs else body_line) == delimiter:
+                    break
+        self._heredocs = []
+
+
+# ---------------------------------------------------------------------------
+# testing.sh calls
+# ---------------------------------------------------------------------------
+
+class ParseReport(NamedTuple):
+    tests: List[BusyBoxTest]
+    unparseable: List[Tuple[int, str]]   # (line, reason) per rejected call
+
+
+def parse_busybox_tests(content: str) -> ParseReport:
+    """Extract every `testing` call from .tests source in one linear scan"""
+    tests: List[BusyBoxTest] = []
+    unparseable: List[Tuple[int, str]] = []
+    optional_features: List[str] = []
+    skip_guard = ""
+
+    def finish(words: List[Token]) -> None:
+        nonlocal optional_features, skip_guard
+        i = 0
+        while i < len(words) and not words[i].quoted and words[i].value in _RESERVED_PREFIXES:
+            i += 1
+        prefix_skip = None
+        while i < len(words) and not words[i].quoted:
+            assignment = _ASSIGNMENT_RE.fullmatch(words[i].value)
+            if not assignment:
+                break
+            if assignment.group(1) == 'SKIP':
+                prefix_skip = assignment.group(2)
+            i += 1
+        if i >= len(words):
+            # A bare `SKIP=...` sets the guard for the rest of the script;
+            # `SKIP=` is how testing.sh closes an `optional` section
+            if prefix_skip is not None:
+                skip_guard = prefix_skip
+                if not skip_guard:
+                    optional_features = []
+            return
+        if words[i].quoted:
+            return
+        # `SKIP=1 testing ...` only applies to that one command
+        guard = skip_guard if prefix_skip is None else prefix_skip
+
+        name, args = words[i].value, words[i + 1:]
+        if name == 'optional':
+            optional_features = [a.value for a in args]
+        elif name == 'testing':
+            line = words[i].line
+            if len(args) < 3:
+                unparseable.append((line, f"expected at least 3 arguments, got {len(args)}"))
+            elif any(a.dynamic for a in args):
+                unparseable.append((line, "arguments use shell expansions ($var, $(...) or `...`)"))
+            else:
+                values = [a.value for a in args[:5]] + [""] * (5 - min(len(args), 5))
+                tests.append(BusyBoxTest(*values, line=line, optional_features=optional_features,
+                                         skip_guard=guard))
+
+    lexer = ShellLexer(content)
+    words: List[Token] = []
+    try:
+        for token in lexer.tokens():
+            if token.kind == 'word':
+                words.append(token)
+            else:
+                finish(words)
+                words = []
+        finish(words)
+    except LexError as e:
+        unparseable.append((e.line, f"{e.message}; rest of file not scanned"))
+
+    return ParseReport(tests, unparseable)
+
+
+def parse_busybox_test_file(filepath: Path) -> Tuple[str, List[BusyBoxTest], List[Tuple[int, str]]]:
+    """Parse a BusyBox .tests file into (command name, tests, unparseable calls)"""
+    command_name = filepath.name[:-len('.tests')] if filepath.name.endswith('.tests') else filepath.stem
+    report = parse_busybox_tests(filepath.read_text())
+    return command_name, report.tests, report.unparseable
@@ -48,23 +48,12 @@ COMMANDS=(
     "tac" "rev" "expand" "hexdump" "shuf" "stat" "du" "df"
 )
 
-# Generate tests for each command that has a .tests file
-count=0
-for cmd in "${COMMANDS[@]}"; do
-    test_file="$BUSYBOX_TESTS/$cmd.tests"
-
-    if [ -f "$test_file" ]; then
-        echo "Generating ${cmd}Tests.swift..."
-        "$SCRIPT_DIR/import-busybox-tests.py" "$test_file" > "$OUTPUT_DIR/${cmd^}Tests.swift"
-        ((count++))
-    else
-        echo "Skipping $cmd (no $cmd.tests file found)"
-    fi
-done
+# Generate tests for every listed command in one importer process
+"$SCRIPT_DIR/import-busybox-tests.py" --commands "${COMMANDS[@]}" \
+    --output-dir "$OUTPUT_DIR" -- "$BUSYBOX_TESTS"
 
 echo ""
 echo "=== Generation Complete ==="
-echo "Generated $count test files in $OUTPUT_DIR/"
 echo ""
 echo "Next steps:"
 echo "  1. Review generated files"
@@ -23,43 +23,13 @@ mkdir -p "$OUTPUT_DIR"
 echo "Scanning for available .tests files..."
 echo ""
 
-# Find all .tests files and generate Swift tests for them
-count=0
-skipped=0
-
-for test_file in "$BUSYBOX_TESTS"/*.tests; do
-    if [ ! -f "$test_file" ]; then
-        continue
-    fi
-
-    # Extract command name from filename
-    filename=$(basename "$test_file")
-    cmd="${filename%.tests}"
-
-    # Skip some special test files
-    if [[ "$cmd" == "all_sourcecode" || "$cmd" == "busybox" || "$cmd" == "parse" ]]; then
-        echo "Skipping $cmd (special test file)"
-        ((skipped++))
-        continue
-    fi
-
-    echo "Generating ${cmd}Tests.swift from $filename..."
-
-    # Generate the test file
-    if "$SCRIPT_DIR/import-busybox-tests.py" "$test_file" > "$OUTPUT_DIR/${cmd^}Tests.swift" 2>/dev/null; then
-        ((count++))
-    else
-        echo "  Warning: Failed to parse $filename"
-        rm -f "$OUTPUT_DIR/${cmd^}Tests.swift"
-        ((skipped++))
-    fi
-done
+# Generate Swift tests for all .tests files in one importer process,
+# skipping special test files that are not applet suites
+"$SCRIPT_DIR/import-busybox-tests.py" --all --skip all_sourcecode busybox parse \
+    --output-dir "$OUTPUT_DIR" "$BUSYBOX_TESTS"
 
 echo ""
 echo "=== Generation Complete ==="
-echo "Generated: $count test files"
-echo "Skipped: $skipped files"
-echo "Output: $OUTPUT_DIR/"
 echo ""
 echo "Generated test files:"
 ls -1 "$OUTPUT_DIR"/*.swift 2>/dev/null | sed 's/.*\//  - /' || echo "  (none)"
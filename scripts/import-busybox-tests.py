@@ -8,156 +8,38 @@ and generates Swift XCTest test cases.
 Usage:
     ./import-busybox-tests.py ../busybox/testsuite/echo.tests > Tests/SwiftyBoxTests/Generated/EchoTests.swift
     ./import-busybox-tests.py --all ../busybox/testsuite/
+    ./import-busybox-tests.py --commands echo pwd sort -- ../busybox/testsuite/
+    ./import-busybox-tests.py --all --format jsonl ../busybox/testsuite/
+    ./import-busybox-tests.py --all --shards 8 --timings test-results-*.log -- ../busybox/testsuite/
 """
 
-import re
+import hashlib
+import json
+import os
 import sys
 import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
-
-class BusyBoxTest:
-    """Represents a single BusyBox test case"""
-
-    def __init__(self, name: str, command: str, expected: str,
-                 input_file: str = "", stdin: str = ""):
-        self.name = name
-        self.command = command
-        self.expected = expected
-        self.input_file = input_file
-        self.stdin = stdin
-
-    def to_swift_method(self, index: int) -> str:
-        """Convert to Swift XCTest method"""
-        # Clean up name for Swift method name
-        sanitized = self._sanitize_name(self.name or f"Test{index}")
-        # Add index to ensure uniqueness
-        method_name = f"test{sanitized}_{index}"
-
-        # Escape strings for Swift
-        name_escaped = self._escape_swift_string(self.name)
-        command_escaped = self._escape_swift_string(self.command)
-        expected_escaped = self._escape_swift_string(self.expected)
-        input_escaped = self._escape_swift_string(self.input_file)
-        stdin_escaped = self._escape_swift_string(self.stdin)
-
-        # Build test method
-        lines = [
-            f"    func {method_name}() {{",
-            f"        runner.testing(",
-            f'            "{name_escaped}",',
-            f'            command: "{command_escaped}",',
-        ]
-
-        # Add expected output
-        has_more = self.input_file or self.stdin
-        if has_more:
-            lines.append(f'            expectedOutput: "{expected_escaped}",')
-        else:
-            lines.append(f'            expectedOutput: "{expected_escaped}"')
-
-        # Add optional parameters
-        if self.input_file and self.stdin:
-            lines.append(f'            inputFile: "{input_escaped}",')
-            lines.append(f'            stdin: "{stdin_escaped}"')
-        elif self.input_file:
-            lines.append(f'            inputFile: "{input_escaped}"')
-        elif self.stdin:
-            lines.append(f'            stdin: "{stdin_escaped}"')
-
-        lines.append("        )")
-        lines.append("    }")
-
-        return "\n".join(lines)
-
-    @staticmethod
-    def _sanitize_name(name: str) -> str:
-        """Convert test name to valid Swift method name"""
-        # Remove special characters, replace spaces with underscores
-        name = re.sub(r'[^a-zA-Z0-9_]', '_', name)
-        # Remove leading digits
-        name = re.sub(r'^[0-9]+', '', name)
-        # Capitalize first letter of each word
-        parts = name.split('_')
-        return ''.join(p.capitalize() for p in parts if p)
-
-    @staticmethod
-    def _escape_swift_string(s: str) -> str:
-        """Escape string for Swift string literal"""
-        if not s:
-            return ""
-        return (s.replace('\\', '\\\\')
-                 .replace('"', '\\"')
-                 .replace('\n', '\\n')
-                 .replace('\t', '\\t')
-                 .replace('\r', '\\r'))
-
-
-def preprocess_multiline_content(content: str) -> str:
-    """Join lines ending with backslash continuation"""
-    lines = content.split('\n')
-    result = []
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-        # Check if line ends with backslash (continuation)
-        while i < len(lines) and line.rstrip().endswith('\\'):
-            # Remove trailing backslash and whitespace
-            line = line.rstrip()[:-1].rstrip()
-            i += 1
-            if i < len(lines):
-                # Append next line (with leading whitespace removed)
-                line += ' ' + lines[i].lstrip()
-        result.append(line)
-        i += 1
-
-    return '\n'.join(result)
-
-
-def parse_busybox_test_file(filepath: Path) -> Tuple[str, List[BusyBoxTest]]:
-    """Parse a BusyBox .tests file and extract test cases"""
-    tests = []
-    raw_content = filepath.read_text()
-
-    # Preprocess: join multi-line continuations
-    content = preprocess_multiline_content(raw_content)
-
-    # Extract command name from filename
-    command_name = filepath.stem.replace('.tests', '')
-
-    # Pattern to match testing() function calls
-    # testing "description" "command" "expected" "input" "stdin"
-    pattern = r'''testing\s+
-        ['"]([^'"]*)['"]\s+           # Test name (group 1)
-        ['"]([^'"]*)['"]\s+           # Command (group 2)
-        ['"]([^'"]*)['"]\s*           # Expected output (group 3)
-        (?:['"]([^'"]*)['"]\s*)?      # Input file (group 4, optional)
-        (?:['"]([^'"]*)['"]\s*)?      # Stdin (group 5, optional)
-    '''
-
-    # Also handle multi-line strings in shell scripts
-    # This is a simplified parser - may need enhancement
-    for match in re.finditer(pattern, content, re.VERBOSE | re.MULTILINE):
-        name = match.group(1) or ""
-        command = match.group(2) or ""
-        expected = match.group(3) or ""
-        input_file = match.group(4) or ""
-        stdin = match.group(5) or ""
-
-        tests.append(BusyBoxTest(name, command, expected, input_file, stdin))
-
-    return command_name, tests
+from busyboxtests import BusyBoxTest, parse_busybox_test_file
+from stageprofile import NO_PROFILE, StageProfile, add_profile_argument
+from testshards import load_case_durations, lpt_pack
 
 
 def generate_swift_test_file(command_name: str, tests: List[BusyBoxTest]) -> str:
     """Generate complete Swift test file"""
     class_name = command_name.capitalize() + "Tests"
+    methods = [test.to_swift_method(i) for i, test in enumerate(tests, 1)]
+    return swift_test_class(class_name, f"BusyBox {command_name}.tests", methods)
 
+
+def swift_test_class(class_name: str, source: str, methods: List[str]) -> str:
+    """Wrap generated test methods in a TestRunner-backed XCTestCase"""
     lines = [
         f"// {class_name}.swift",
-        f"// Auto-generated from BusyBox {command_name}.tests",
+        f"// Auto-generated from {source}",
         "// DO NOT EDIT - regenerate with import-busybox-tests.py",
         "",
         "import XCTest",
@@ -184,8 +66,8 @@ def generate_swift_test_file(command_name: str, tests: List[BusyBoxTest]) -> str
     ]
 
     # Add test methods
-    for i, test in enumerate(tests, 1):
-        lines.append(test.to_swift_method(i))
+    for method in methods:
+        lines.append(method)
         lines.append("")
 
     lines.append("}")
@@ -194,6 +76,497 @@ def generate_swift_test_file(command_name: str, tests: List[BusyBoxTest]) -> str
     return "\n".join(lines)
 
 
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import: os.umask can only be queried by setting it
+UMASK = _current_umask()
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """Write via a temp file in the same directory so readers never see a partial file"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        # mkstemp creates 0600; give the file the mode a plain open() would
+        os.chmod(tmp, 0o666 & ~UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+MANIFEST_NAME = ".import-manifest.json"
+
+# Any edit to this script or the .tests parser changes the generated code's
+# provenance, so their bytes act as the generator version in the manifest
+GENERATOR_VERSION = hashlib.sha256(
+    Path(__file__).read_bytes()
+    + (Path(__file__).parent / "busyboxtests.py").read_bytes()).hexdigest()[:16]
+
+
+def output_name(command_name: str) -> str:
+    return f"{command_name.capitalize()}Tests.swift"
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Atomically write `content` unless the file already holds exactly it.
+
+    Leaving identical files untouched keeps their mtimes, so SwiftPM does
+    not recompile the test target after a no-op regenerate.
+    """
+    data = content.encode()
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    write_atomic(path, content)
+    return True
+
+
+def report_unparseable(source: Path, unparseable: List[Tuple[int, str]]) -> None:
+    for line, reason in unparseable:
+        print(f"{source}:{line}: unparseable testing call: {reason}", file=sys.stderr)
+
+
+def import_test_file(test_file: Path, output_dir: Path
+                     ) -> Tuple[str, int, Optional[str], bool, List[Tuple[int, str]]]:
+    """Parse one .tests file and write its Swift suite (runs in a worker process)
+
+    Returns (command name, number of tests, reason it was skipped or None,
+    whether the output file was rewritten, unparseable calls as (line, reason)).
+    """
+    command_name = test_file.name[:-len(".tests")]
+    try:
+        command_name, tests, unparseable = parse_busybox_test_file(test_file)
+    except (OSError, UnicodeDecodeError) as e:
+        return command_name, 0, f"unreadable: {e}", False, []
+
+    if not tests:
+        return command_name, 0, "no tests found", False, unparseable
+
+    swift_code = generate_swift_test_file(command_name, tests)
+    written = write_if_changed(output_dir / output_name(command_name), swift_code)
+    return command_name, len(tests), None, written, unparseable
+
+
+def load_manifest(output_dir: Path) -> Dict[str, Dict]:
+    """Previous import results keyed by output file name"""
+    try:
+        manifest = json.loads((output_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("outputs", {}) if isinstance(manifest, dict) else {}
+
+
+def save_manifest(output_dir: Path, outputs: Dict[str, Dict]) -> None:
+    write_if_changed(output_dir / MANIFEST_NAME,
+                     json.dumps({"outputs": outputs}, indent=1, sort_keys=True) + "\n")
+
+
+def partition_cached(test_files: List[Path], output_dir: Path, manifest: Dict[str, Dict],
+                     force: bool = False) -> Tuple[List, List[Path], Dict[Path, Optional[str]]]:
+    """Split sources into (output name, manifest entry) pairs that are up to date
+    and files that need importing, hashing each source once (force: none are
+    up to date)"""
+    cached = []
+    pending = []
+    source_hashes = {}
+    for test_file in test_files:
+        try:
+            source_hash = hashlib.sha256(test_file.read_bytes()).hexdigest()
+        except OSError:
+            source_hash = None
+        source_hashes[test_file] = source_hash
+        name = output_name(test_file.name[:-len(".tests")])
+        entry = manifest.get(name)
+        if (not force and entry and source_hash and entry.get("source_hash") == source_hash
+                and entry.get("generator") == GENERATOR_VERSION
+                and (output_dir / name).exists()):
+            cached.append((name, entry))
+        else:
+            pending.append(test_file)
+    return cached, pending, source_hashes
+
+
+def import_batch(test_files: List[Path], output_dir: Path, jobs: Optional[int] = None,
+                 missing: List[str] = (), force: bool = False,
+                 profile: StageProfile = NO_PROFILE) -> int:
+    """Import many .tests files across a process pool and print one summary
+
+    A manifest in the output directory records the hash of each source file
+    and the generator version that produced each output. Sources whose hash
+    and generator are unchanged are skipped without parsing, and outputs
+    whose source file has disappeared are pruned. `force` regenerates every
+    given source but keeps the other outputs' entries, so they are still
+    tracked and pruned later.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(output_dir)
+
+    with profile.stage("hash sources"):
+        cached, pending, source_hashes = partition_cached(test_files, output_dir, manifest, force)
+
+    with profile.stage("import"):
+        if jobs == 1 or len(pending) <= 1:
+            results = [import_test_file(f, output_dir) for f in pending]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(import_test_file, pending,
+                                        [output_dir] * len(pending), chunksize=4))
+
+    generated = []
+    skipped = []
+    written = 0
+    for test_file, (name, count, reason, was_written, unparseable) in zip(pending, results):
+        out = output_name(name)
+        report_unparseable(test_file, unparseable)
+        if reason is None:
+            generated.append((name, count, len(unparseable)))
+            written += was_written
+            manifest[out] = {"source": str(test_file.resolve()), "source_hash": source_hashes[test_file],
+                             "generator": GENERATOR_VERSION, "tests": count,
+                             "unparseable": len(unparseable)}
+        else:
+            skipped.append((name, reason))
+            # A source that no longer yields tests must not leave a stale suite behind
+            if out in manifest:
+                (output_dir / out).unlink(missing_ok=True)
+                del manifest[out]
+    skipped += [(name, f"no {name}.tests file found") for name in missing]
+
+    pruned = []
+    for out, entry in list(manifest.items()):
+        if not Path(entry.get("source", "")).exists():
+            (output_dir / out).unlink(missing_ok=True)
+            del manifest[out]
+            pruned.append(out)
+    # Cases from a previous --shards import would otherwise run twice
+    for shard_file in sorted(output_dir.glob(SHARD_GLOB)):
+        shard_file.unlink()
+        pruned.append(shard_file.name)
+    # ... and so would the --format jsonl case table
+    pruned += [os.path.relpath(path, output_dir) for path in remove_case_table(output_dir)]
+    save_manifest(output_dir, manifest)
+
+    for name, count, unparsed in generated:
+        note = f", {unparsed} unparseable" if unparsed else ""
+        print(f"Generated {output_dir / output_name(name)} ({count} tests{note})")
+    for name, reason in skipped:
+        print(f"Skipping {name}: {reason}", file=sys.stderr)
+    for out in pruned:
+        print(f"Pruned {os.path.normpath(output_dir / out)} (source or layout removed)")
+
+    total_files = len(generated) + len(cached)
+    total_tests = sum(c for _, c, _ in generated) + sum(e.get("tests", 0) for _, e in cached)
+    total_unparsed = (sum(u for _, _, u in generated)
+                      + sum(e.get("unparseable", 0) for _, e in cached))
+    print(f"\n=== Import Summary ===")
+    print(f"Generated: {total_files} files, {total_tests} tests, "
+          f"{total_unparsed} unparseable testing calls")
+    print(f"           {written} rewritten, {len(generated) - written} identical, "
+          f"{len(cached)} unchanged sources skipped")
+    print(f"Skipped:   {len(skipped)} files")
+    if pruned:
+        print(f"Pruned:    {len(pruned)} files")
+    print(f"Output:    {output_dir}/")
+    return total_files
+
+
+SHARD_CLASS = "BusyBoxShard{:02d}Tests"
+SHARD_GLOB = "BusyBoxShard*Tests.swift"
+
+
+def shard_prefix(command_name: str) -> str:
+    """Method-name prefix that keeps cases from different commands apart in a shard"""
+    return BusyBoxTest._sanitize_name(command_name.capitalize()) + "_"
+
+
+def estimate_case_costs(suites: List[Tuple[str, List[BusyBoxTest]]],
+                        durations: Dict[Tuple[str, str], float]
+                        ) -> Tuple[List[Tuple[Tuple[str, int], float]], int]:
+    """Cost of every (command, index) case and how many had timing history
+
+    A case is looked up under its per-command class (EchoTests.testX_1) and
+    under its shard method name, so logs from either layout count. Cases
+    without history cost the median of the known ones; with no history at
+    all every case costs 1 and shards balance by case count.
+    """
+    by_method = {test: seconds for (suite, test), seconds in durations.items()
+                 if suite.startswith("BusyBoxShard")}
+    found = {}
+    for command_name, tests in suites:
+        class_name = command_name.capitalize() + "Tests"
+        prefix = shard_prefix(command_name)
+        for i, test in enumerate(tests, 1):
+            seconds = durations.get((class_name, test.method_name(i)))
+            if seconds is None:
+                seconds = by_method.get(test.method_name(i, prefix))
+            if seconds is not None:
+                found[(command_name, i)] = seconds
+
+    default = sorted(found.values())[len(found) // 2] if found else 1.0
+    costs = [((command_name, i), found.get((command_name, i), default))
+             for command_name, tests in suites for i in range(1, len(tests) + 1)]
+    return costs, len(found)
+
+
+def import_sharded(test_files: List[Path], output_dir: Path, shards: int,
+                   timing_logs: List[str] = (), jobs: Optional[int] = None,
+                   missing: List[str] = ()) -> int:
+    """Import .tests files into `shards` duration-balanced XCTestCase classes
+
+    Cases are packed longest-first onto the lightest shard using their
+    median duration in `timing_logs`, so `swift test --parallel` is not held
+    up by one large suite. Shard files are only rewritten when their content
+    changes, and per-command suites from a previous import are removed.
+    """
+    if jobs == 1 or len(test_files) <= 1:
+        results = [parse_test_file(f) for f in test_files]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(parse_test_file, test_files, chunksize=4))
+
+    suites = []
+    skipped = []
+    for test_file, (name, tests, reason, unparseable) in zip(test_files, results):
+        report_unparseable(test_file, unparseable)
+        if reason is None:
+            suites.append((name, tests))
+        else:
+            skipped.append((name, reason))
+    skipped += [(name, f"no {name}.tests file found") for name in missing]
+    suites.sort(key=lambda suite: suite[0])
+
+    durations = load_case_durations(timing_logs) if timing_logs else {}
+    costs, timed = estimate_case_costs(suites, durations)
+    tests_by_command = dict(suites)
+    packed = lpt_pack(costs, shards)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for shard, (_, cases) in enumerate(packed, 1):
+        cases.sort()
+        methods = [tests_by_command[command][i - 1].to_swift_method(i, shard_prefix(command))
+                   for command, i in cases]
+        class_name = SHARD_CLASS.format(shard)
+        source = f"{len(cases)} BusyBox cases (shard {shard} of {shards})"
+        written += write_if_changed(output_dir / f"{class_name}.swift",
+                                    swift_test_class(class_name, source, methods))
+
+    # Drop shards beyond the requested count and the per-command layout
+    current = {f"{SHARD_CLASS.format(shard)}.swift" for shard in range(1, shards + 1)}
+    pruned = [f for f in output_dir.glob(SHARD_GLOB) if f.name not in current]
+    pruned += [output_dir / out for out in load_manifest(output_dir)]
+    pruned += remove_case_table(output_dir)
+    for path in pruned:
+        path.unlink(missing_ok=True)
+        print(f"Pruned {path} (layout changed)")
+    (output_dir / MANIFEST_NAME).unlink(missing_ok=True)
+
+    for name, reason in skipped:
+        print(f"Skipping {name}: {reason}", file=sys.stderr)
+
+    print(f"\n=== Import Summary ===")
+    print(f"Cases:     {len(costs)} from {len(suites)} suites, "
+          f"{timed} with timing history from {len(timing_logs)} logs")
+    for shard, (load, cases) in enumerate(packed, 1):
+        estimate = f", estimated {load:.3f}s" if timed else ""
+        print(f"  {SHARD_CLASS.format(shard)}: {len(cases):5} cases{estimate}")
+    print(f"Shards:    {shards} ({written} rewritten)")
+    print(f"Skipped:   {len(skipped)} files")
+    print(f"Output:    {output_dir}/")
+    return len(suites)
+
+
+CASES_TEST_CLASS = "BusyBoxCaseTableTests"
+CASES_RUNNER_HEADER = "// Auto-generated table-driven runner for "
+
+
+def remove_case_table(output_dir: Path) -> List[Path]:
+    """Delete a --format jsonl runner and the case file it names; returns what was removed"""
+    runner = output_dir / f"{CASES_TEST_CLASS}.swift"
+    try:
+        header = runner.read_text().splitlines()[1]
+    except (OSError, IndexError):
+        return []
+    removed = [runner]
+    if header.startswith(CASES_RUNNER_HEADER):
+        removed.append(Path(header[len(CASES_RUNNER_HEADER):]))
+    for path in removed:
+        path.unlink(missing_ok=True)
+    return removed
+
+
+def generate_cases_file(suites: List[Tuple[str, List[BusyBoxTest]]]) -> str:
+    """Serialize imported cases as JSON Lines, one case per line"""
+    lines = []
+    for command_name, tests in suites:
+        for test in tests:
+            lines.append(json.dumps(test.to_record(command_name), ensure_ascii=False,
+                                    separators=(",", ":")))
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def generate_case_table_test_file(cases_path: str) -> str:
+    """Generate the single table-driven Swift suite that runs a JSON Lines case file
+
+    The Swift source only depends on the case file's path, so importing more
+    BusyBox cases never adds code to the test target.
+    """
+    class_name = CASES_TEST_CLASS
+    cases_path_escaped = BusyBoxTest._escape_swift_string(cases_path)
+    lines = [
+        f"// {class_name}.swift",
+        f"{CASES_RUNNER_HEADER}{cases_path}",
+        "// DO NOT EDIT - regenerate with import-busybox-tests.py --format jsonl",
+        "",
+        "import Foundation",
+        "import XCTest",
+        "",
+        "/// One BusyBox testing.sh case from the JSON Lines case file",
+        "struct BusyBoxCase: Decodable {",
+        "    let suite: String",
+        "    let name: String",
+        "    let command: String",
+        "    let expected: String",
+        "    let input: String",
+        "    let stdin: String",
+        "    let line: Int",
+        "    let features: [String]?",
+        "    let skip: String?",
+        "}",
+        "",
+        f"final class {class_name}: XCTestCase {{",
+        "    var swiftyboxPath: String {",
+        "        let cwd = FileManager.default.currentDirectoryPath",
+        '        return "\\(cwd)/.build/debug/swiftybox"',
+        "    }",
+        "",
+        "    /// BUSYBOX_CASES overrides the case file imported at generation time",
+        "    var casesPath: String {",
+        '        if let path = ProcessInfo.processInfo.environment["BUSYBOX_CASES"] {',
+        "            return path",
+        "        }",
+        f'        let path = "{cases_path_escaped}"',
+        '        return path.hasPrefix("/") ? path : "\\(FileManager.default.currentDirectoryPath)/\\(path)"',
+        "    }",
+        "",
+        "    func loadCases() throws -> [BusyBoxCase] {",
+        "        let contents = try String(contentsOfFile: casesPath, encoding: .utf8)",
+        "        let decoder = JSONDecoder()",
+        '        return try contents.split(separator: "\\n").map { line in',
+        "            try decoder.decode(BusyBoxCase.self, from: Data(line.utf8))",
+        "        }",
+        "    }",
+        "",
+        "    /// Runs every case (or only the suites listed in BUSYBOX_SUITES,",
+        "    /// comma-separated) and reports each failure by suite and case name",
+        "    func testBusyBoxCases() throws {",
+        "        let suites = ProcessInfo.processInfo.environment[\"BUSYBOX_SUITES\"]",
+        '            .map { Set($0.split(separator: ",").map(String.init)) }',
+        '        let runner = TestRunner(verbose: ProcessInfo.processInfo.environment["VERBOSE"] != nil,',
+        "                                swiftyboxPath: swiftyboxPath)",
+        "",
+        "        for testCase in try loadCases() where suites?.contains(testCase.suite) ?? true {",
+        "            let result = runner.testing(",
+        "                testCase.name,",
+        "                command: testCase.command,",
+        "                expectedOutput: testCase.expected,",
+        "                inputFile: testCase.input,",
+        "                stdin: testCase.stdin",
+        "            )",
+        "            if !result.passed {",
+        '                var guards = ""',
+        "                if let features = testCase.features {",
+        '                    guards += " optional: \\(features.joined(separator: " "))"',
+        "                }",
+        "                if let skip = testCase.skip {",
+        '                    guards += " SKIP=\\(skip)"',
+        "                }",
+        '                XCTFail("\\(testCase.suite).tests:\\(testCase.line): \\(testCase.name)\\(guards)")',
+        "            }",
+        "        }",
+        "        runner.printSummary()",
+        "    }",
+        "}",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def parse_test_file(test_file: Path) -> Tuple[str, List[BusyBoxTest], Optional[str], List[Tuple[int, str]]]:
+    """Parse one .tests file without writing anything (runs in a worker process)
+
+    Returns (command name, tests, reason it was skipped or None, unparseable calls).
+    """
+    command_name = test_file.name[:-len(".tests")]
+    try:
+        command_name, tests, unparseable = parse_busybox_test_file(test_file)
+    except (OSError, UnicodeDecodeError) as e:
+        return command_name, [], f"unreadable: {e}", []
+    return command_name, tests, None if tests else "no tests found", unparseable
+
+
+def import_case_table(test_files: List[Path], output_dir: Path, cases_path: Path,
+                      jobs: Optional[int] = None, missing: List[str] = ()) -> int:
+    """Import many .tests files into one JSON Lines case file and a table-driven suite
+
+    Every source is parsed on each run (parsing is cheap); both outputs are
+    only rewritten when their content changes, so SwiftPM sees no edits
+    after a no-op regenerate.
+    """
+    if jobs == 1 or len(test_files) <= 1:
+        results = [parse_test_file(f) for f in test_files]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(parse_test_file, test_files, chunksize=4))
+
+    suites = []
+    skipped = []
+    total_unparsed = 0
+    for test_file, (name, tests, reason, unparseable) in zip(test_files, results):
+        report_unparseable(test_file, unparseable)
+        total_unparsed += len(unparseable)
+        if reason is None:
+            suites.append((name, tests))
+        else:
+            skipped.append((name, reason))
+    skipped += [(name, f"no {name}.tests file found") for name in missing]
+    suites.sort(key=lambda suite: suite[0])
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cases_path.parent.mkdir(parents=True, exist_ok=True)
+    cases_written = write_if_changed(cases_path, generate_cases_file(suites))
+    test_file_path = output_dir / f"{CASES_TEST_CLASS}.swift"
+    class_written = write_if_changed(test_file_path, generate_case_table_test_file(str(cases_path)))
+
+    # Suites from a per-command or --shards import would run every case twice
+    pruned = [output_dir / out for out in load_manifest(output_dir)]
+    pruned += sorted(output_dir.glob(SHARD_GLOB))
+    for path in pruned:
+        path.unlink(missing_ok=True)
+        print(f"Pruned {path} (layout changed)")
+    (output_dir / MANIFEST_NAME).unlink(missing_ok=True)
+
+    for name, reason in skipped:
+        print(f"Skipping {name}: {reason}", file=sys.stderr)
+
+    total_tests = sum(len(tests) for _, tests in suites)
+    print(f"\n=== Import Summary ===")
+    print(f"Cases:     {total_tests} from {len(suites)} suites, "
+          f"{total_unparsed} unparseable testing calls")
+    print(f"           {cases_path} ({'rewritten' if cases_written else 'unchanged'})")
+    print(f"Runner:    {test_file_path} ({'rewritten' if class_written else 'unchanged'})")
+    print(f"Skipped:   {len(skipped)} files")
+    return len(suites)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Import BusyBox tests and convert to Swift"
@@ -201,46 +574,86 @@ def main():
     parser.add_argument("path", help="Path to .tests file or testsuite directory")
     parser.add_argument("--all", action="store_true",
                        help="Process all .tests files in directory")
+    parser.add_argument("--commands", nargs="+", metavar="CMD",
+                       help="Process only these commands' .tests files from the directory")
+    parser.add_argument("--skip", nargs="+", default=[], metavar="CMD",
+                       help="Commands to leave out in --all/--commands mode")
+    parser.add_argument("--force", action="store_true",
+                       help="Regenerate every selected file even if its source is unchanged")
+    parser.add_argument("--jobs", type=int, default=None,
+                       help="Worker processes for batch modes (default: CPU count)")
     parser.add_argument("--output-dir", default="Tests/SwiftyBoxTests/Generated",
                        help="Output directory for generated tests")
+    parser.add_argument("--format", choices=["swift", "jsonl"], default="swift",
+                       help="swift: one XCTestCase per command; jsonl: one JSON Lines "
+                            "case file plus a single table-driven XCTestCase")
+    parser.add_argument("--shards", type=int, metavar="N",
+                       help="Pack cases into N duration-balanced classes instead of "
+                            "one class per command (--format swift)")
+    parser.add_argument("--timings", nargs="+", default=[], metavar="LOG",
+                       help="swift test logs whose Test Case durations weight --shards "
+                            "(default: balance by case count)")
+    parser.add_argument("--cases-file", default="Tests/busybox-cases.jsonl",
+                       help="Case file written in --format jsonl, relative to the package "
+                            "root (kept outside the test target so SwiftPM ignores it)")
+    add_profile_argument(parser)
 
     args = parser.parse_args()
+    if args.shards is not None:
+        if args.shards < 1:
+            parser.error("--shards must be at least 1")
+        if args.format == "jsonl":
+            parser.error("--shards cannot be combined with --format jsonl")
     path = Path(args.path)
+    profile = StageProfile.from_arg(args.profile)
 
-    if args.all:
+    if args.all or args.commands:
         if not path.is_dir():
             print(f"Error: {path} is not a directory", file=sys.stderr)
             sys.exit(1)
 
-        output_dir = Path(args.output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Process all .tests files
-        for test_file in sorted(path.glob("*.tests")):
-            command_name, tests = parse_busybox_test_file(test_file)
-
-            if not tests:
-                print(f"Skipping {test_file.name}: no tests found", file=sys.stderr)
-                continue
-
-            swift_code = generate_swift_test_file(command_name, tests)
-            output_file = output_dir / f"{command_name.capitalize()}Tests.swift"
-
-            output_file.write_text(swift_code)
-            print(f"Generated {output_file} ({len(tests)} tests)")
+        if args.commands:
+            candidates = [path / f"{cmd}.tests" for cmd in args.commands]
+        else:
+            candidates = sorted(path.glob("*.tests"))
+        skip = set(args.skip)
+        candidates = [f for f in candidates if f.name[:-len(".tests")] not in skip]
+        test_files = [f for f in candidates if f.is_file()]
+        missing = [f.name[:-len(".tests")] for f in candidates if not f.is_file()]
+
+        if args.format == "jsonl":
+            with profile.stage("import"):
+                import_case_table(test_files, Path(args.output_dir), Path(args.cases_file),
+                                  args.jobs, missing)
+        elif args.shards is not None:
+            with profile.stage("import"):
+                import_sharded(test_files, Path(args.output_dir), args.shards, args.timings,
+                               args.jobs, missing)
+        else:
+            import_batch(test_files, Path(args.output_dir), args.jobs, missing, args.force,
+                         profile)
 
     else:
         if not path.exists():
             print(f"Error: {path} does not exist", file=sys.stderr)
             sys.exit(1)
 
-        command_name, tests = parse_busybox_test_file(path)
+        with profile.stage("parse"):
+            command_name, tests, unparseable = parse_busybox_test_file(path)
+        report_unparseable(path, unparseable)
+        print(f"{path}: {len(tests)} tests recognized, {len(unparseable)} unparseable",
+              file=sys.stderr)
 
         if not tests:
             print(f"Warning: no tests found in {path}", file=sys.stderr)
 
-        swift_code = generate_swift_test_file(command_name, tests)
-        print(swift_code)
+        with profile.stage("generate"):
+            if args.format == "jsonl":
+                print(generate_cases_file([(command_name, tests)]), end="")
+            else:
+                print(generate_swift_test_file(command_name, tests))
+
+    profile.finish()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Re-run only the test cases that failed in a previous `swift test` log.
+
+Failed cases are grouped into one anchored `--filter` regex per suite,
+the suites are spread over at most --jobs processes (balanced by the
+failed cases' previous durations), and all output is merged into one log
+in the usual format (see testexec.py), so analyze-test-results.py works on
+it unchanged.
+
+Usage:
+    python3 scripts/rerun-failures.py                     # newest test-results-*.log
+    python3 scripts/rerun-failures.py test-results-20251114-201403.log --jobs 4
+    python3 scripts/rerun-failures.py --runner ./fake-swift-test.sh --build-command ''
+"""
+
+import argparse
+import glob
+import os
+import shlex
+import subprocess
+import sys
+
+from testexec import (DEFAULT_BUILD, DEFAULT_RUNNER, build_once, failed_cases, log_name,
+                      run_filters, suite_filter)
+from testlog import load_run
+from testshards import lpt_pack
+
+
+def newest_log() -> str:
+    logs = glob.glob("test-results-*.log")
+    if not logs:
+        print("Error: no test-results-*.log found; pass a log explicitly", file=sys.stderr)
+        sys.exit(2)
+    return max(logs, key=os.path.getmtime)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run the failed cases of a previous test log")
+    parser.add_argument("log", nargs="?", help="Previous log (default: newest test-results-*.log)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="Maximum parallel test processes (default: CPU count)")
+    parser.add_argument("--runner", default=DEFAULT_RUNNER,
+                        help=f"Test command; --filter REGEX is appended (default: {DEFAULT_RUNNER})")
+    parser.add_argument("--build-command", default=DEFAULT_BUILD,
+                        help="Run once before testing, after which --skip-build is passed to "
+                             f"the runner; '' to skip (default: {DEFAULT_BUILD})")
+    parser.add_argument("--output", help="Merged log (default: test-results-rerun-<timestamp>.log)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the filters and exit")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    log = args.log or newest_log()
+    try:
+        failed = failed_cases(load_run(log))
+    except FileNotFoundError:
+        print(f"Error: {log} not found", file=sys.stderr)
+        sys.exit(2)
+    if not failed:
+        print(f"No failed test cases in {log}")
+        return
+
+    # One process per group of suites, balanced by how long the failures took
+    costs = [(suite, sum(duration for _, duration in tests) or len(tests))
+             for suite, tests in sorted(failed.items())]
+    groups = [suites for _, suites in lpt_pack(costs, min(args.jobs, len(costs))) if suites]
+    filters = [(f"{i}/{len(groups)}",
+                "|".join(suite_filter(suite, [test for test, _ in failed[suite]])
+                         for suite in sorted(suites)))
+               for i, suites in enumerate(groups, 1)]
+
+    total = sum(len(tests) for tests in failed.values())
+    print(f"Re-running {total} failed cases from {len(failed)} suites in {log} "
+          f"({len(filters)} processes)", file=sys.stderr)
+    if args.dry_run:
+        for label, filter_ in filters:
+            print(f"{label}: {filter_}")
+        return
+
+    command = shlex.split(args.runner)
+    try:
+        if build_once(args.build_command):
+            command.append("--skip-build")
+    except subprocess.CalledProcessError as e:
+        print(f"Error: build failed with exit code {e.returncode}", file=sys.stderr)
+        sys.exit(e.returncode)
+
+    output = args.output or log_name("test-results-rerun")
+    with open(output, "w") as out:
+        results = run_filters(filters, command, out, args.jobs)
+
+    rerun = load_run(output)
+    still_failing = sum(len(tests) for tests in failed_cases(rerun).values())
+    print(f"\nMerged log: {output}")
+    print(f"Re-ran {len(rerun.cases)} of {total} cases: {still_failing} still failing")
+    sys.exit(1 if still_failing or any(r.returncode for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
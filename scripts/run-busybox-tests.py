@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Run BusyBox testsuite cases straight against a binary, in parallel.
+
+Skips the import/compile/XCTest loop: `.tests` files are parsed with the
+importer's parser and every case runs as a subprocess of this script (see
+busyboxrun.py), at most --jobs at a time. The result is a `swift test`
+style log (suites `<Command>Tests`, cases named as the imported tests)
+plus the usual summary, so the analyzers, --diff against an XCTest run,
+and the JSON/JUnit reports all work on it.
+
+Any stand-in works as --binary: a real busybox, or a wrapper that runs
+the system coreutils (`#!/bin/sh` + `exec "$@"`).
+
+Usage:
+    python3 scripts/run-busybox-tests.py ../busybox/testsuite/
+    python3 scripts/run-busybox-tests.py --commands sort uniq --jobs 8 -- ../busybox/testsuite/
+    python3 scripts/run-busybox-tests.py --binary /bin/busybox --applet-links --junit bb.xml \\
+        ../busybox/testsuite/sort.tests
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from busyboxrun import DEFAULT_TIMEOUT, ConformanceRunner, load_suites
+from stageprofile import StageProfile, add_profile_argument
+from testexec import log_name
+from testreports import generate_summary, summarize_run, write_reports
+
+DEFAULT_BINARY = ".build/debug/swiftybox"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run BusyBox .tests cases against a binary")
+    parser.add_argument("path", help="Path to a .tests file or testsuite directory")
+    parser.add_argument("--commands", nargs="+", metavar="CMD",
+                        help="Run only these commands' .tests files from the directory")
+    parser.add_argument("--skip", nargs="+", default=[], metavar="CMD",
+                        help="Commands to leave out when running a directory")
+    parser.add_argument("--binary", default=DEFAULT_BINARY,
+                        help=f"Binary substituted for `busybox` (default: {DEFAULT_BINARY})")
+    parser.add_argument("--applet-links", action="store_true",
+                        help="Also put <command> -> binary symlinks first on PATH, so cases "
+                             "that call an applet by name run the binary too")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="Cases run at once (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds before a case is killed and failed (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--literal", action="store_true",
+                        help="Compare expected output, input and stdin as written instead of "
+                             "through echo -ne escapes (matches the generated XCTest cases)")
+    parser.add_argument("--features", nargs="*", metavar="FEATURE",
+                        help="Enabled `optional` features; cases needing any other feature "
+                             "are skipped (default: run them all)")
+    parser.add_argument("--output", help="Log file (default: busybox-results-<timestamp>.log)")
+    parser.add_argument("--json", metavar="PATH", help="Also write a JSON report")
+    parser.add_argument("--junit", metavar="PATH", help="Also write a JUnit XML report")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    profile = StageProfile.from_arg(args.profile)
+    if not os.access(args.binary, os.X_OK):
+        print(f"Error: {args.binary} is not an executable; build with `swift build` "
+              f"or pass --binary", file=sys.stderr)
+        sys.exit(2)
+    binary = os.path.abspath(args.binary)
+
+    path = Path(args.path)
+    if path.is_dir():
+        candidates = ([path / f"{cmd}.tests" for cmd in args.commands] if args.commands
+                      else sorted(path.glob("*.tests")))
+        test_files = [f for f in candidates
+                      if f.is_file() and f.name[:-len(".tests")] not in args.skip]
+    elif path.is_file():
+        test_files = [path]
+    else:
+        print(f"Error: {path} does not exist", file=sys.stderr)
+        sys.exit(1)
+
+    with profile.stage("parse"):
+        suites, unparseable = load_suites(test_files)
+    for source, line, reason in unparseable:
+        print(f"{source}:{line}: skipped testing call: {reason}", file=sys.stderr)
+    cases = sum(len(suite.tests) for suite in suites)
+    if not cases:
+        print(f"Error: no runnable tests in {path}", file=sys.stderr)
+        sys.exit(1)
+
+    output = args.output or log_name("busybox-results")
+    with tempfile.TemporaryDirectory(prefix="swiftybox-applets-") as links:
+        env = None
+        if args.applet_links:
+            for command in {suite.command for suite in suites}:
+                os.symlink(binary, os.path.join(links, command))
+            env = dict(os.environ, PATH=f"{links}{os.pathsep}{os.environ.get('PATH', '')}")
+        runner = ConformanceRunner(binary, args.jobs, args.timeout, args.literal,
+                                   set(args.features) if args.features is not None else None,
+                                   env)
+        print(f"Running {cases} tests from {len(suites)} suites, {args.jobs} at a time",
+              file=sys.stderr)
+        with profile.stage("run"), open(output, "w") as out:
+            run = asyncio.run(runner.run_suites(suites, out))
+
+    with profile.stage("reports"):
+        summary = summarize_run(run)
+        print(generate_summary(summary.commands))
+        outputs = {fmt: dest for fmt, dest in (("json", args.json), ("junit", args.junit)) if dest}
+        write_reports(summary, outputs)
+    print(f"\nLog: {output}")
+    for dest in outputs.values():
+        print(f"Wrote {dest}")
+
+    profile.finish()
+    if not summary.commands['total']:
+        print(f"Error: no case ran ({summary.commands['skipped']} skipped)", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(1 if summary.commands['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Run the test suites as K parallel `swift test --skip-build --filter` shards.
+
+Suites come from `swift test list`, are weighted by their tests' median
+durations in earlier logs (falling back to test counts) and packed into K
+shards longest-first (see testshards.py). Shard outputs are merged into one
+timestamped log with suite blocks kept contiguous (see testexec.py), and
+per-shard wall times are written next to it for tuning the next run.
+
+Usage:
+    python3 scripts/run-shards.py                       # CPU-count shards
+    python3 scripts/run-shards.py --shards 4 --timings test-results-*.log
+    python3 scripts/run-shards.py --runner ./fake-swift-test.sh --build-command ''
+"""
+
+import argparse
+import glob
+import json
+import os
+import shlex
+import subprocess
+import sys
+from collections import Counter
+from statistics import median
+from typing import Dict, List
+
+from testexec import DEFAULT_BUILD, DEFAULT_RUNNER, build_once, log_name, run_filters
+from testshards import load_case_durations, lpt_pack
+
+
+def list_tests(command: List[str], options: List[str]) -> Dict[str, int]:
+    """suite -> number of tests, from `<runner> list` (Module.Suite/test lines)"""
+    result = subprocess.run(command + ["list"] + options, capture_output=True,
+                            text=True, check=True)
+    counts: Counter = Counter()
+    for line in result.stdout.splitlines():
+        test_id, sep, _ = line.strip().partition("/")
+        if sep and "." in test_id:
+            counts[test_id.rsplit(".", 1)[1]] += 1
+    return dict(counts)
+
+
+def suite_costs(tests: Dict[str, int], timing_logs: List[str]) -> Dict[str, float]:
+    """Estimated seconds per suite; unseen suites cost their test count times
+    the median case duration (or just their test count without history)"""
+    durations = load_case_durations(timing_logs) if timing_logs else {}
+    by_suite: Dict[str, float] = {}
+    for (suite, _), seconds in durations.items():
+        by_suite[suite] = by_suite.get(suite, 0.0) + seconds
+    per_case = median(durations.values()) if durations else 1.0
+    return {suite: by_suite.get(suite, count * per_case) for suite, count in tests.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run test suites in parallel shards")
+    parser.add_argument("--shards", type=int, default=os.cpu_count(),
+                        help="Number of parallel test processes (default: CPU count)")
+    parser.add_argument("--timings", nargs="+", metavar="LOG",
+                        help="Logs whose Test Case durations balance the shards "
+                             "(default: newest test-results-*.log, if any)")
+    parser.add_argument("--runner", default=DEFAULT_RUNNER,
+                        help=f"Test command; `list` or --filter REGEX is appended "
+                             f"(default: {DEFAULT_RUNNER})")
+    parser.add_argument("--build-command", default=DEFAULT_BUILD,
+                        help="Run once before listing, after which --skip-build is passed "
+                             f"to the runner; '' to skip (default: {DEFAULT_BUILD})")
+    parser.add_argument("--output", help="Merged log (default: test-results-<timestamp>.log)")
+    args = parser.parse_args()
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+
+    timing_logs = args.timings
+    if timing_logs is None:
+        previous = glob.glob("test-results-*.log")
+        timing_logs = [max(previous, key=os.path.getmtime)] if previous else []
+
+    command = shlex.split(args.runner)
+    options = []
+    try:
+        if build_once(args.build_command):
+            options.append("--skip-build")
+        tests = list_tests(command, options)
+    except subprocess.CalledProcessError as e:
+        print(f"Error: `{' '.join(e.cmd)}` failed with exit code {e.returncode}", file=sys.stderr)
+        sys.exit(e.returncode)
+    if not tests:
+        print("Error: the runner listed no tests", file=sys.stderr)
+        sys.exit(2)
+
+    costs = suite_costs(tests, timing_logs)
+    packed = [(load, sorted(suites))
+              for load, suites in lpt_pack(sorted(costs.items()), min(args.shards, len(costs)))]
+    filters = [(f"shard {i}", rf"\.({'|'.join(suites)})/") for i, (_, suites) in enumerate(packed, 1)]
+    print(f"Running {sum(tests.values())} tests from {len(tests)} suites in {len(filters)} shards"
+          f" (timings from {len(timing_logs)} logs)", file=sys.stderr)
+
+    output = args.output or log_name()
+    with open(output, "w") as out:
+        results = run_filters(filters, command + options, out, len(filters))
+
+    report = [{"shard": i, "suites": suites, "tests": sum(tests[s] for s in suites),
+               "estimated_seconds": round(load, 3), "wall_seconds": round(result.wall_time, 3),
+               "exit_code": result.returncode}
+              for i, ((load, suites), result) in enumerate(zip(packed, results), 1)]
+    report_path = os.path.splitext(output)[0] + ".shards.json"
+    with open(report_path, "w") as f:
+        json.dump({"log": output, "timing_logs": timing_logs, "shards": report}, f, indent=2)
+        f.write("\n")
+
+    print(f"\n{'Shard':>5} {'Suites':>6} {'Tests':>6} {'Estimated':>10} {'Wall':>8} {'Exit':>4}")
+    for row in report:
+        print(f"{row['shard']:5} {len(row['suites']):6} {row['tests']:6} "
+              f"{row['estimated_seconds']:9.2f}s {row['wall_seconds']:7.2f}s {row['exit_code']:4}")
+    print(f"\nMerged log:   {output}")
+    print(f"Shard report: {report_path}")
+    sys.exit(1 if any(r.returncode for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
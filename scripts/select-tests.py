@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Print a `swift test --filter` expression covering the tests affected by a
+git diff range (see testselect.py for the path-to-suite mapping).
+
+Usage:
+    python3 scripts/select-tests.py                  # uncommitted changes
+    python3 scripts/select-tests.py origin/main...HEAD
+    swift test --filter "$(python3 scripts/select-tests.py main...HEAD)"
+"""
+
+import argparse
+import subprocess
+import sys
+
+from testselect import changed_files, filter_expression, select_tests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Select tests affected by a git diff")
+    parser.add_argument("revisions", nargs="*", default=["HEAD"],
+                        help="Arguments for `git diff` (default: HEAD, i.e. uncommitted changes)")
+    parser.add_argument("--explain", action="store_true",
+                        help="Show why each changed file selects what it does (on stderr)")
+    parser.add_argument("--command", action="store_true",
+                        help="Print a complete swift test command line instead of the filter")
+    args = parser.parse_args()
+
+    try:
+        paths = changed_files(args.revisions)
+    except subprocess.CalledProcessError as e:
+        print(f"Error: git diff failed: {e.stderr.strip()}", file=sys.stderr)
+        sys.exit(2)
+
+    selection = select_tests(paths)
+    if args.explain:
+        for reason in selection.reasons:
+            print(reason, file=sys.stderr)
+
+    if selection.empty:
+        print(f"No tests affected by {len(paths)} changed files", file=sys.stderr)
+        return
+
+    expression = filter_expression(selection)
+    if selection.commands and not selection.run_all:
+        suites = ",".join(sorted(selection.commands))
+        print(f"BusyBox case table: BUSYBOX_SUITES={suites} "
+              f"swift test --filter BusyBoxCaseTableTests", file=sys.stderr)
+    print(f"swift test --filter '{expression}'" if args.command else expression)
+
+
+if __name__ == "__main__":
+    main()
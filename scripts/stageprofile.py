@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-stage timing and cProfile dumps for the test tooling scripts.
+
+Every tool takes the same flag (see add_profile_argument): `--profile`
+prints the wall time of each named stage to stderr when the tool ends,
+and `--profile PATH` also records the whole run with cProfile and writes
+the stats to PATH (read them with `python3 -m pstats PATH`). Worker
+processes are not covered by the cProfile dump.
+
+Usage:
+    profile = StageProfile.from_arg(args.profile)
+    with profile.stage("parse"):
+        run = load_run(filename)
+    profile.finish()
+
+The stderr lines have a fixed `profile: <stage> <seconds>s` shape, which
+benchmark-tools.py reads back.
+"""
+
+import argparse
+import cProfile
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+
+def add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--profile", nargs="?", const="", metavar="PATH",
+                        help="Print per-stage wall time to stderr; with PATH, also write "
+                             "a cProfile dump there")
+
+
+class StageProfile:
+    """Named wall-time stages of one tool run; a no-op unless enabled"""
+
+    def __init__(self, enabled: bool = False, dump_path: Optional[str] = None):
+        self.enabled = enabled or bool(dump_path)
+        self.dump_path = dump_path
+        self.stages: List[Tuple[str, float]] = []
+        self._start = time.perf_counter()
+        self._profiler = cProfile.Profile() if dump_path else None
+        if self._profiler:
+            self._profiler.enable()
+
+    @classmethod
+    def from_arg(cls, value: Optional[str]) -> 'StageProfile':
+        """From a --profile value: None (off), '' (stages only) or a dump path"""
+        return cls(value is not None, value or None)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+
+    def finish(self, out: TextIO = sys.stderr) -> None:
+        """Stop profiling and print the stage table"""
+        if not self.enabled:
+            return
+        if self._profiler:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.dump_path)
+        total = time.perf_counter() - self._start
+        for name, seconds in self.stages:
+            share = 100 * seconds / total if total > 0 else 0.0
+            print(f"profile: {name:16} {seconds:9.4f}s {share:5.1f}%", file=out)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mb = peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+        print(f"profile: {'total':16} {total:9.4f}s  peak RSS {peak_mb:.1f} MB", file=out)
+        if self.dump_path:
+            print(f"profile: cProfile stats written to {self.dump_path}", file=out)
+
+
+# Shared default for functions that take an optional profile
+NO_PROFILE = StageProfile()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Keep a queryable SQLite history of SwiftyBox test runs.
+
+Usage:
+    python3 scripts/test-history.py ingest test-results-*.log
+    python3 scripts/test-history.py runs
+    python3 scripts/test-history.py pass-rate SortTests
+    python3 scripts/test-history.py first-failure testBasename_worksWithCurrentDirectory
+    python3 scripts/test-history.py first-failure SortTests.testTestName_1
+"""
+
+import argparse
+import sys
+import time
+
+from testdb import (DEFAULT_DB, connect, first_failure, ingest_log, list_runs,
+                    pass_rate_history, suites_with_test, test_history)
+
+
+def cmd_ingest(db, args):
+    for path in args.logs:
+        try:
+            run_id, added = ingest_log(db, path)
+        except FileNotFoundError:
+            print(f"Error: {path} not found", file=sys.stderr)
+            return 1
+        if added:
+            print(f"Ingested {path} as run {run_id}")
+        else:
+            print(f"Skipped {path}: already ingested as run {run_id}")
+    return 0
+
+
+def cmd_runs(db, args):
+    print(f"{'Run':>4}  {'Started':23}  {'Passed':>7}  {'Failed':>7}  {'Total':>6}  Source")
+    for run_id, started_at, total, passed, failed, duration, source in list_runs(db):
+        print(f"{run_id:4}  {started_at:23}  {passed:7}  {failed:7}  {total:6}  {source}")
+    return 0
+
+
+def cmd_pass_rate(db, args):
+    rows = pass_rate_history(db, args.name)
+    if not rows:
+        print(f"No results for {args.name}")
+        return 1
+    print(f"Pass-rate history for {args.name}:")
+    for started_at, passed, total in rows:
+        print(f"  {started_at:23}  {passed:4}/{total:<4} ({100 * passed / total:5.1f}%)")
+    return 0
+
+
+def cmd_first_failure(db, args):
+    suite, _, test = args.test.rpartition('.')
+    suite = args.suite or suite
+    if not suite:
+        suites = suites_with_test(db, test)
+        if len(suites) > 1:
+            print(f"Error: {test} is in {len(suites)} suites; pass Suite.{test} or --suite:",
+                  file=sys.stderr)
+            for name in suites:
+                print(f"  {name}", file=sys.stderr)
+            return 2
+        suite = suites[0] if suites else ""
+    history = test_history(db, suite, test) if suite else []
+    if not history:
+        print(f"No results for {f'{suite}.' if suite else ''}{test}")
+        return 1
+    streak = first_failure(history)
+    if streak is None:
+        print(f"{suite}.{test} passed in its latest run ({history[-1][0]})")
+        return 0
+    first, last_pass = streak
+    print(f"{suite}.{test} has been failing since {first[0]}")
+    print(f"  first failing log: {first[4]}")
+    if last_pass:
+        print(f"  last passed:       {last_pass[0]} ({last_pass[4]})")
+    else:
+        print("  it has never passed in the recorded history")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SwiftyBox test run history")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"History database (default: {DEFAULT_DB})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="Add test logs to the history (duplicates are skipped)")
+    ingest.add_argument("logs", nargs="+")
+    ingest.set_defaults(func=cmd_ingest)
+
+    runs = sub.add_parser("runs", help="List ingested runs")
+    runs.set_defaults(func=cmd_runs)
+
+    pass_rate = sub.add_parser("pass-rate", help="Pass-rate history for a suite or command")
+    pass_rate.add_argument("name", help="Suite (SortTests) or command (Sort)")
+    pass_rate.set_defaults(func=cmd_pass_rate)
+
+    first = sub.add_parser("first-failure", help="When did a test start failing")
+    first.add_argument("test", help="Suite.test or a test method name, e.g. "
+                                    "testBasename_worksWithCurrentDirectory")
+    first.add_argument("--suite", help="Suite of the test; needed when the name is in several")
+    first.set_defaults(func=cmd_first_failure)
+
+    args = parser.parse_args()
+    db = connect(args.db)
+    start = time.perf_counter()
+    status = args.func(db, args)
+    if args.command != "ingest":
+        print(f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Aggregate many `swift test` logs in parallel.
+
+Each worker parses one log and returns a small LogSummary (totals plus
+per-command pass counts), so only a few hundred bytes per log cross the
+process boundary and the merge is a cheap reduction.
+"""
+
+import glob
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from testlog import CaseFinished, RunStarted, command_name, read_events
+
+
+@dataclass
+class LogSummary:
+    path: str
+    started_at: Optional[str] = None
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    duration: float = 0.0
+    # command -> [passed, total]
+    by_command: Dict[str, List[int]] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return self.passed + self.failed
+
+
+def summarize_log(path: str) -> LogSummary:
+    """Stream one log into a compact summary (runs inside a worker)"""
+    summary = LogSummary(path)
+    by_command = defaultdict(lambda: [0, 0])
+    for event in read_events(path):
+        if isinstance(event, CaseFinished):
+            summary.duration += event.duration
+            if event.status == 'skipped':
+                summary.skipped += 1
+                continue
+            counts = by_command[command_name(event.suite)]
+            counts[1] += 1
+            if event.status == 'passed':
+                summary.passed += 1
+                counts[0] += 1
+            else:
+                summary.failed += 1
+        elif isinstance(event, RunStarted) and summary.started_at is None:
+            summary.started_at = event.timestamp
+    summary.by_command = dict(by_command)
+    return summary
+
+
+def expand_logs(target: str, pattern: str = "*.log") -> List[str]:
+    """Resolve a directory (using `pattern`) or a glob to a sorted list of logs"""
+    if os.path.isdir(target):
+        target = os.path.join(target, pattern)
+    return sorted(glob.glob(target))
+
+
+def is_multi_log(target: str) -> bool:
+    """True when the analyzer argument names a directory or a glob"""
+    return os.path.isdir(target) or any(c in target for c in "*?[")
+
+
+def summarize_logs(paths: Iterable[str], jobs: Optional[int] = None) -> List[LogSummary]:
+    """Summarize logs across a process pool, one log per task"""
+    paths = list(paths)
+    if jobs == 1 or len(paths) <= 1:
+        return [summarize_log(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(summarize_log, paths, chunksize=1))
+
+
+def merge_by_command(summaries: Iterable[LogSummary]) -> Dict[str, Tuple[int, int, int]]:
+    """Reduce summaries to command -> (passed, total, runs seen in)"""
+    merged = defaultdict(lambda: [0, 0, 0])
+    for summary in summaries:
+        for command, (passed, total) in summary.by_command.items():
+            counts = merged[command]
+            counts[0] += passed
+            counts[1] += total
+            counts[2] += 1
+    return {command: tuple(counts) for command, counts in merged.items()}
+
+
+def format_aggregate(summaries: List[LogSummary]) -> str:
+    """Render per-run totals and per-command pass rates across runs"""
+    summaries = sorted(summaries, key=lambda s: (s.started_at or "", s.path))
+    lines = []
+    lines.append("=" * 80)
+    lines.append(f"AGGREGATE OF {len(summaries)} TEST RUNS")
+    lines.append("=" * 80)
+    lines.append(f"{'Started':23} {'Passed':>7} {'Failed':>7} {'Total':>6} {'Rate':>6}  Log")
+    for s in summaries:
+        rate = 100 * s.passed / s.total if s.total else 0.0
+        lines.append(f"{s.started_at or '-':23} {s.passed:7} {s.failed:7} {s.total:6} "
+                     f"{rate:5.1f}%  {os.path.basename(s.path)}")
+    lines.append("")
+
+    lines.append("PASS RATE BY COMMAND ACROSS RUNS:")
+    lines.append(f"  {'Command':25} {'Passed':>8} {'Total':>8} {'Rate':>6} {'Runs':>5}")
+    merged = merge_by_command(summaries)
+    for command, (passed, total, runs) in sorted(merged.items(),
+                                                 key=lambda item: (item[1][0] / item[1][1], item[0])):
+        lines.append(f"  {command:25} {passed:8} {total:8} {100 * passed / total:5.1f}% {runs:5}")
+    lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Compact columnar storage for test cases from many runs.
+
+Suite and test names are interned into lookup tables, and every case is a
+row spread over `array` columns (run id, suite id, test id, status,
+duration), about 17 bytes per case instead of a few hundred for a
+dataclass or dict. Repeated runs of the same cases therefore cost only
+their rows; each distinct test name still costs one Python string.
+Duration samples are grouped with a counting sort over the id columns,
+so grouping adds flat arrays rather than a dict of growing arrays.
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from testlog import CaseFinished, command_name, read_events
+
+PASSED, FAILED, SKIPPED = 0, 1, 2
+STATUS_CODES = {'passed': PASSED, 'failed': FAILED, 'skipped': SKIPPED}
+
+
+class NameTable:
+    """Interns strings to dense integer ids"""
+    __slots__ = ('names', 'ids')
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def intern(self, name: str) -> int:
+        id_ = self.ids.get(name)
+        if id_ is None:
+            id_ = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return id_
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class CaseTable:
+    """Column store of test cases across one or more runs"""
+
+    def __init__(self):
+        self.runs: List[str] = []
+        self.suites = NameTable()
+        self.tests = NameTable()
+        self.run_id = array('I')
+        self.suite_id = array('I')
+        self.test_id = array('I')
+        self.status = array('B')
+        self.duration = array('f')
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def add_run(self, name: str) -> int:
+        self.runs.append(name)
+        return len(self.runs) - 1
+
+    def append(self, run_id: int, suite: str, test_name: str, status: str, duration: float) -> None:
+        self.run_id.append(run_id)
+        self.suite_id.append(self.suites.intern(suite))
+        self.test_id.append(self.tests.intern(test_name))
+        self.status.append(STATUS_CODES[status])
+        self.duration.append(duration)
+
+    def add_log(self, filename: str) -> int:
+        """Stream a log's cases into the table as a new run"""
+        run_id = self.add_run(filename)
+        append = self.append
+        for event in read_events(filename):
+            if isinstance(event, CaseFinished):
+                append(run_id, event.suite, event.test_name, event.status, event.duration)
+        return run_id
+
+    @classmethod
+    def from_logs(cls, filenames: Iterable[str]) -> 'CaseTable':
+        table = cls()
+        for filename in filenames:
+            table.add_log(filename)
+        return table
+
+    # -- grouped samples ---------------------------------------------------
+
+    def _rows_by(self, ids: array, count: int) -> Tuple[array, array]:
+        """Counting sort of row numbers by an id column.
+
+        Returns (order, starts): the rows of id i are order[starts[i]:starts[i + 1]],
+        in table order. Both are flat arrays, so grouping costs 4 bytes per row
+        and per id rather than a container per group.
+        """
+        starts = array('I', bytes(4 * (count + 1)))
+        for id_ in ids:
+            starts[id_ + 1] += 1
+        for i in range(count):
+            starts[i + 1] += starts[i]
+        free = array('I', starts)
+        order = array('I', bytes(4 * len(ids)))
+        for row, id_ in enumerate(ids):
+            order[free[id_]] = row
+            free[id_] += 1
+        return order, starts
+
+    def iter_case_durations(self) -> Iterator[Tuple[Tuple[str, str], array]]:
+        """((suite, test), duration samples) per case, skipped cases excluded.
+
+        Cases are produced one at a time, so a caller that reduces the
+        samples (e.g. to a median) never holds them all at once.
+        """
+        order, starts = self._rows_by(self.test_id, len(self.tests))
+        suite_id, status, duration = self.suite_id, self.status, self.duration
+        suites, tests = self.suites.names, self.tests.names
+        for t_id, test_name in enumerate(tests):
+            # Usually one suite; generated names like testTestName_1 recur
+            groups: Dict[int, array] = {}
+            for row in order[starts[t_id]:starts[t_id + 1]]:
+                if status[row] != SKIPPED:
+                    samples = groups.get(suite_id[row])
+                    if samples is None:
+                        samples = groups[suite_id[row]] = array('f')
+                    samples.append(duration[row])
+            for s_id, samples in groups.items():
+                yield (suites[s_id], test_name), samples
+
+    def durations_by_case(self) -> Dict[Tuple[str, str], array]:
+        """(suite, test) -> duration samples, skipped cases excluded"""
+        return dict(self.iter_case_durations())
+
+    def durations_by_command(self) -> Dict[str, array]:
+        """command -> duration samples, skipped cases excluded"""
+        command_of = [command_name(name) for name in self.suites.names]
+        groups: Dict[str, array] = {}
+        for s_id, status, duration in zip(self.suite_id, self.status, self.duration):
+            if status != SKIPPED:
+                command = command_of[s_id]
+                samples = groups.get(command)
+                if samples is None:
+                    samples = groups[command] = array('f')
+                samples.append(duration)
+        return groups
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+SQLite store of parsed `swift test` runs.
+
+Each ingested log becomes one row in `runs` with its suites, cases and
+failures alongside. Logs are identified by the SHA-256 of their bytes, so
+ingesting the same log twice is a no-op.
+
+Usage:
+    from testdb import connect, ingest_log
+    db = connect("test-history.db")
+    ingest_log(db, "test-results.txt")
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from typing import List, Optional, Tuple
+
+from testlog import TestRun, command_name, load_run
+
+DEFAULT_DB = "test-history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id           INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    source       TEXT NOT NULL,
+    started_at   TEXT NOT NULL,
+    ingested_at  TEXT NOT NULL,
+    total        INTEGER NOT NULL,
+    passed       INTEGER NOT NULL,
+    failed       INTEGER NOT NULL,
+    duration     REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS suites (
+    run_id   INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name     TEXT NOT NULL,
+    total    INTEGER NOT NULL,
+    passed   INTEGER NOT NULL,
+    failed   INTEGER NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cases (
+    run_id    INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    command   TEXT NOT NULL,
+    suite     TEXT NOT NULL,
+    test_name TEXT NOT NULL,
+    status    TEXT NOT NULL,
+    duration  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failures (
+    run_id    INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    suite     TEXT NOT NULL,
+    test_name TEXT NOT NULL,
+    reason    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs(started_at);
+CREATE INDEX IF NOT EXISTS suites_name ON suites(name, run_id);
+CREATE INDEX IF NOT EXISTS cases_command_test ON cases(command, test_name);
+CREATE INDEX IF NOT EXISTS cases_suite_test ON cases(suite, test_name);
+CREATE INDEX IF NOT EXISTS cases_test ON cases(test_name);
+CREATE INDEX IF NOT EXISTS failures_run ON failures(run_id);
+"""
+
+
+def connect(path: str = DEFAULT_DB) -> sqlite3.Connection:
+    """Open (and if needed create) the history database"""
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA foreign_keys = ON")
+    db.executescript(SCHEMA)
+    return db
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def insert_run(db: sqlite3.Connection, run: TestRun, content_hash: str,
+               source: str, started_at: str) -> int:
+    """Store a parsed run in one transaction and return its id"""
+    counted = [c for c in run.cases if c.status != 'skipped']
+    passed = sum(1 for c in counted if c.passed)
+    with db:
+        cursor = db.execute(
+            "INSERT INTO runs (content_hash, source, started_at, ingested_at, "
+            "total, passed, failed, duration) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (content_hash, source, started_at, time.strftime('%Y-%m-%d %H:%M:%S'),
+             len(counted), passed, len(counted) - passed,
+             sum(s.duration for s in run.suites)))
+        run_id = cursor.lastrowid
+        db.executemany(
+            "INSERT INTO suites VALUES (?, ?, ?, ?, ?, ?)",
+            ((run_id, s.name, s.total, s.passed, s.failed, s.duration) for s in run.suites))
+        db.executemany(
+            "INSERT INTO cases VALUES (?, ?, ?, ?, ?, ?)",
+            ((run_id, command_name(c.suite), c.suite, c.test_name, c.status, c.duration)
+             for c in run.cases))
+        db.executemany(
+            "INSERT INTO failures VALUES (?, ?, ?, ?)",
+            ((run_id, f.suite, f.test_name, f.reason) for f in run.failures))
+    return run_id
+
+
+def ingest_log(db: sqlite3.Connection, path: str) -> Tuple[Optional[int], bool]:
+    """Ingest a log file, returning (run id, whether it was newly added).
+
+    The content hash is checked before parsing, so re-ingesting a known log
+    costs one read of the file and nothing else.
+    """
+    content_hash = file_hash(path)
+    row = db.execute("SELECT id FROM runs WHERE content_hash = ?", (content_hash,)).fetchone()
+    if row:
+        return row[0], False
+
+    run = load_run(path)
+    # Logs without an 'All tests' line (e.g. filtered or truncated) fall back to mtime
+    started_at = run.started_at or time.strftime(
+        '%Y-%m-%d %H:%M:%S', time.localtime(os.path.getmtime(path)))
+    return insert_run(db, run, content_hash, os.path.abspath(path), started_at), True
+
+
+def list_runs(db: sqlite3.Connection) -> List[Tuple]:
+    """(id, started_at, total, passed, failed, duration, source) for every run"""
+    return db.execute(
+        "SELECT id, started_at, total, passed, failed, duration, source "
+        "FROM runs ORDER BY started_at").fetchall()
+
+
+def pass_rate_history(db: sqlite3.Connection, name: str) -> List[Tuple]:
+    """(started_at, passed, total) per run for a suite ('SortTests') or command ('Sort')"""
+    column = 'suite' if name.endswith('Tests') else 'command'
+    return db.execute(
+        f"SELECT r.started_at, SUM(c.status = 'passed'), COUNT(*) "
+        f"FROM cases c JOIN runs r ON r.id = c.run_id "
+        f"WHERE c.{column} = ? AND c.status != 'skipped' "
+        f"GROUP BY c.run_id ORDER BY r.started_at", (name,)).fetchall()
+
+
+def suites_with_test(db: sqlite3.Connection, test_name: str) -> List[str]:
+    """Every suite that has recorded a case with this method name"""
+    return [row[0] for row in db.execute(
+        "SELECT DISTINCT suite FROM cases WHERE test_name = ? ORDER BY suite", (test_name,))]
+
+
+def test_history(db: sqlite3.Connection, suite: str, test_name: str) -> List[Tuple]:
+    """(started_at, suite, status, duration, source) for one test across runs.
+
+    A method name alone is not unique (generated names such as
+    testTestName_1 recur across suites), so history is keyed on both.
+    """
+    return db.execute(
+        "SELECT r.started_at, c.suite, c.status, c.duration, r.source "
+        "FROM cases c JOIN runs r ON r.id = c.run_id "
+        "WHERE c.suite = ? AND c.test_name = ? ORDER BY r.started_at",
+        (suite, test_name)).fetchall()
+
+
+def first_failure(history: List[Tuple]) -> Optional[Tuple[Tuple, Optional[Tuple]]]:
+    """Find where the current failing streak of a test began.
+
+    Returns (first failing row, last passing row before it), or None if the
+    test passed in its most recent run.
+    """
+    if not history or history[-1][2] != 'failed':
+        return None
+    start = len(history) - 1
+    while start > 0 and history[start - 1][2] == 'failed':
+        start -= 1
+    return history[start], history[start - 1] if start > 0 else None
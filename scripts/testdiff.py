@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Run-to-run comparison of `swift test` logs.
+
+Each log is reduced in one streaming pass to a hash index of
+(suite, test) -> status, and the two indexes are compared in linear time.
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from testlog import CaseFinished, command_name, read_events
+
+CaseKey = Tuple[str, str]
+
+
+def case_index(filename: str) -> Dict[CaseKey, str]:
+    """Map (suite, test) to its final status, streaming the log once"""
+    index = {}
+    for event in read_events(filename):
+        if isinstance(event, CaseFinished):
+            index[(event.suite, event.test_name)] = event.status
+    return index
+
+
+@dataclass
+class RunDiff:
+    regressions: List[CaseKey] = field(default_factory=list)
+    fixes: List[CaseKey] = field(default_factory=list)
+    added: List[CaseKey] = field(default_factory=list)
+    removed: List[CaseKey] = field(default_factory=list)
+    # command -> (base passed, base total, candidate passed, candidate total)
+    pass_rates: Dict[str, Tuple[int, int, int, int]] = field(default_factory=dict)
+
+
+def diff_indexes(base: Dict[CaseKey, str], candidate: Dict[CaseKey, str]) -> RunDiff:
+    """Classify every case present in either run"""
+    diff = RunDiff()
+    counts = defaultdict(Counter)
+
+    for key, status in base.items():
+        command = command_name(key[0])
+        if status != 'skipped':
+            counts[command]['base_total'] += 1
+            counts[command]['base_passed'] += status == 'passed'
+        new_status = candidate.get(key)
+        if new_status is None:
+            diff.removed.append(key)
+        elif status == 'passed' and new_status == 'failed':
+            diff.regressions.append(key)
+        elif status == 'failed' and new_status == 'passed':
+            diff.fixes.append(key)
+
+    for key, status in candidate.items():
+        command = command_name(key[0])
+        if status != 'skipped':
+            counts[command]['cand_total'] += 1
+            counts[command]['cand_passed'] += status == 'passed'
+        if key not in base:
+            diff.added.append(key)
+
+    for command, c in counts.items():
+        diff.pass_rates[command] = (c['base_passed'], c['base_total'],
+                                    c['cand_passed'], c['cand_total'])
+    for cases in (diff.regressions, diff.fixes, diff.added, diff.removed):
+        cases.sort()
+    return diff
+
+
+def _rate(passed: int, total: int) -> float:
+    return 100 * passed / total if total else 0.0
+
+
+def format_diff(diff: RunDiff, base_name: str, candidate_name: str) -> str:
+    """Render a RunDiff as a console report"""
+    lines = []
+    lines.append("=" * 80)
+    lines.append("TEST RUN DIFF")
+    lines.append("=" * 80)
+    lines.append(f"Base:      {base_name}")
+    lines.append(f"Candidate: {candidate_name}")
+    lines.append(f"Regressions: {len(diff.regressions)}   Fixes: {len(diff.fixes)}   "
+                 f"New: {len(diff.added)}   Removed: {len(diff.removed)}")
+    lines.append("")
+
+    for title, cases in (("❌ NEWLY FAILING", diff.regressions), ("✅ NEWLY FIXED", diff.fixes)):
+        if cases:
+            lines.append(f"{title} ({len(cases)}):")
+            for suite, test in cases:
+                lines.append(f"  - {suite}.{test}")
+            lines.append("")
+
+    # Added/removed lists get long when generated suites come and go; summarize by command
+    for title, cases in (("➕ NEW TESTS", diff.added), ("➖ REMOVED TESTS", diff.removed)):
+        if cases:
+            by_command = Counter(command_name(suite) for suite, _ in cases)
+            lines.append(f"{title} ({len(cases)}):")
+            for command, count in sorted(by_command.items()):
+                lines.append(f"  {command:25} {count:5}")
+            lines.append("")
+
+    changed = [(cmd, r) for cmd, r in diff.pass_rates.items()
+               if _rate(r[0], r[1]) != _rate(r[2], r[3]) or r[1] != r[3]]
+    if changed:
+        lines.append("PASS-RATE CHANGES BY COMMAND:")
+        changed.sort(key=lambda item: _rate(item[1][2], item[1][3]) - _rate(item[1][0], item[1][1]))
+        for command, (bp, bt, cp, ct) in changed:
+            delta = _rate(cp, ct) - _rate(bp, bt)
+            lines.append(f"  {command:25} {bp:4}/{bt:<4} -> {cp:4}/{ct:<4} ({delta:+6.1f} pts)")
+        lines.append("")
+
+    return "\n".join(lines)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Run several filtered `swift test` processes and merge their output.
+
+Each process's output is split into suite blocks (from "Test Suite 'X'
+started" through its "Executed N tests" line). Complete blocks are written
+to the shared log under a lock as soon as they finish, so suites from
+different processes never interleave, and the meta suites ('All tests',
+'Selected tests', 'debug.xctest') of every process are replaced by one
+run header and footer. The merged log therefore reads like a single
+`swift test` run and works with every analyzer unchanged.
+"""
+
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
+
+from testlog import EXECUTED_RE, SUITE_RE, EventParser, SuiteFinished, TestRun
+
+DEFAULT_RUNNER = "swift test"
+DEFAULT_BUILD = "swift build --build-tests"
+
+META_SUITE_RE = re.compile(r"Test Suite '[^']*' (started|passed|failed) at")
+
+
+def timestamp() -> str:
+    """Current time in XCTest's log format (2025-11-14 20:14:03.803)"""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+def log_name(prefix: str = "test-results") -> str:
+    """Timestamped log name matching run-tests.sh"""
+    return f"{prefix}-{datetime.now():%Y%m%d-%H%M%S}.log"
+
+
+def plural(count: int, word: str) -> str:
+    return f"{count} {word}{'' if count == 1 else 's'}"
+
+
+class LogMerger:
+    """Thread-safe writer that merges several `swift test` streams into one log"""
+
+    def __init__(self, out: TextIO):
+        self.out = out
+        self.lock = threading.Lock()
+        self.parser = EventParser()
+        self.total = self.failed = self.skipped = 0
+        self.duration = 0.0
+        self.started = time.monotonic()
+
+    def start(self) -> None:
+        with self.lock:
+            self.out.write(f"Test Suite 'All tests' started at {timestamp()}\n")
+            self.out.flush()
+
+    def write(self, lines: Sequence[str]) -> None:
+        """Append lines as one contiguous chunk, tallying finished suites"""
+        with self.lock:
+            for line in lines:
+                event = self.parser.feed(line)
+                if isinstance(event, SuiteFinished):
+                    self.total += event.total
+                    self.failed += event.failed
+                    self.skipped += event.skipped
+                    self.duration += event.duration
+            self.out.writelines(lines)
+            self.out.flush()
+
+    def finish(self) -> None:
+        status = "failed" if self.failed else "passed"
+        skipped = f"{plural(self.skipped, 'test')} skipped and " if self.skipped else ""
+        wall = time.monotonic() - self.started
+        with self.lock:
+            self.out.write(f"Test Suite 'All tests' {status} at {timestamp()}\n")
+            self.out.write(f"\t Executed {plural(self.total, 'test')}, with {skipped}"
+                           f"{plural(self.failed, 'failure')} (0 unexpected) in "
+                           f"{self.duration:.3f} ({wall:.3f}) seconds\n")
+            self.out.flush()
+
+
+class SuiteBlockStream:
+    """Splits one process's output into suite blocks for a LogMerger"""
+
+    def __init__(self, merger: LogMerger):
+        self.merger = merger
+        self.block: List[str] = []
+        self.closing = False
+        self.skip_executed = False
+        self.suites: List[str] = []
+
+    def feed(self, line: str) -> None:
+        if self.skip_executed:
+            self.skip_executed = False
+            if EXECUTED_RE.match(line):
+                return
+        if line.startswith("Test Suite '"):
+            match = SUITE_RE.match(line)
+            if match:
+                if match.group(2) == 'started':
+                    self.flush()
+                    self.suites.append(match.group(1))
+                    self.block.append(line)
+                else:
+                    self.block.append(line)
+                    self.closing = True
+                return
+            meta = META_SUITE_RE.match(line)
+            if meta:
+                # Replaced by the merged run's own header and footer
+                self.skip_executed = meta.group(1) != 'started'
+                return
+        if self.closing:
+            self.closing = False
+            self.block.append(line)
+            self.flush()
+        elif self.block:
+            self.block.append(line)
+        else:
+            self.merger.write([line])
+
+    def flush(self) -> None:
+        """Write the current (possibly incomplete) block"""
+        if self.block:
+            self.merger.write(self.block)
+            self.block = []
+        self.closing = False
+
+
+@dataclass
+class ProcessResult:
+    label: str
+    filter: str
+    returncode: int
+    wall_time: float
+    suites: List[str] = field(default_factory=list)
+
+
+def run_filter(label: str, filter_: str, command: List[str], merger: LogMerger) -> ProcessResult:
+    """Run `command --filter filter_` and stream its output into the merger"""
+    start = time.monotonic()
+    stream = SuiteBlockStream(merger)
+    proc = subprocess.Popen(command + ["--filter", filter_], stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                            text=True, errors="replace", bufsize=1)
+    with proc.stdout:
+        for line in proc.stdout:
+            stream.feed(line if line.endswith("\n") else line + "\n")
+    returncode = proc.wait()
+    stream.flush()
+    wall = time.monotonic() - start
+    print(f"[{label}] exit {returncode} after {wall:.1f}s "
+          f"({plural(len(stream.suites), 'suite')})", file=sys.stderr)
+    return ProcessResult(label, filter_, returncode, wall, stream.suites)
+
+
+def run_filters(filters: Sequence[Tuple[str, str]], command: List[str], out: TextIO,
+                jobs: Optional[int] = None) -> List[ProcessResult]:
+    """Run one process per (label, filter) pair, at most `jobs` at a time,
+    merging everything into `out`"""
+    merger = LogMerger(out)
+    merger.start()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_filter, label, filter_, command, merger)
+                   for label, filter_ in filters]
+        results = [f.result() for f in futures]
+    merger.finish()
+    return results
+
+
+def build_once(build_command: str) -> bool:
+    """Build before fanning out so parallel runners don't contend for .build"""
+    if not build_command:
+        return False
+    print(f"Building: {build_command}", file=sys.stderr)
+    subprocess.run(shlex.split(build_command), check=True)
+    return True
+
+
+def failed_cases(run: TestRun) -> Dict[str, List[Tuple[str, float]]]:
+    """suite -> [(test, duration)] for every failed case in a run"""
+    failed: Dict[str, List[Tuple[str, float]]] = {}
+    for case in run.cases:
+        if case.status == 'failed':
+            failed.setdefault(case.suite, []).append((case.test_name, case.duration))
+    return failed
+
+
+def suite_filter(suite: str, tests: Sequence[str]) -> str:
+    """Regex matching exactly the given tests of one suite (Module.Suite/test)"""
+    return rf"\.{suite}/({'|'.join(sorted(tests))})$"
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Side-car byte-offset index over `swift test` logs.
+
+While a log is parsed, the byte range from each case's `started` line to
+its `passed`/`failed` line is recorded and saved next to the log as
+`<log>.index`. Everything the case printed in between (assertion errors,
+TestRunner FAIL blocks, captured applet output) can then be sliced out of
+a memory-mapped log without scanning it again. The index is reused for as
+long as the log's size and mtime are unchanged.
+
+Usage:
+    from testindex import case_ranges, extract_cases, load_indexed_run
+    run = load_indexed_run("test-results.txt")    # parses and saves the index
+    ranges = case_ranges("test-results.txt")      # reuses it
+    for key, output in extract_cases("test-results.txt", ranges, ["EchoTests.testEcho"]):
+        ...
+"""
+
+import json
+import mmap
+import os
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from testlog import (CaseFinished, CaseStarted, Event, EventParser, TestRun, is_xunit,
+                     load_run)
+
+INDEX_VERSION = 1
+
+# Lines that can produce an event without a pending 'Executed' summary
+_EVENT_PREFIXES = (b"Test Case '", b"Test Suite '")
+
+# "Suite.test" -> [(start, end), ...]; a case that ran twice has two ranges
+CaseRanges = Dict[str, List[Tuple[int, int]]]
+
+
+def index_path(log: str) -> str:
+    return f"{log}.index"
+
+
+def index_events(f: BinaryIO, ranges: CaseRanges) -> Iterator[Event]:
+    """iter_events over a log opened in binary mode, recording case byte ranges"""
+    parser = EventParser()
+    feed = parser.feed
+    started: Dict[Tuple[str, str], int] = {}
+    offset = 0
+    for raw in f:
+        end = offset + len(raw)
+        # Most of a log is build output; skip decoding lines the parser ignores
+        if (parser.closing_suite is None and not raw.startswith(_EVENT_PREFIXES)
+                and b': error: ' not in raw and b'\r' not in raw):
+            offset = end
+            continue
+        text = raw.decode('utf-8', errors='replace')
+        # Text mode would also split on a bare '\r'; keep the events identical
+        for line in text.splitlines(keepends=True) if '\r' in text else (text,):
+            event = feed(line)
+            if event is None:
+                continue
+            if isinstance(event, CaseStarted):
+                started[(event.suite, event.test_name)] = offset
+            elif isinstance(event, CaseFinished):
+                start = started.pop((event.suite, event.test_name), offset)
+                ranges.setdefault(f"{event.suite}.{event.test_name}", []).append((start, end))
+            yield event
+        offset = end
+
+
+def save_index(log: str, st: os.stat_result, ranges: CaseRanges) -> bool:
+    """Write the side-car index; a read-only log directory just means no index"""
+    state = {'version': INDEX_VERSION, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+             'cases': ranges}
+    path = index_path(log)
+    tmp = path + '.tmp'
+    try:
+        with open(tmp, 'w') as f:
+            f.write(json.dumps(state, separators=(',', ':')))
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
+
+
+def load_index(log: str) -> Optional[CaseRanges]:
+    """The saved ranges for `log`, or None if missing or the log has changed since"""
+    try:
+        with open(index_path(log)) as f:
+            state = json.load(f)
+        st = os.stat(log)
+        if (state['version'] == INDEX_VERSION and state['size'] == st.st_size
+                and state['mtime_ns'] == st.st_mtime_ns):
+            return {key: [tuple(r) for r in spans] for key, spans in state['cases'].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def load_indexed_run(filename: str) -> TestRun:
+    """load_run() that also saves the case index from the same pass.
+
+    Stdin and xUnit XML have no byte ranges worth indexing and fall back
+    to a plain load_run().
+    """
+    if filename == "-" or is_xunit(filename):
+        return load_run(filename)
+    run = TestRun()
+    ranges: CaseRanges = {}
+    with open(filename, 'rb') as f:
+        st = os.fstat(f.fileno())
+        for event in index_events(f, ranges):
+            run.add(event)
+    # A log that grew while being read gets a stale size and is re-indexed later
+    save_index(filename, st, ranges)
+    return run
+
+
+def case_ranges(log: str) -> CaseRanges:
+    """Ranges from the side-car index, rebuilding (and saving) it if stale"""
+    ranges = load_index(log)
+    if ranges is not None:
+        return ranges
+    ranges = {}
+    with open(log, 'rb') as f:
+        st = os.fstat(f.fileno())
+        for _ in index_events(f, ranges):
+            pass
+    save_index(log, st, ranges)
+    return ranges
+
+
+def match_cases(ranges: CaseRanges, name: str) -> List[str]:
+    """Index keys for `Suite.test`, `-[Module.Suite test]` or a bare `Suite`"""
+    if name.startswith('-[') and name.endswith(']'):
+        qualified, _, test = name[2:-1].partition(' ')
+        name = f"{qualified.rsplit('.', 1)[-1]}.{test}"
+    if name in ranges:
+        return [name]
+    prefix = name + '.'
+    return [key for key in ranges if key.startswith(prefix)]
+
+
+def extract_cases(log: str, ranges: CaseRanges, keys: List[str]) -> Iterator[Tuple[str, bytes]]:
+    """(key, log bytes) for every run of each case, sliced from one memory map"""
+    with open(log, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for key in keys:
+                for start, end in ranges.get(key, []):
+                    yield key, mm[start:end]
@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+Shared parser for `swift test` output.
+
+Turns the Linux (`Suite.test`) and Darwin (`-[Module.Suite test]`) XCTest
+log formats into a stream of typed events, and folds those events into a
+TestRun model that every report script builds on.
+
+xUnit XML written by `swift test --xunit-output` is read into the same
+events and model, so every report works from either input.
+
+Usage:
+    from testlog import load_run
+    run = load_run("test-results.txt")   # or "-" for stdin
+    run = load_run("results.xml")        # swift test --xunit-output results.xml
+"""
+
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from xml.etree import ElementTree
+
+
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RunStarted:
+    timestamp: str
+
+@dataclass
+class SuiteStarted:
+    name: str
+
+@dataclass
+class SuiteFinished:
+    name: str
+    passed: bool
+    total: int
+    failed: int
+    skipped: int
+    duration: float
+
+@dataclass
+class CaseStarted:
+    suite: str
+    test_name: str
+
+@dataclass
+class CaseFinished:
+    suite: str
+    test_name: str
+    status: str  # 'passed', 'failed' or 'skipped'
+    duration: float
+
+@dataclass
+class AssertionFailed:
+    suite: str
+    test_name: str
+    file: str
+    line: int
+    message: str
+
+Event = Union[RunStarted, SuiteStarted, SuiteFinished, CaseStarted, CaseFinished, AssertionFailed]
+
+
+# Meta suites ('All tests', 'debug.xctest', 'Selected tests') never match \w+
+SUITE_RE = re.compile(r"Test Suite '(\w+)' (started|passed|failed) at")
+EXECUTED_RE = re.compile(
+    r"\s*Executed (\d+) tests?, with (?:(\d+) tests? skipped and )?(\d+) failures?"
+    r".*? in ([\d.]+) \(([\d.]+)\) seconds"
+)
+# Linux:  Test Case 'BasenameTests.testFoo' passed (0.052 seconds)
+# Darwin: Test Case '-[SwiftyBoxTests.BasenameTests testFoo]' passed (0.052 seconds).
+CASE_RE = re.compile(
+    r"Test Case '(?:-\[\w+\.(\w+) (\w+)\]|(\w+)\.(\w+))' "
+    r"(started|passed|failed|skipped)(?: \(([\d.]+) seconds\))?"
+)
+RUN_START_RE = re.compile(r"Test Suite '(?:All tests|Selected tests)' started at (.+)")
+RUN_END_RE = re.compile(r"Test Suite '(?:All tests|Selected tests)' (?:passed|failed) at")
+ASSERTION_RE = re.compile(
+    r"(.+?):(\d+): error: (?:-\[\w+\.(\w+) (\w+)\]|(\w+)\.(\w+)) : (.*)"
+)
+# XCTAssertEqual failed: ("1") is not equal to ("0") - 1 tests failed
+# XCTAssertTrue failed - find should list files
+ASSERTION_MESSAGE_RE = re.compile(
+    r"(\w+) failed(?:: \(\"(.*?)\"\) is (?:not )?[\w ]+? \(\"(.*)\"\)(?: - |$))?"
+)
+
+
+def open_log(filename: str):
+    """Open a log file for line iteration; '-' reads from stdin"""
+    if filename == "-":
+        sys.stdin.reconfigure(errors="replace")
+        return sys.stdin
+    # Captured logs contain raw applet output that is not always valid UTF-8
+    return open(filename, 'r', errors='replace')
+
+
+def command_name(suite: str) -> str:
+    """Map a suite name to the command it covers (SortTests -> Sort)"""
+    return suite[:-len('Tests')] if suite.endswith('Tests') else suite
+
+
+class EventParser:
+    """Line-at-a-time event parser whose state can be saved and restored.
+
+    The only state carried between lines is the name of a suite whose
+    'Executed N tests' summary is expected on the next line, which keeps
+    parsing constant-memory and lets --follow resume mid-log.
+    """
+
+    def __init__(self):
+        self.closing_suite: Optional[str] = None
+        self.closing_passed = False
+        self.finished = False
+
+    def feed(self, line: str) -> Optional[Event]:
+        """Parse one line, returning the event it completes (if any)"""
+        if self.closing_suite is not None:
+            match = EXECUTED_RE.match(line)
+            closing, self.closing_suite = self.closing_suite, None
+            if match:
+                return SuiteFinished(
+                    name=closing,
+                    passed=self.closing_passed,
+                    total=int(match.group(1)),
+                    failed=int(match.group(3)),
+                    skipped=int(match.group(2) or 0),
+                    duration=float(match.group(4)),
+                )
+
+        if line.startswith("Test Case '"):
+            match = CASE_RE.match(line)
+            if match:
+                suite = match.group(1) or match.group(3)
+                test_name = match.group(2) or match.group(4)
+                status = match.group(5)
+                if status == 'started':
+                    return CaseStarted(suite, test_name)
+                return CaseFinished(suite, test_name, status, float(match.group(6) or 0.0))
+            return None
+
+        if line.startswith("Test Suite '"):
+            match = SUITE_RE.match(line)
+            if match:
+                if match.group(2) == 'started':
+                    return SuiteStarted(match.group(1))
+                self.closing_suite = match.group(1)
+                self.closing_passed = match.group(2) == 'passed'
+            elif RUN_END_RE.match(line):
+                self.finished = True
+            else:
+                match = RUN_START_RE.match(line)
+                if match:
+                    return RunStarted(match.group(1).strip())
+            return None
+
+        if ": error: " in line:
+            match = ASSERTION_RE.match(line)
+            if match:
+                return AssertionFailed(
+                    suite=match.group(3) or match.group(5),
+                    test_name=match.group(4) or match.group(6),
+                    file=match.group(1),
+                    line=int(match.group(2)),
+                    message=match.group(7).rstrip(),
+                )
+        return None
+
+    def state(self) -> Dict:
+        return {'closing_suite': self.closing_suite, 'closing_passed': self.closing_passed,
+                'finished': self.finished}
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'EventParser':
+        parser = cls()
+        parser.closing_suite = state['closing_suite']
+        parser.closing_passed = state['closing_passed']
+        parser.finished = state['finished']
+        return parser
+
+
+def iter_events(lines: Iterable[str], parser: Optional[EventParser] = None) -> Iterator[Event]:
+    """Yield typed events from swift test output in a single pass"""
+    feed = (parser or EventParser()).feed
+    for line in lines:
+        event = feed(line)
+        if event is not None:
+            yield event
+
+
+# ---------------------------------------------------------------------------
+# xUnit XML (swift test --xunit-output)
+# ---------------------------------------------------------------------------
+
+# "/path/Tests/X/SortTests.swift:42: error: XCTAssertEqual failed: ..." in a
+# <failure> message, or a bare "path:line" heading its body
+XUNIT_LOCATION_RE = re.compile(r"(\S+?):(\d+)(?::\d+)?(?:: (?:error: )?(.*))?$")
+
+
+def is_xunit(filename: str) -> bool:
+    """True if the file ('-' for stdin) is xUnit XML rather than a text log"""
+    if filename == "-":
+        head = sys.stdin.buffer.peek(256)[:256]
+    else:
+        with open(filename, 'rb') as f:
+            head = f.read(256)
+    head = head.lstrip(b'\xef\xbb\xbf \t\r\n')
+    return head.startswith(b'<?xml') or head.startswith(b'<testsuite')
+
+
+def _xunit_assertion(suite: str, test_name: str, element) -> Optional[AssertionFailed]:
+    """The assertion behind a <failure>/<error>, if it says more than 'failed'"""
+    # SwiftPM writes a bare message="failed" when it has nothing better
+    message = (element.get('message') or '').strip()
+    message = '' if message == 'failed' else message
+    lines = (element.text or '').strip().splitlines()
+    file, line = "", 0
+    match = XUNIT_LOCATION_RE.match(message)
+    if match:
+        file, line, message = match.group(1), int(match.group(2)), match.group(3) or ''
+    elif lines:
+        match = XUNIT_LOCATION_RE.match(lines[0])
+        if match:
+            file, line = match.group(1), int(match.group(2))
+            lines = ([match.group(3)] if match.group(3) else []) + lines[1:]
+    message = message or (lines[0].strip() if lines else '')
+    if not message:
+        return None
+    return AssertionFailed(suite, test_name, file, line, message)
+
+
+def iter_xunit_events(source) -> Iterator[Event]:
+    """Yield the same events as iter_events from xUnit XML, in a single pass.
+
+    The XML is read with iterparse and every <testcase> is cleared and
+    detached as soon as it has been turned into events, so memory stays
+    bounded by the number of suites rather than the size of the file.
+    Suites come from the classname (Module.Suite) and close when the
+    enclosing <testsuite> element ends, with counts summed from their cases.
+    """
+    open_elements = []
+    open_suites: Dict[str, List] = {}  # suite -> [total, failed, skipped, duration]
+    started = False
+    for kind, element in ElementTree.iterparse(source, events=('start', 'end')):
+        if kind == 'start':
+            open_elements.append(element)
+            if not started and element.tag in ('testsuites', 'testsuite') and element.get('timestamp'):
+                started = True
+                yield RunStarted(element.get('timestamp'))
+            continue
+        open_elements.pop()
+
+        if element.tag == 'testcase':
+            suite = (element.get('classname') or '').rsplit('.', 1)[-1]
+            test_name = (element.get('name') or '').rstrip('()')
+            if suite not in open_suites:
+                open_suites[suite] = [0, 0, 0, 0.0]
+                yield SuiteStarted(suite)
+            yield CaseStarted(suite, test_name)
+
+            problems = [child for child in element if child.tag in ('failure', 'error')]
+            for problem in problems:
+                assertion = _xunit_assertion(suite, test_name, problem)
+                if assertion is not None:
+                    yield assertion
+            if element.find('skipped') is not None:
+                status = 'skipped'
+            else:
+                status = 'failed' if problems else 'passed'
+            duration = float(element.get('time') or 0.0)
+            yield CaseFinished(suite, test_name, status, duration)
+
+            counts = open_suites[suite]
+            counts[0] += 1
+            counts[1] += len(problems)
+            counts[2] += status == 'skipped'
+            counts[3] += duration
+            element.clear()
+            if open_elements:
+                open_elements[-1].remove(element)
+        elif element.tag == 'testsuite':
+            for suite, (total, failed, skipped, duration) in open_suites.items():
+                yield SuiteFinished(suite, failed == 0, total, failed, skipped, duration)
+            open_suites.clear()
+            element.clear()
+
+    # Bare <testcase> elements without an enclosing <testsuite>
+    for suite, (total, failed, skipped, duration) in open_suites.items():
+        yield SuiteFinished(suite, failed == 0, total, failed, skipped, duration)
+
+
+def read_events(filename: str) -> Iterator[Event]:
+    """Yield events from a text log or xUnit XML file ('-' for stdin)"""
+    if is_xunit(filename):
+        if filename == "-":
+            yield from iter_xunit_events(sys.stdin.buffer)
+        else:
+            with open(filename, 'rb') as f:
+                yield from iter_xunit_events(f)
+        return
+    with open_log(filename) as f:
+        yield from iter_events(f)
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TestSuite:
+    name: str
+    total: int
+    passed: int
+    failed: int
+    duration: float
+    skipped: int = 0
+
+@dataclass
+class TestCase:
+    suite: str
+    test_name: str
+    passed: bool
+    duration: float
+    status: str = 'passed'
+
+@dataclass
+class TestFailure:
+    suite: str
+    test_name: str
+    reason: str
+    file: str = ""
+    line: int = 0
+    kind: str = ""       # assertion that failed, e.g. XCTAssertEqual
+    actual: str = ""     # first operand of a comparison assertion
+    expected: str = ""   # second operand of a comparison assertion
+
+@dataclass
+class TestRun:
+    """Everything the reports need, folded from one pass over the events"""
+    suites: List[TestSuite] = field(default_factory=list)
+    cases: List[TestCase] = field(default_factory=list)
+    failures: List[TestFailure] = field(default_factory=list)
+    started_at: Optional[str] = None
+
+    def __post_init__(self):
+        # First assertion seen for each case that has not finished yet;
+        # a plain attribute so it stays out of asdict() checkpoints
+        self._pending: Dict[Tuple[str, str], AssertionFailed] = {}
+
+    def add(self, event: Event) -> None:
+        """Fold a single event into the run"""
+        if isinstance(event, CaseFinished):
+            self.cases.append(TestCase(
+                suite=event.suite,
+                test_name=event.test_name,
+                passed=event.status == 'passed',
+                duration=event.duration,
+                status=event.status,
+            ))
+            assertion = self._pending.pop((event.suite, event.test_name), None)
+            if event.status == 'failed':
+                self.failures.append(failure_from_assertion(event.suite, event.test_name, assertion))
+        elif isinstance(event, SuiteFinished):
+            self.suites.append(TestSuite(
+                name=event.name,
+                total=event.total,
+                # XCTest counts assertion failures, so this can go negative;
+                # the reports have always shown it as-is
+                passed=event.total - event.failed - event.skipped,
+                failed=event.failed,
+                duration=event.duration,
+                skipped=event.skipped,
+            ))
+        elif isinstance(event, AssertionFailed):
+            self._pending.setdefault((event.suite, event.test_name), event)
+        elif isinstance(event, RunStarted) and self.started_at is None:
+            self.started_at = event.timestamp
+
+
+def failure_from_assertion(suite: str, test_name: str,
+                           assertion: Optional[AssertionFailed]) -> TestFailure:
+    """Build a TestFailure, splitting the assertion message into its parts"""
+    if assertion is None:
+        return TestFailure(suite=suite, test_name=test_name, reason="See detailed output")
+    failure = TestFailure(suite=suite, test_name=test_name, reason=assertion.message,
+                          file=assertion.file, line=assertion.line)
+    match = ASSERTION_MESSAGE_RE.match(assertion.message)
+    if match:
+        failure.kind = match.group(1)
+        failure.actual = match.group(2) or ""
+        failure.expected = match.group(3) or ""
+    return failure
+
+
+def parse_log(lines: Iterable[str]) -> TestRun:
+    """Build a TestRun from an iterable of log lines"""
+    run = TestRun()
+    for event in iter_events(lines):
+        run.add(event)
+    return run
+
+
+def load_run(filename: str) -> TestRun:
+    """Parse a log file or xUnit XML file ('-' for stdin) into a TestRun"""
+    run = TestRun()
+    for event in read_events(filename):
+        run.add(event)
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Checkpoints
+# ---------------------------------------------------------------------------
+
+def read_complete_lines(path: str, offset: int) -> Tuple[List[str], int]:
+    """Read whole lines appended after `offset`, returning them and the new offset.
+
+    A trailing partial line is left for the next call, so a log that is
+    still being written is never parsed mid-line.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    if end == 0:
+        return [], offset
+    text = data[:end].decode('utf-8', errors='replace')
+    return text.splitlines(keepends=True), offset + end
+
+
+def records_path(checkpoint: str) -> str:
+    """Append-only journal of the suites, cases and failures behind a checkpoint"""
+    return f"{checkpoint}.records"
+
+
+_RECORD_KINDS = (('suites', TestSuite), ('cases', TestCase), ('failures', TestFailure))
+
+
+def _read_header(checkpoint: str) -> Optional[Dict]:
+    try:
+        with open(checkpoint) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_checkpoint(checkpoint: str, log: str, offset: int,
+                    parser: EventParser, run: TestRun) -> None:
+    """Persist the parse position, parser state and run folded so far.
+
+    The checkpoint itself only holds the offset, parser state, pending
+    assertions and record counts; suites, cases and failures are appended
+    to records_path(checkpoint), so saving after each --follow poll costs
+    only what that poll added. The header names the journal size it was
+    written with, and a journal longer than that (a save interrupted after
+    appending) is cut back when loaded.
+    """
+    log_path = os.path.abspath(log)
+    inode = os.stat(log).st_ino
+    previous = _read_header(checkpoint)
+    saved = previous.get('counts') if isinstance(previous, dict) else None
+    # Continue the journal only if it holds a prefix of this run's records
+    if (not isinstance(saved, dict) or previous.get('log') != log_path
+            or previous.get('inode') != inode or previous.get('offset', 0) > offset
+            or any(saved.get(kind, 0) > len(getattr(run, kind)) for kind, _ in _RECORD_KINDS)):
+        saved = {kind: 0 for kind, _ in _RECORD_KINDS}
+        size = 0
+    else:
+        size = previous.get('records_size', 0)
+
+    journal = records_path(checkpoint)
+    if size and (not os.path.exists(journal) or os.path.getsize(journal) < size):
+        saved = {kind: 0 for kind, _ in _RECORD_KINDS}
+        size = 0
+    with open(journal, 'r+b' if size else 'wb') as f:
+        f.seek(size)
+        f.truncate()
+        for kind, _ in _RECORD_KINDS:
+            for record in getattr(run, kind)[saved.get(kind, 0):]:
+                f.write(json.dumps([kind, asdict(record)]).encode() + b'\n')
+        size = f.tell()
+
+    state = {
+        'log': log_path,
+        'inode': inode,
+        'offset': offset,
+        'parser': parser.state(),
+        'started_at': run.started_at,
+        'pending': [asdict(a) for a in run._pending.values()],
+        'counts': {kind: len(getattr(run, kind)) for kind, _ in _RECORD_KINDS},
+        'records_size': size,
+    }
+    tmp = checkpoint + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, checkpoint)
+
+
+def load_checkpoint(checkpoint: str, log: str) -> Tuple[int, EventParser, TestRun]:
+    """Restore a checkpoint for `log`, or start fresh if it no longer applies.
+
+    A checkpoint is discarded when the log was replaced (different inode) or
+    truncated below the saved offset, e.g. by a new run-tests.sh invocation.
+    """
+    try:
+        state = _read_header(checkpoint)
+        st = os.stat(log)
+        if (state['log'] == os.path.abspath(log) and state['inode'] == st.st_ino
+                and state['offset'] <= st.st_size):
+            run = TestRun(started_at=state.get('started_at'))
+            types = dict(_RECORD_KINDS)
+            with open(records_path(checkpoint), 'rb') as f:
+                for line in f.read(state['records_size']).splitlines():
+                    kind, fields = json.loads(line)
+                    getattr(run, kind).append(types[kind](**fields))
+            if any(len(getattr(run, kind)) != count for kind, count in state['counts'].items()):
+                raise ValueError("checkpoint journal is incomplete")
+            for fields in state['pending']:
+                assertion = AssertionFailed(**fields)
+                run._pending[(assertion.suite, assertion.test_name)] = assertion
+            return state['offset'], EventParser.from_state(state['parser']), run
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return 0, EventParser(), TestRun()
+
+
+def resume_run(log: str, checkpoint: str) -> TestRun:
+    """Parse only what was appended to `log` since the checkpoint, then update it"""
+    offset, parser, run = load_checkpoint(checkpoint, log)
+    lines, offset = read_complete_lines(log, offset)
+    for event in iter_events(lines, parser):
+        run.add(event)
+    save_checkpoint(checkpoint, log, offset, parser, run)
+    return run
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Report renderers shared by the SwiftyBox test analysis scripts.
+
+A TestRun (see testlog.py) is reduced once by summarize_run() to a
+RunSummary holding every aggregate the reports need: overall, per-category
+and per-command totals, baseline rows and failure clusters. Report writers
+then stream straight to a file handle from that summary, so producing the
+tracker, the baseline table, JSON and JUnit XML is one parse, one
+aggregation pass and one write per artifact.
+"""
+
+import io
+import json
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from testlog import TestFailure, TestRun, TestSuite, command_name
+from testtriage import FailureCluster, cluster_failures
+
+
+def command_results(run: TestRun) -> Dict:
+    """Per-command case counts and failing test names"""
+    results = {
+        'total': 0,
+        'passed': 0,
+        'failed': 0,
+        'skipped': 0,
+        'failures': defaultdict(list),
+        'by_command': defaultdict(lambda: {'passed': 0, 'failed': 0, 'total': 0})
+    }
+
+    for case in run.cases:
+        command = command_name(case.suite)
+        if case.status == 'skipped':
+            results['skipped'] += 1
+            continue
+
+        results['total'] += 1
+        results['by_command'][command]['total'] += 1
+
+        if case.status == 'passed':
+            results['passed'] += 1
+            results['by_command'][command]['passed'] += 1
+        else:
+            results['failed'] += 1
+            results['by_command'][command]['failed'] += 1
+            results['failures'][command].append(case.test_name)
+
+    return results
+
+
+def generate_summary(results: Dict) -> str:
+    """Generate a summary report"""
+    total = results['total']
+    passed = results['passed']
+    failed = results['failed']
+    pass_rate = (passed / total * 100) if total > 0 else 0
+
+    summary = []
+    summary.append("=" * 70)
+    summary.append("SwiftyBox Test Results Summary")
+    summary.append("=" * 70)
+    summary.append(f"Total Tests:  {total}")
+    summary.append(f"Passed:       {passed} ({passed/total*100:.1f}%)" if total > 0 else "Passed:       0")
+    summary.append(f"Failed:       {failed} ({failed/total*100:.1f}%)" if total > 0 else "Failed:       0")
+    if results['skipped']:
+        summary.append(f"Skipped:      {results['skipped']}")
+    summary.append(f"Pass Rate:    {pass_rate:.1f}%")
+    summary.append("=" * 70)
+    summary.append("")
+
+    # Commands with failures
+    if results['failures']:
+        summary.append("Commands with Failures:")
+        summary.append("-" * 70)
+        for cmd in sorted(results['failures'].keys()):
+            stats = results['by_command'][cmd]
+            summary.append(f"\n{cmd}Tests: {stats['passed']}/{stats['total']} passing")
+            summary.append(f"  Failed tests ({len(results['failures'][cmd])}):")
+            for test in sorted(results['failures'][cmd]):
+                summary.append(f"    - {test}")
+
+    summary.append("")
+    summary.append("=" * 70)
+    summary.append("All Commands Status:")
+    summary.append("-" * 70)
+
+    for cmd in sorted(results['by_command'].keys()):
+        stats = results['by_command'][cmd]
+        status_icon = "🟢" if stats['failed'] == 0 else "🔴" if stats['passed'] == 0 else "🟡"
+        summary.append(f"{status_icon} {cmd:<20} {stats['passed']:>3}/{stats['total']:<3} ({stats['passed']/stats['total']*100:.0f}%)")
+
+    return "\n".join(summary)
+
+
+def generate_tracker_update(results: Dict) -> str:
+    """Generate markdown to update TEST_FAILURE_TRACKER.md"""
+    out = io.StringIO()
+    write_tracker_update(results, out)
+    return out.getvalue()
+
+
+def write_tracker_update(results: Dict, out: TextIO) -> None:
+    """Stream the per-command tracker update for command_results() output"""
+    # Lines are newline-separated, not terminated, as the report always was
+    separator = ""
+
+    def line(text: str) -> None:
+        nonlocal separator
+        out.write(separator + text)
+        separator = "\n"
+
+    line("# Auto-Generated Tracker Update")
+    line(f"\n**Test Run**: {Path.cwd()}")
+    line(f"**Total**: {results['total']} tests")
+    line(f"**Passed**: {results['passed']} ({results['passed']/results['total']*100:.1f}%)")
+    line(f"**Failed**: {results['failed']} ({results['failed']/results['total']*100:.1f}%)")
+    line("\n## Commands by Status:\n")
+
+    for cmd in sorted(results['by_command'].keys()):
+        stats = results['by_command'][cmd]
+        status = "🟢 PASSING" if stats['failed'] == 0 else "🟡 MIXED" if stats['passed'] > 0 else "🔴 FAILING"
+
+        line(f"### {cmd} ({stats['passed']}/{stats['total']} tests passing)")
+        line(f"**Overall Status**: {status}\n")
+
+        if cmd in results['failures']:
+            line("#### Failing Tests:\n")
+            for i, test in enumerate(sorted(results['failures'][cmd]), 1):
+                line(f"{i}. **{test}**")
+                line(f"   - Status: 🔴 FAILING")
+                line(f"   - Root Cause: [TO BE INVESTIGATED]")
+                line(f"   - Priority: P?")
+                line(f"   - Notes: \n")
+        line("")
+
+
+def baseline_results(run: TestRun) -> Dict:
+    """Per-command suite totals as used by the baseline table"""
+    results = {}
+    for suite in run.suites:
+        if not suite.name.endswith('Tests'):
+            continue
+        results[command_name(suite.name)] = {
+            'total': suite.total,
+            'passing': suite.passed,
+            'failing': suite.failed,
+            'status': '✅' if suite.failed == 0 else '❌' if suite.passed == 0 else '⚠️'
+        }
+    return results
+
+
+def generate_baseline_table(results: Dict) -> str:
+    """Generate the baseline markdown table and status summary"""
+    out = io.StringIO()
+    write_baseline_table(results, out)
+    return out.getvalue()
+
+
+def write_baseline_table(results: Dict, out: TextIO) -> None:
+    """Stream the baseline markdown table for baseline_results() output"""
+    out.write("# Baseline Test Results by Command\n\n")
+    out.write("| Command | Total | Passing | Failing | Status |\n")
+    out.write("|---------|-------|---------|---------|--------|\n")
+
+    total_tests = total_passing = total_failing = 0
+    fully_passing = partially_passing = fully_failing = 0
+    for cmd in sorted(results.keys()):
+        r = results[cmd]
+        out.write(f"| {cmd} | {r['total']} | {r['passing']} | {r['failing']} | {r['status']} |\n")
+        total_tests += r['total']
+        total_passing += r['passing']
+        total_failing += r['failing']
+        fully_passing += r['failing'] == 0 and r['total'] > 0
+        partially_passing += r['passing'] > 0 and r['failing'] > 0
+        fully_failing += r['passing'] == 0 and r['total'] > 0
+
+    out.write(f"\n## Summary\n")
+    out.write(f"- **Total Commands**: {len(results)}\n")
+    out.write(f"- **Total Tests**: {total_tests}\n")
+    out.write(f"- **Passing Tests**: {total_passing} ({100*total_passing//total_tests}%)\n")
+    out.write(f"- **Failing Tests**: {total_failing} ({100*total_failing//total_tests}%)\n")
+    out.write(f"\n### Commands by Status\n")
+    out.write(f"- ✅ **Fully Passing**: {fully_passing} commands\n")
+    out.write(f"- ⚠️ **Partially Passing**: {partially_passing} commands\n")
+    out.write(f"- ❌ **Fully Failing**: {fully_failing} commands\n")
+
+
+# ---------------------------------------------------------------------------
+# Run summary: every aggregate, computed once
+# ---------------------------------------------------------------------------
+
+def analyze_by_category(suites: List[TestSuite]) -> Dict[str, List[TestSuite]]:
+    """Group test suites by implementation category"""
+
+    # Command categories based on PROGRESS.md
+    nofork_commands = {
+        'EchoTests', 'TrueTests', 'FalseTests', 'PwdTests', 'BasenameTests',
+        'DirnameTests', 'PrintfTests', 'TestTests', 'SeqTests', 'YesTests',
+        'LogNameTests', 'WhoamiTests', 'HostnameTests', 'UnameTests',
+        'UsleepTests', 'SleepTests', 'NohupTests', 'EnvTests', 'WcTests',
+        'HeadTests', 'TailTests', 'CatTests', 'TacTests', 'CutTests',
+        'TrTests', 'TeeTests', 'GrepTests', 'SedTests', 'AwkTests',
+        'XargsTests', 'ReadlinkTests', 'RealpathTests', 'FactorTests',
+        'ExprTests', 'MktempTests', 'DateTests', 'IdTests', 'HostidTests',
+        'Md5sumTests', 'Sha1sumTests', 'Sha256sumTests', 'Sha512sumTests',
+        'RevTests', 'ExpandTests', 'UnexpandTests', 'HexdumpTests',
+        'ShufTests', 'StatTests', 'DuTests', 'DfTests'
+    }
+
+    file_ops = {
+        'LsTests', 'CpTests', 'MvTests', 'RmTests', 'LnTests',
+        'ChmodTests', 'ChownTests', 'ChgrpTests', 'MkdirTests',
+        'RmdirTests', 'TouchTests'
+    }
+
+    text_processing = {
+        'SortTests', 'UniqTests', 'CommTests', 'FoldTests',
+        'PasteTests', 'NlTests', 'DiffTests', 'PatchTests',
+        'CmpTests', 'StringsTests', 'OdTests'
+    }
+
+    unimplemented = {
+        'AshTests', 'CalTests', 'TarTests', 'GzipTests', 'GunzipTests',
+        'Bunzip2Tests', 'BzcatTests', 'UncompressTests', 'DdTests',
+        'FindTests', 'WhichTests', 'TreeTests', 'PidofTests',
+        'WgetTests', 'XxdTests', 'TsortTests', 'SumTests', 'UptimeTests'
+    }
+
+    categories = {
+        'NOFORK (Phases 1-5)': [],
+        'File Operations (Phase 6)': [],
+        'Text Processing (Phase 7+)': [],
+        'Unimplemented': [],
+        'Other': []
+    }
+
+    for suite in suites:
+        if suite.name in nofork_commands:
+            categories['NOFORK (Phases 1-5)'].append(suite)
+        elif suite.name in file_ops:
+            categories['File Operations (Phase 6)'].append(suite)
+        elif suite.name in text_processing:
+            categories['Text Processing (Phase 7+)'].append(suite)
+        elif suite.name in unimplemented:
+            categories['Unimplemented'].append(suite)
+        else:
+            categories['Other'].append(suite)
+
+    return categories
+
+
+@dataclass
+class Totals:
+    suites: int = 0
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+    def add(self, suite: TestSuite) -> None:
+        self.suites += 1
+        self.total += suite.total
+        self.passed += suite.passed
+        self.failed += suite.failed
+        self.skipped += suite.skipped
+
+
+@dataclass
+class RunSummary:
+    run: TestRun
+    totals: Totals
+    categories: Dict[str, List[TestSuite]]
+    category_totals: Dict[str, Totals]
+    commands: Dict
+    baseline: Dict
+    clusters: List[FailureCluster]
+    # (suite, test) -> first assertion failure of that case
+    failures_by_case: Dict[Tuple[str, str], TestFailure] = field(default_factory=dict)
+
+
+def summarize_run(run: TestRun) -> RunSummary:
+    """Compute every report aggregate in one pass over the run's suites and cases"""
+    totals = Totals()
+    categories = analyze_by_category(run.suites)
+    category_totals = {}
+    for name, suites in categories.items():
+        category_totals[name] = Totals()
+        for suite in suites:
+            category_totals[name].add(suite)
+            totals.add(suite)
+
+    failures_by_case = {}
+    for failure in run.failures:
+        failures_by_case.setdefault((failure.suite, failure.test_name), failure)
+
+    return RunSummary(run, totals, categories, category_totals, command_results(run),
+                      baseline_results(run), cluster_failures(run.failures), failures_by_case)
+
+
+# ---------------------------------------------------------------------------
+# Streaming report writers
+# ---------------------------------------------------------------------------
+
+def write_failure_tracker(summary: RunSummary, out: TextIO) -> None:
+    """TEST_FAILURE_TRACKER.md"""
+    totals = summary.totals
+    out.write("""# Test Failure Tracker
+
+**Generated:** Automated analysis
+**Status:** Initial test run complete
+
+## Overview
+
+""")
+    out.write(f"- **Total Tests:** {totals.total}\n")
+    out.write(f"- **Passed:** {totals.passed} ({100*totals.passed/totals.total:.1f}%)\n")
+    out.write(f"- **Failed:** {totals.failed} ({100*totals.failed/totals.total:.1f}%)\n")
+    out.write(f"- **Test Suites:** {totals.suites}\n\n")
+
+    out.write("## Status by Category\n\n")
+    for cat_name, cat_suites in summary.categories.items():
+        if not cat_suites:
+            continue
+        cat = summary.category_totals[cat_name]
+
+        out.write(f"### {cat_name}\n\n")
+        out.write(f"- Suites: {cat.suites}\n")
+        out.write(f"- Tests: {cat.total}\n")
+        out.write(f"- Passed: {cat.passed} ({100*cat.passed/cat.total:.1f}%)\n" if cat.total > 0 else "- Passed: 0\n")
+        out.write(f"- Failed: {cat.failed} ({100*cat.failed/cat.total:.1f}%)\n\n" if cat.total > 0 else "- Failed: 0\n\n")
+
+        for suite in sorted(cat_suites, key=lambda x: x.name):
+            status = "✅" if suite.failed == 0 else "❌"
+            out.write(f"{status} **{suite.name}**: {suite.passed}/{suite.total} passed")
+            if suite.failed > 0:
+                out.write(f" ({suite.failed} failed)")
+            out.write("\n")
+        out.write("\n")
+
+    clusters = summary.clusters
+    if clusters:
+        out.write("## Failure Clusters\n\n")
+        out.write(f"{len(summary.run.failures)} failures grouped into {len(clusters)} clusters "
+                  f"by signature (largest first):\n\n")
+        for cluster in clusters:
+            example = cluster.failures[0]
+            out.write(f"### [{cluster.cluster_id}] {len(cluster.failures)} failure(s)\n\n")
+            out.write(f"- **Signature:** `{cluster.signature}`\n")
+            if example.kind:
+                out.write(f"- **Assertion:** {example.kind}")
+                if example.actual or example.expected:
+                    out.write(f" (actual `{example.actual}`, expected `{example.expected}`)")
+                out.write("\n")
+            locations = cluster.locations()
+            if locations:
+                out.write(f"- **Locations:** {', '.join(locations)}\n")
+            out.write(f"- **Commands:** {', '.join(cluster.commands)}\n")
+            out.write(f"- **Example:** {example.suite}.{example.test_name}\n\n")
+
+    out.write("## Detailed Failure List\n\n")
+    out.write("Test suites with failures (sorted by failure count):\n\n")
+    for suite in sorted([s for s in summary.run.suites if s.failed > 0], key=lambda x: -x.failed):
+        out.write(f"### {suite.name}\n\n")
+        out.write(f"- **Failed:** {suite.failed}/{suite.total}\n")
+        out.write(f"- **Passed:** {suite.passed}/{suite.total}\n")
+        out.write(f"- **File:** `Tests/SwiftyBoxTests/Consolidated/{suite.name}.swift`\n\n")
+        out.write("**Action Items:**\n")
+        out.write("- [ ] Review test expectations\n")
+        out.write("- [ ] Fix implementation issues\n")
+        out.write("- [ ] Re-run tests\n\n")
+
+
+def write_json_report(summary: RunSummary, out: TextIO) -> None:
+    """Machine-readable run report, written one record at a time"""
+    totals = summary.totals
+    commands = summary.commands
+    out.write("{\n")
+    out.write(f'  "started_at": {json.dumps(summary.run.started_at)},\n')
+    out.write(f'  "totals": {json.dumps(vars(totals))},\n')
+    out.write(f'  "cases": {json.dumps({k: commands[k] for k in ("total", "passed", "failed", "skipped")})},\n')
+    out.write(f'  "categories": {json.dumps({k: vars(v) for k, v in summary.category_totals.items()})},\n')
+
+    out.write('  "commands": {')
+    for i, cmd in enumerate(sorted(commands['by_command'])):
+        stats = dict(commands['by_command'][cmd], failing_tests=sorted(commands['failures'].get(cmd, [])))
+        out.write(f'{"," if i else ""}\n    {json.dumps(cmd)}: {json.dumps(stats)}')
+    out.write('\n  },\n')
+
+    out.write('  "suites": [')
+    for i, suite in enumerate(summary.run.suites):
+        out.write(f'{"," if i else ""}\n    {json.dumps(vars(suite))}')
+    out.write('\n  ],\n')
+
+    out.write('  "clusters": [')
+    for i, cluster in enumerate(summary.clusters):
+        record = {"id": cluster.cluster_id, "signature": cluster.signature,
+                  "count": len(cluster.failures), "commands": cluster.commands,
+                  "locations": cluster.locations(),
+                  "tests": [f"{f.suite}.{f.test_name}" for f in cluster.failures]}
+        out.write(f'{"," if i else ""}\n    {json.dumps(record, ensure_ascii=False)}')
+    out.write('\n  ]\n}\n')
+
+
+# XML 1.0 cannot carry most control characters, which captured applet output can contain
+_XML_INVALID_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def _xml_text(text: str) -> str:
+    return escape(_XML_INVALID_RE.sub("\ufffd", text))
+
+
+def _xml_attr(text: str) -> str:
+    return quoteattr(_XML_INVALID_RE.sub("\ufffd", text))
+
+
+def write_junit_xml(summary: RunSummary, out: TextIO) -> None:
+    """JUnit XML for CI dashboards; case counts come from the cases themselves"""
+    by_suite: Dict[str, List] = {}
+    for case in summary.run.cases:
+        by_suite.setdefault(case.suite, []).append(case)
+    commands = summary.commands
+
+    out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    started = f' timestamp={_xml_attr(summary.run.started_at)}' if summary.run.started_at else ''
+    out.write(f'<testsuites name="swiftybox" tests="{commands["total"] + commands["skipped"]}" '
+              f'failures="{commands["failed"]}" skipped="{commands["skipped"]}"{started}>\n')
+    for suite_name, cases in by_suite.items():
+        failed = sum(1 for c in cases if c.status == 'failed')
+        skipped = sum(1 for c in cases if c.status == 'skipped')
+        duration = sum(c.duration for c in cases)
+        out.write(f'  <testsuite name={_xml_attr(suite_name)} tests="{len(cases)}" '
+                  f'failures="{failed}" skipped="{skipped}" time="{duration:.3f}">\n')
+        for case in cases:
+            out.write(f'    <testcase classname={_xml_attr(suite_name)} name={_xml_attr(case.test_name)} '
+                      f'time="{case.duration:.3f}"')
+            if case.status == 'passed':
+                out.write('/>\n')
+                continue
+            out.write('>\n')
+            if case.status == 'skipped':
+                out.write('      <skipped/>\n')
+            else:
+                failure: Optional[TestFailure] = summary.failures_by_case.get((suite_name, case.test_name))
+                message = failure.reason if failure else "failed"
+                kind = failure.kind if failure and failure.kind else "failure"
+                location = f"{failure.file}:{failure.line}\n" if failure and failure.file else ""
+                out.write(f'      <failure message={_xml_attr(message)} type={_xml_attr(kind)}>'
+                          f'{_xml_text(location + message)}</failure>\n')
+            out.write('    </testcase>\n')
+        out.write('  </testsuite>\n')
+    out.write('</testsuites>\n')
+
+
+def _write_tracker_update(summary: RunSummary, out: TextIO) -> None:
+    write_tracker_update(summary.commands, out)
+
+
+def _write_baseline_table(summary: RunSummary, out: TextIO) -> None:
+    write_baseline_table(summary.baseline, out)
+
+
+# format name -> writer(summary, out)
+REPORT_WRITERS = {
+    'tracker': write_failure_tracker,
+    'tracker-update': _write_tracker_update,
+    'baseline': _write_baseline_table,
+    'json': write_json_report,
+    'junit': write_junit_xml,
+}
+
+
+def write_reports(summary: RunSummary, outputs: Dict[str, str]) -> None:
+    """Write each requested format (format name -> path) from the one summary"""
+    for fmt, path in outputs.items():
+        with open(path, 'w') as out:
+            REPORT_WRITERS[fmt](summary, out)
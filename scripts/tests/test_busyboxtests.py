@@ -0,0 +1,128 @@
+"""Tests for the BusyBox .tests lexer and `testing` call extraction"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from busyboxtests import LexError, ShellLexer, parse_busybox_tests  # noqa: E402
+
+
+def words(text):
+    return [t.value for t in ShellLexer(text).tokens() if t.kind == 'word']
+
+
+class ShellLexerTests(unittest.TestCase):
+    def test_single_quotes_are_literal(self):
+        self.assertEqual(words("echo 'a \\n $x \"b\"'"), ['echo', 'a \\n $x "b"'])
+
+    def test_double_quotes_keep_unknown_escapes(self):
+        # testing.sh hands these to `echo -ne`, so \n must survive
+        self.assertEqual(words('echo "a\\nb" "q\\"q" "s\\\\s"'), ['echo', 'a\\nb', 'q"q', 's\\s'])
+
+    def test_ansi_c_strings_are_decoded(self):
+        self.assertEqual(words("echo $'a\\tb\\n' $'\\x41\\101'"), ['echo', 'a\tb\n', 'AA'])
+
+    def test_adjacent_pieces_form_one_word(self):
+        self.assertEqual(words("x'a'\"b\"c"), ['xabc'])
+
+    def test_continuations_join_lines(self):
+        tokens = list(ShellLexer('testing \\\n\t"a" \\\n\t"b"\nnext\n').tokens())
+        self.assertEqual([t.value for t in tokens if t.kind == 'word'], ['testing', 'a', 'b', 'next'])
+        self.assertEqual([t.line for t in tokens if t.kind == 'word'], [1, 2, 3, 4])
+
+    def test_comments_and_operators(self):
+        tokens = list(ShellLexer("a # b 'c\nd && e; f | g\n").tokens())
+        self.assertEqual([t.value for t in tokens if t.kind != 'newline'],
+                         ['a', 'd', '&&', 'e', ';', 'f', '|', 'g'])
+
+    def test_heredoc_bodies_are_skipped(self):
+        self.assertEqual(words("cat >input <<EOF\ntesting \"x\"\nEOF\nafter\n"),
+                         ['cat', 'input', 'EOF', 'after'])
+        self.assertEqual(words("cat <<-END\n\tbody\n\tEND\nafter\n"), ['cat', 'END', 'after'])
+
+    def test_expansions_are_marked_dynamic(self):
+        tokens = [t for t in ShellLexer('a "$x" $(b c) `d` ${e} \\$f\n').tokens() if t.kind == 'word']
+        self.assertEqual([t.dynamic for t in tokens], [False, True, True, True, True, False])
+        self.assertEqual(tokens[-1].value, '$f')
+
+    def test_unterminated_quote_raises(self):
+        with self.assertRaises(LexError) as caught:
+            list(ShellLexer("ok\necho 'open\n").tokens())
+        self.assertEqual(caught.exception.line, 2)
+
+
+class ParseBusyBoxTestsTests(unittest.TestCase):
+    def test_testing_call_fields(self):
+        report = parse_busybox_tests('#!/bin/sh\ntesting "name" "cmd input" "out\\n" "in\\n" "stdin"\n')
+        self.assertEqual(report.unparseable, [])
+        [test] = report.tests
+        self.assertEqual((test.name, test.command, test.expected, test.input_file, test.stdin, test.line),
+                         ("name", "cmd input", "out\\n", "in\\n", "stdin", 2))
+
+    def test_missing_trailing_arguments_default_to_empty(self):
+        [test] = parse_busybox_tests('testing "n" "c" "e"\n').tests
+        self.assertEqual((test.input_file, test.stdin), ("", ""))
+
+    def test_multiline_call(self):
+        [test] = parse_busybox_tests('testing "n" \\\n\t"c" \\\n\t"e" \\\n\t"" ""\n').tests
+        self.assertEqual((test.command, test.expected, test.line), ("c", "e", 1))
+
+    def test_optional_applies_until_the_next_optional(self):
+        report = parse_busybox_tests(
+            'testing "a" "c" "e"\n'
+            'optional FEATURE_X FEATURE_Y\n'
+            'testing "b" "c" "e"\n'
+            'testing "c" "c" "e"\n'
+            'optional\n'
+            'testing "d" "c" "e"\n')
+        self.assertEqual([t.optional_features for t in report.tests],
+                         [[], ['FEATURE_X', 'FEATURE_Y'], ['FEATURE_X', 'FEATURE_Y'], []])
+
+    def test_empty_skip_ends_the_optional_section(self):
+        report = parse_busybox_tests(
+            'optional FEATURE_FANCY_ECHO\ntesting "a" "c" "e"\nSKIP=\n'
+            'testing "b" "c" "e"\ntesting "c" "c" "e"\ntesting "d" "c" "e"\n')
+        self.assertEqual([t.optional_features for t in report.tests],
+                         [['FEATURE_FANCY_ECHO'], [], [], []])
+
+    def test_standalone_skip_persists(self):
+        report = parse_busybox_tests(
+            'SKIP=1\ntesting "a" "c" "e"\ntesting "b" "c" "e"\nSKIP=\ntesting "c" "c" "e"\n')
+        self.assertEqual([t.skip_guard for t in report.tests], ['1', '1', ''])
+
+    def test_prefix_skip_only_applies_to_its_command(self):
+        report = parse_busybox_tests(
+            'SKIP=1 testing "a" "c" "e"\ntesting "b" "c" "e"\n'
+            'SKIP=2\nSKIP= testing "c" "c" "e"\ntesting "d" "c" "e"\n')
+        self.assertEqual([t.skip_guard for t in report.tests], ['1', '', '', '2'])
+
+    def test_calls_inside_conditionals_are_found(self):
+        report = parse_busybox_tests('if true; then testing "a" "c" "e"; fi\n')
+        self.assertEqual([t.name for t in report.tests], ['a'])
+
+    def test_heredoc_content_is_not_a_call(self):
+        report = parse_busybox_tests('cat >input <<EOF\ntesting "x" "y" "z"\nEOF\ntesting "a" "c" "e"\n')
+        self.assertEqual([(t.name, t.line) for t in report.tests], [('a', 4)])
+
+    def test_dynamic_arguments_are_rejected(self):
+        report = parse_busybox_tests('testing "a" "c $OPTS" "e"\ntesting "b" "c" "$(cat x)"\n'
+                                     'testing "ok" "c" "e"\n')
+        self.assertEqual([t.name for t in report.tests], ['ok'])
+        self.assertEqual([line for line, _ in report.unparseable], [1, 2])
+
+    def test_too_few_arguments_are_rejected(self):
+        report = parse_busybox_tests('testing "a" "c"\n')
+        self.assertEqual(report.tests, [])
+        self.assertEqual(report.unparseable, [(1, "expected at least 3 arguments, got 2")])
+
+    def test_lex_error_keeps_earlier_calls(self):
+        report = parse_busybox_tests('testing "a" "c" "e"\ntesting "b" "c\n')
+        self.assertEqual([t.name for t in report.tests], ['a'])
+        self.assertEqual(len(report.unparseable), 1)
+        self.assertIn("unterminated double quote", report.unparseable[0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Tests for the columnar case table and the duration lookups built on it"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from testcolumns import CaseTable  # noqa: E402
+from testshards import load_case_durations  # noqa: E402
+
+
+def write_log(directory, name, cases):
+    """A `swift test` log with (suite, test, status, duration) cases"""
+    path = os.path.join(directory, name)
+    with open(path, 'w') as f:
+        for suite, test, status, duration in cases:
+            f.write(f"Test Case '{suite}.{test}' started at 2024-01-01 00:00:00.000\n")
+            f.write(f"Test Case '{suite}.{test}' {status} ({duration:.3f} seconds)\n")
+    return path
+
+
+class CaseTableTests(unittest.TestCase):
+    def setUp(self):
+        self.table = CaseTable()
+        for run, duration in enumerate((0.5, 1.5, 1.0)):
+            run_id = self.table.add_run(f"run{run}")
+            self.table.append(run_id, "SortTests", "testTestName_1", "passed", duration)
+            self.table.append(run_id, "AshTests", "testTestName_1", "failed", 2 * duration)
+            self.table.append(run_id, "SortTests", "testSkipped", "skipped", 0.0)
+
+    def test_samples_are_grouped_per_suite_and_test(self):
+        durations = {key: list(samples) for key, samples in self.table.durations_by_case().items()}
+        self.assertEqual(durations, {("SortTests", "testTestName_1"): [0.5, 1.5, 1.0],
+                                     ("AshTests", "testTestName_1"): [1.0, 3.0, 2.0]})
+
+    def test_iteration_matches_the_dict(self):
+        self.assertEqual(dict(self.table.iter_case_durations()), self.table.durations_by_case())
+
+    def test_samples_by_command(self):
+        durations = {key: list(samples) for key, samples in self.table.durations_by_command().items()}
+        self.assertEqual(durations, {"Sort": [0.5, 1.5, 1.0], "Ash": [1.0, 3.0, 2.0]})
+
+    def test_case_durations_from_logs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            logs = [write_log(tmp, f"run{i}.log", [("SortTests", "testA", "passed", d),
+                                                   ("SortTests", "testB", "skipped", 0.0)])
+                    for i, d in enumerate((0.25, 0.75, 0.5))]
+            self.assertEqual(load_case_durations(logs), {("SortTests", "testA"): 0.5})
+
+
+class CaseTableMemoryTests(unittest.TestCase):
+    CASES = 2000
+    RUNS = 25
+
+    def fill(self, table, runs, unique):
+        for run in range(runs):
+            run_id = table.add_run(f"run{run}")
+            for i in range(self.CASES):
+                name = f"testCase{run}_{i}" if unique else f"testCase{i}"
+                table.append(run_id, f"Suite{i % 40}Tests", name, "passed", 0.01)
+
+    def test_repeated_runs_cost_only_their_rows(self):
+        table = CaseTable()
+        self.fill(table, 1, unique=False)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            self.fill(table, self.RUNS, unique=False)
+            per_row = (tracemalloc.get_traced_memory()[0] - before) / (self.RUNS * self.CASES)
+        finally:
+            tracemalloc.stop()
+        self.assertLess(per_row, 24)
+
+    def test_grouping_adds_flat_arrays(self):
+        # Every name distinct, the worst case for per-case containers
+        table = CaseTable()
+        self.fill(table, self.RUNS, unique=True)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for _ in table.iter_case_durations():
+                pass
+            peak = tracemalloc.get_traced_memory()[1] - before
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak / len(table), 32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""Tests for the SQLite run history"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import testdb  # noqa: E402
+from testlog import parse_log  # noqa: E402
+
+
+def log_lines(statuses):
+    """A `swift test` log with one case per (suite, status)"""
+    lines = []
+    for suite, status in statuses:
+        lines += [f"Test Suite '{suite}' started at 2024-01-01 00:00:00.000\n",
+                  f"Test Case '{suite}.testTestName_1' started at 2024-01-01 00:00:00.000\n",
+                  f"Test Case '{suite}.testTestName_1' {status} (0.010 seconds)\n",
+                  f"Test Suite '{suite}' {status} at 2024-01-01 00:00:00.010\n"]
+    return lines
+
+
+class TestHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.db = testdb.connect(":memory:")
+        runs = [[("SortTests", "passed"), ("AshTests", "failed")],
+                [("SortTests", "failed"), ("AshTests", "failed")],
+                [("SortTests", "passed"), ("AshTests", "failed")]]
+        for i, statuses in enumerate(runs):
+            testdb.insert_run(self.db, parse_log(log_lines(statuses)), f"hash{i}",
+                              f"run{i}.log", f"2024-01-0{i + 1} 00:00:00")
+
+    def test_shared_name_lists_every_suite(self):
+        self.assertEqual(testdb.suites_with_test(self.db, "testTestName_1"),
+                         ["AshTests", "SortTests"])
+
+    def test_history_is_per_suite(self):
+        history = testdb.test_history(self.db, "SortTests", "testTestName_1")
+        self.assertEqual([(row[1], row[2]) for row in history],
+                         [("SortTests", "passed"), ("SortTests", "failed"), ("SortTests", "passed")])
+        self.assertIsNone(testdb.first_failure(history))
+
+    def test_first_failure_of_one_suite(self):
+        history = testdb.test_history(self.db, "AshTests", "testTestName_1")
+        first, last_pass = testdb.first_failure(history)
+        self.assertEqual((first[0], first[4], last_pass), ("2024-01-01 00:00:00", "run0.log", None))
+
+
+if __name__ == "__main__":
+    unittest.main()
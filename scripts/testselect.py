@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Change-impact test selection.
+
+Sources follow a one-file-per-applet layout (Sources/swiftybox/Sort.swift
+implements `sort` and is covered by SortTests), so changed paths map
+directly to suites. Files every applet depends on (the registry, shell
+mode, the BusyBox bridge, the package manifest, TestRunner) select
+everything; documentation and tooling changes select nothing.
+"""
+
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Dict, Iterable, List, Set
+
+SOURCES_DIR = "Sources/swiftybox"
+TESTS_DIR = "Tests/SwiftyBoxTests"
+
+# Changes here can affect every applet
+SHARED_SOURCES = {
+    "CommandRegistry.swift", "ShellMode.swift", "BusyBoxWrappers.swift",
+    "ASHBridge.swift", "MinimalShell.swift", "swiftybox.swift",
+}
+SHARED_PATHS = {"Package.swift", "Package.resolved", f"{TESTS_DIR}/TestRunner.swift"}
+SHARED_PREFIXES = ("BusyBox/",)
+
+# Hand-written classes covering several applets, one test<Cmd>_ method prefix each
+SHARED_TEST_CLASSES = ("BasicCommandTests", "FileOperationTests", "TextProcessingTests")
+
+# Source files implementing more than one applet
+MULTI_COMMAND_SOURCES: Dict[str, List[str]] = {
+    "TrueFalse.swift": ["true", "false"],
+}
+
+
+@dataclass
+class Selection:
+    run_all: bool = False
+    reasons: List[str] = field(default_factory=list)
+    commands: Set[str] = field(default_factory=set)
+    # Test classes selected directly (changed test files)
+    suites: Set[str] = field(default_factory=set)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.run_all or self.commands or self.suites)
+
+
+def changed_files(revisions: Iterable[str] = ("HEAD",)) -> List[str]:
+    """Paths changed in a `git diff` range (default: uncommitted changes)"""
+    result = subprocess.run(["git", "diff", "--name-only", *revisions],
+                            capture_output=True, text=True, check=True)
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def suite_for_command(command: str) -> str:
+    """Test class for a command, named the way the importer names it"""
+    return command.capitalize() + "Tests"
+
+
+def select_tests(paths: Iterable[str]) -> Selection:
+    """Map changed repository paths to the commands and suites they affect"""
+    selection = Selection()
+    for path in paths:
+        p = PurePosixPath(path)
+        if path in SHARED_PATHS or path.startswith(SHARED_PREFIXES):
+            selection.run_all = True
+            selection.reasons.append(f"{path}: shared by all tests")
+        elif p.parent == PurePosixPath(SOURCES_DIR) and p.suffix == ".swift":
+            if p.name in SHARED_SOURCES:
+                selection.run_all = True
+                selection.reasons.append(f"{path}: shared by all applets")
+                continue
+            commands = MULTI_COMMAND_SOURCES.get(p.name, [p.stem.lower()])
+            selection.commands.update(commands)
+            selection.reasons.append(f"{path}: {', '.join(commands)}")
+        elif path.startswith(TESTS_DIR + "/") and p.suffix == ".swift":
+            # Test files are named after the class they hold
+            selection.suites.add(p.stem)
+            selection.reasons.append(f"{path}: {p.stem}")
+    return selection
+
+
+def filter_expression(selection: Selection) -> str:
+    """`swift test --filter` regex for a selection ('' when nothing is affected)
+
+    XCTest matches the filter against `Module.Class/testMethod`. A command's
+    cases live in its own class, in `test<Cmd>_` methods of the shared
+    classes in SHARED_TEST_CLASSES and, after an `import-busybox-tests.py
+    --shards` import, in shard methods prefixed with the command name.
+    """
+    if selection.run_all:
+        return ".*"
+    alternatives = []
+    suites = sorted(selection.suites | {suite_for_command(c) for c in selection.commands})
+    if suites:
+        alternatives.append(rf"\.({'|'.join(suites)})/")
+    if selection.commands:
+        prefixes = sorted(c.capitalize() for c in selection.commands)
+        alternatives.append(rf"\.({'|'.join(SHARED_TEST_CLASSES)})/test({'|'.join(prefixes)})_")
+        alternatives.append(rf"\.BusyBoxShard\d+Tests/test({'|'.join(prefixes)})_")
+    return "|".join(alternatives)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Split test work into duration-balanced shards.
+
+Costs come from historical per-case durations in earlier `swift test`
+logs. Items are packed with the longest-processing-time-first heuristic:
+take items in decreasing cost order and give each to the currently
+lightest shard (a heap keyed on load), which keeps the longest shard
+within 4/3 of the optimum.
+"""
+
+import heapq
+from statistics import median
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple
+
+from testcolumns import CaseTable
+
+
+def load_case_durations(logs: Iterable[str]) -> Dict[Tuple[str, str], float]:
+    """(suite, test) -> median duration in seconds across the given logs"""
+    table = CaseTable.from_logs(logs)
+    return {key: median(samples) for key, samples in table.iter_case_durations()}
+
+
+def lpt_pack(costs: Sequence[Tuple[Hashable, float]], shards: int
+             ) -> List[Tuple[float, List[Hashable]]]:
+    """Pack (item, cost) pairs into `shards` bins, returning (load, items) per bin.
+
+    Ties in cost keep the input order, so the packing is deterministic.
+    """
+    bins: List[Tuple[float, List[Hashable]]] = [(0.0, []) for _ in range(shards)]
+    heap = [(0.0, i) for i in range(shards)]
+    order = sorted(range(len(costs)), key=lambda i: -costs[i][1])
+    for i in order:
+        item, cost = costs[i]
+        load, shard = heapq.heappop(heap)
+        bins[shard][1].append(item)
+        bins[shard] = (load + cost, bins[shard][1])
+        heapq.heappush(heap, (load + cost, shard))
+    return bins
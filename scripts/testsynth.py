@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic inputs for benchmarking the test tooling.
+
+write_log() produces a `swift test` log shaped like the captured ones: a
+build preamble with compiler-warning blocks, then suites of cases in the
+Linux (`Suite.test`) or Darwin (`-[Module.Suite test]`) format, where
+failing cases carry a TestRunner FAIL block and an XCTest assertion line.
+write_tests_dir() produces BusyBox `.tests` files using the constructs the
+importer has to handle: continuations, $'...' strings, `optional` and
+SKIP= guards, heredocs and the occasional call it cannot parse.
+
+Output depends only on the parameters and the seed, so the same request
+gives the same bytes on every machine.
+"""
+
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, TextIO
+
+COMMANDS = ("basename cat chmod cmp comm cp cut date dd df diff dirname du echo env "
+            "expand expr false fold grep head hexdump id ln ls md5sum mkdir mktemp mv "
+            "nl od paste printf pwd readlink realpath rev rm rmdir sed seq sha256sum "
+            "shuf sleep sort stat strings tac tail tee touch tr true uname uniq wc "
+            "which xargs yes").split()
+
+WORDS = ("handles prints counts ignores accepts rejects joins splits reverses sorts "
+         "empty input stdin file files flag option missing trailing leading newline "
+         "whitespace unicode binary long short nested multiple single zero").split()
+
+SOURCE_ROOT = "/home/build/swiftybox/Tests/SwiftyBoxTests"
+MODULE = "SwiftyBoxTests"
+FORMATS = ("linux", "darwin")
+
+# One unused-result warning as swiftc prints it: location, source excerpt, caret
+WARNING_BLOCK = """\
+{path}:{line}:29: warning: result of call to 'createFile(atPath:contents:attributes:)' is unused [#no-usage]
+{p1:>3} |         let testFile = "\\(testDir!)/{word}.txt"
+{line:>3} |         FileManager.default.createFile(atPath: testFile, contents: data)
+    |                             `- warning: result of call to 'createFile(atPath:contents:attributes:)' is unused [#no-usage]
+{n1:>3} |
+{n2:>3} |         let result = runCommand("{command}", [testFile])
+
+"""
+
+
+@dataclass
+class LogStats:
+    cases: int = 0
+    failed: int = 0
+    skipped: int = 0
+    suites: int = 0
+
+
+def _suite_name(index: int) -> str:
+    command = COMMANDS[index % len(COMMANDS)]
+    round_ = index // len(COMMANDS)
+    return f"{command.capitalize()}{round_ or ''}Tests"
+
+
+def _timestamp(clock: datetime) -> str:
+    return clock.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+def write_log(out: TextIO, cases: int, fmt: str = "linux", failure_ratio: float = 0.2,
+              skip_ratio: float = 0.01, warnings_per_100: float = 5.0,
+              seed: int = 0) -> LogStats:
+    """Write a synthetic `swift test` log with `cases` test cases"""
+    rng = random.Random(f"swiftybox-synth-log-{seed}")
+    stats = LogStats()
+    darwin = fmt == "darwin"
+
+    # Build preamble: progress lines interleaved with warning blocks
+    warnings = int(cases * warnings_per_100 / 100)
+    out.write("[0/1] Planning build\nBuilding for debugging...\n")
+    steps = max(1, warnings // 4)
+    for step in range(steps):
+        command = COMMANDS[step % len(COMMANDS)]
+        out.write(f"[{step + 1}/{steps}] Compiling {MODULE} {command.capitalize()}Tests.swift\n")
+        for _ in range(warnings // steps + (step < warnings % steps)):
+            line = rng.randint(10, 400)
+            out.write(WARNING_BLOCK.format(
+                path=f"{SOURCE_ROOT}/Consolidated/{command.capitalize()}Tests.swift", line=line,
+                p1=line - 1, n1=line + 1, n2=line + 2, word=rng.choice(WORDS), command=command))
+    out.write(f"Build complete! ({rng.uniform(5, 60):.2f}s)\n")
+
+    clock = datetime(2025, 1, 1, 12, 0, 0)
+    bundle = f"{MODULE}.xctest" if darwin else "debug.xctest"
+    out.write(f"Test Suite 'All tests' started at {_timestamp(clock)}\n")
+    out.write(f"Test Suite '{bundle}' started at {_timestamp(clock)}\n")
+    run_start = clock
+    suite_index = 0
+    while stats.cases < cases:
+        suite = _suite_name(suite_index)
+        suite_index += 1
+        command = suite[:-len("Tests")].lower()
+        count = min(rng.randint(3, 30), cases - stats.cases)
+        suite_start, failures, skipped = clock, 0, 0
+        lines = [f"Test Suite '{suite}' started at {_timestamp(clock)}"]
+        for i in range(count):
+            test = f"test{suite[:-len('Tests')]}_{'_'.join(rng.choices(WORDS, k=3))}_{i}"
+            case_id = f"-[{MODULE}.{suite} {test}]" if darwin else f"{suite}.{test}"
+            lines.append(f"Test Case '{case_id}' started." if darwin
+                         else f"Test Case '{case_id}' started at {_timestamp(clock)}")
+            duration = rng.choice((0.001, 0.002, 0.051, 0.052, 0.103)) + rng.random() / 100
+            roll = rng.random()
+            if roll < skip_ratio:
+                status = "skipped"
+                skipped += 1
+                lines.append(f"{SOURCE_ROOT}/Consolidated/{suite}.swift:{rng.randint(10, 400)}: "
+                             f"{case_id} : Test skipped - requires root")
+            elif roll < skip_ratio + failure_ratio:
+                status = "failed"
+                failures += 1
+                expected = " ".join(rng.choices(WORDS, k=2))
+                if rng.random() < 0.5:
+                    lines += [f"FAIL: {command} {' '.join(rng.choices(WORDS, k=3))}",
+                              "Expected output:", expected, "Actual output:", "",
+                              f"Exit code: {rng.choice((1, 2, 127))}", ""]
+                lines.append(f"{SOURCE_ROOT}/Consolidated/{suite}.swift:{rng.randint(10, 400)}: "
+                             f"error: {case_id} : XCTAssertEqual failed: (\"\") is not equal to "
+                             f"(\"{expected}\") - {command} should print '{expected}'")
+            else:
+                status = "passed"
+            clock += timedelta(seconds=duration)
+            lines.append(f"Test Case '{case_id}' {status} ({duration:.3f} seconds)"
+                         + ("." if darwin else ""))
+        elapsed = (clock - suite_start).total_seconds()
+        lines.append(f"Test Suite '{suite}' {'failed' if failures else 'passed'} "
+                     f"at {_timestamp(clock)}")
+        skipped_text = f"{skipped} test{'s' if skipped != 1 else ''} skipped and " if skipped else ""
+        lines.append(f"\t Executed {count} test{'s' if count != 1 else ''}, with {skipped_text}"
+                     f"{failures} failure{'s' if failures != 1 else ''} (0 unexpected) "
+                     f"in {elapsed:.3f} ({elapsed:.3f}) seconds")
+        out.write("\n".join(lines) + "\n")
+        stats.cases += count
+        stats.failed += failures
+        stats.skipped += skipped
+        stats.suites += 1
+
+    elapsed = (clock - run_start).total_seconds()
+    outcome = "failed" if stats.failed else "passed"
+    summary = (f"\t Executed {stats.cases} tests, with {stats.failed} failures (0 unexpected) "
+               f"in {elapsed:.3f} ({elapsed:.3f}) seconds\n")
+    out.write(f"Test Suite '{bundle}' {outcome} at {_timestamp(clock)}\n{summary}")
+    out.write(f"Test Suite 'All tests' {outcome} at {_timestamp(clock)}\n{summary}")
+    return stats
+
+
+def _test_call(rng: random.Random, command: str, index: int) -> List[str]:
+    """One `testing` call in one of the shapes found in the BusyBox testsuite"""
+    name = f"{command} {' '.join(rng.choices(WORDS, k=2))} {index}"
+    words = rng.choices(WORDS, k=rng.randint(1, 6))
+    data = "\\n".join(words) + "\\n"
+    shape = rng.random()
+    if shape < 0.45:
+        return [f'testing "{name}" "{command} input" "{data}" "{data}" ""']
+    if shape < 0.75:
+        return [f'testing "{name}" \\',
+                f'\t"{command} -{rng.choice("abcnrsv")} | {command}" \\',
+                f'\t"{data}" \\',
+                f'\t"" "{data}"']
+    if shape < 0.88:
+        tabbed = f"{words[0]}\\t{words[-1]}\\n"
+        return [f'testing "{name}" "{command}" $\'{tabbed}\' "" $\'{tabbed}\'']
+    if shape < 0.97:
+        return [f'testing "{name}" "{command} \'{words[0]}\' input" "{words[0]}\\n" '
+                f'"{data}" ""']
+    # Depends on the shell environment, so the importer reports it unparseable
+    return [f'testing "{name}" "{command} $OPTS input" "$EXPECTED" "{data}" ""']
+
+
+def write_tests_file(out: TextIO, command: str, tests: int, seed: int = 0) -> None:
+    """Write one synthetic BusyBox .tests file with `tests` testing calls"""
+    rng = random.Random(f"swiftybox-synth-tests-{command}-{seed}")
+    lines = ["#!/bin/sh", "# Copyright 2025 by synthetic data",
+             "# Licensed under GPLv2, see file LICENSE in this source tree.", "",
+             ". ./testing.sh", "",
+             '# testing "test name" "command" "result" "infile" "stdin"', ""]
+    for i in range(1, tests + 1):
+        roll = rng.random()
+        if roll < 0.05:
+            lines.append(f"optional FEATURE_{command.upper()}_{rng.choice(WORDS).upper()}")
+            lines += _test_call(rng, command, i)
+            lines.append("SKIP=")
+        elif roll < 0.08:
+            lines += ["cat >input <<EOF", *rng.choices(WORDS, k=4), "EOF"]
+            lines += _test_call(rng, command, i)
+            lines.append("rm -f input")
+        else:
+            lines += _test_call(rng, command, i)
+        lines.append("")
+    lines.append("exit $FAILCOUNT")
+    out.write("\n".join(lines) + "\n")
+
+
+def write_tests_dir(directory: str, tests: int, per_file: int = 50, seed: int = 0) -> int:
+    """Spread `tests` testing calls over <command>.tests files; returns the file count"""
+    os.makedirs(directory, exist_ok=True)
+    files = 0
+    remaining = tests
+    while remaining > 0:
+        count = min(per_file, remaining)
+        command = COMMANDS[files % len(COMMANDS)]
+        if files >= len(COMMANDS):
+            command += str(files // len(COMMANDS))
+        with open(os.path.join(directory, f"{command}.tests"), "w") as f:
+            write_tests_file(f, command, count, seed)
+        files += 1
+        remaining -= count
+    return files
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Statistical comparison of test timings across several runs.
+
+Per-case durations from N baseline logs and M candidate logs are compared
+with a one-sided Mann-Whitney U test (is the candidate slower?). A slowdown
+is only reported when it is significant after Benjamini-Hochberg correction
+for the number of comparisons *and* its effect size (Cliff's delta) and
+median slowdown clear configurable thresholds. Single-run jitter from
+process spawning therefore does not trip the gate.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from statistics import median
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from testcolumns import CaseTable
+
+
+def collect_durations(filenames: Iterable[str]) -> Tuple[Dict[Tuple[str, str], Sequence[float]],
+                                                           Dict[str, Sequence[float]]]:
+    """Gather per-case and per-command duration samples from several logs"""
+    table = CaseTable.from_logs(filenames)
+    return table.durations_by_case(), table.durations_by_command()
+
+
+@lru_cache(maxsize=None)
+def _exact_upper_tail(n: int, m: int) -> Tuple[float, ...]:
+    """tail[s] = P(U >= s) under H0 for tie-free samples of sizes n and m
+
+    Depends only on the sample sizes, so it is built once per (n, m) and
+    shared by every case compared with those sizes.
+    """
+    # dist[i][j][s]: number of orderings of i candidate and j baseline values
+    # with U == s. The largest value is either a candidate (beating all j
+    # baseline values) or a baseline value, which gives the recurrence below.
+    dist = [[[1] for _ in range(m + 1)] for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            counts = [0] * (i * j + 1)
+            for s, c in enumerate(dist[i - 1][j]):
+                counts[s + j] += c
+            for s, c in enumerate(dist[i][j - 1]):
+                counts[s] += c
+            dist[i][j] = counts
+    total = math.comb(n + m, n)
+    tail = []
+    running = 0
+    for c in reversed(dist[n][m]):
+        running += c
+        tail.append(running / total)
+    return tuple(reversed(tail))
+
+
+def _exact_greater_pvalue(u: float, n: int, m: int) -> float:
+    """P(U >= u) under H0 for tie-free samples of sizes n and m"""
+    tail = _exact_upper_tail(n, m)
+    s = math.ceil(u)
+    return tail[s] if s < len(tail) else 0.0
+
+
+def mann_whitney_greater(candidate: List[float], baseline: List[float]) -> Tuple[float, float]:
+    """One-sided Mann-Whitney U test that `candidate` tends to be larger.
+
+    Returns (p-value, Cliff's delta). The exact null distribution is used
+    for small tie-free samples, otherwise the normal approximation with tie
+    and continuity correction.
+    """
+    n, m = len(candidate), len(baseline)
+    pooled = sorted([(v, 0) for v in candidate] + [(v, 1) for v in baseline])
+
+    # Average ranks over ties
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        avg_rank = (i + j) / 2 + 1
+        rank_sum += avg_rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        size = j - i + 1
+        tie_term += size ** 3 - size
+        i = j + 1
+
+    u = rank_sum - n * (n + 1) / 2
+    delta = 2 * u / (n * m) - 1
+
+    if tie_term == 0 and n <= 20 and m <= 20:
+        return _exact_greater_pvalue(u, n, m), delta
+
+    mean = n * m / 2
+    var = n * m / 12 * ((n + m + 1) - tie_term / ((n + m) * (n + m - 1)))
+    if var <= 0:
+        return 1.0, delta
+    z = (u - mean - 0.5) / math.sqrt(var)
+    return 0.5 * math.erfc(z / math.sqrt(2)), delta
+
+
+@dataclass
+class Slowdown:
+    name: str
+    base_median: float
+    cand_median: float
+    p_value: float
+    delta: float
+    samples: Tuple[int, int]
+
+    @property
+    def ratio(self) -> float:
+        return self.cand_median / self.base_median if self.base_median > 0 else math.inf
+
+
+def find_slowdowns(baseline: Dict, candidate: Dict, alpha: float = 0.05,
+                   min_effect: float = 0.33, min_slowdown: float = 0.10,
+                   min_samples: int = 3) -> List[Slowdown]:
+    """Compare matching sample sets and return significant slowdowns, worst first.
+
+    p-values are adjusted with Benjamini-Hochberg across all tested keys.
+    `min_slowdown` is the relative increase in median required on top of
+    significance, so tiny but consistent shifts are not reported.
+    """
+    tested = []
+    for key, cand in candidate.items():
+        base = baseline.get(key)
+        if not base or len(base) < min_samples or len(cand) < min_samples:
+            continue
+        p_value, delta = mann_whitney_greater(cand, base)
+        name = key if isinstance(key, str) else f"{key[0]}.{key[1]}"
+        tested.append(Slowdown(name, median(base), median(cand), p_value, delta,
+                               (len(base), len(cand))))
+
+    # Benjamini-Hochberg step-up adjustment
+    tested.sort(key=lambda s: s.p_value)
+    adjusted = 1.0
+    for rank in range(len(tested), 0, -1):
+        slowdown = tested[rank - 1]
+        adjusted = min(adjusted, slowdown.p_value * len(tested) / rank)
+        slowdown.p_value = adjusted
+
+    significant = [s for s in tested
+                   if s.p_value <= alpha and s.delta >= min_effect
+                   and s.cand_median >= s.base_median * (1 + min_slowdown)]
+    significant.sort(key=lambda s: (-(s.cand_median - s.base_median), s.p_value))
+    return significant
+
+
+def format_slowdowns(title: str, slowdowns: List[Slowdown], limit: int = 50) -> str:
+    """Render a ranked slowdown table"""
+    lines = [f"{title} ({len(slowdowns)} significant):"]
+    if slowdowns:
+        lines.append(f"  {'Name':55} {'base p50':>9} {'cand p50':>9} {'ratio':>6} "
+                     f"{'delta':>6} {'q':>8} {'n':>7}")
+    for s in slowdowns[:limit]:
+        lines.append(f"  {s.name:55} {s.base_median:9.3f} {s.cand_median:9.3f} "
+                     f"{s.ratio:5.2f}x {s.delta:6.2f} {s.p_value:8.2g} "
+                     f"{s.samples[0]:>3}/{s.samples[1]:<3}")
+    if len(slowdowns) > limit:
+        lines.append(f"  ... and {len(slowdowns) - limit} more")
+    return "\n".join(lines)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Group test failures by normalized signature for triage.
+
+A signature is the assertion kind plus its message with the parts that vary
+between otherwise identical failures (numbers, temp paths, UUIDs) masked
+out. Failures are bucketed by signature in a dict, so a large run reduces
+to a short list of root causes.
+
+XCTAssertEqual operands that are whole integers of 255 or less are kept.
+They are usually exit statuses, so 1 and 127 stay in separate clusters.
+TestRunner's teardown check (" - N tests failed") is the exception: its
+operand is a failure count, so it is masked and those assertions collapse
+into one cluster.
+"""
+
+import hashlib
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+from testlog import TestFailure, command_name
+
+_UUID_RE = re.compile(r"[0-9A-Fa-f]{8}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{12}")
+_PATH_RE = re.compile(r"(?:/[\w.@+-]+){2,}/?")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+# A number, or a whole ("123") operand of a comparison assertion
+_NUMBER_OR_OPERAND_RE = re.compile(r"\(\"(\d{1,3})\"\)|\d+(?:\.\d+)?")
+# TestRunner's teardown check, whose operand is a failure count, not a status
+_TEARDOWN_RE = re.compile(r" - \d+ tests failed$")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _mask_number(match: re.Match) -> str:
+    operand = match.group(1)
+    if operand is None:
+        return "N"
+    return match.group(0) if int(operand) <= 255 else '("N")'
+
+
+def failure_signature(failure: TestFailure) -> str:
+    """Normalized, test-independent description of why a case failed"""
+    text = failure.reason if failure.kind else f"unparsed: {failure.reason}"
+    text = _UUID_RE.sub("<uuid>", text)
+    text = _PATH_RE.sub("<path>", text)
+    if failure.kind == "XCTAssertEqual" and not _TEARDOWN_RE.search(failure.reason):
+        # Small integer operands are exit statuses and the like: 127 (not
+        # found) and 1 are different failures, so keep them
+        text = _NUMBER_OR_OPERAND_RE.sub(_mask_number, text)
+    else:
+        text = _NUMBER_RE.sub("N", text)
+    text = _SPACE_RE.sub(" ", text).strip()[:200]
+    if failure.kind and '("' in failure.reason and not (failure.actual or failure.expected):
+        # Multi-line operands: only the first line is on the error line, so
+        # tell clusters apart by assertion site instead
+        text += f" @ {os.path.basename(failure.file)}:{failure.line}"
+    return text
+
+
+@dataclass
+class FailureCluster:
+    signature: str
+    failures: List[TestFailure] = field(default_factory=list)
+
+    @property
+    def cluster_id(self) -> str:
+        return hashlib.sha1(self.signature.encode()).hexdigest()[:8]
+
+    @property
+    def commands(self) -> List[str]:
+        return sorted({command_name(f.suite) for f in self.failures})
+
+    def locations(self, limit: int = 3) -> List[str]:
+        """Most common assertion sites as File.swift:line"""
+        sites = Counter(f"{os.path.basename(f.file)}:{f.line}" for f in self.failures if f.file)
+        return [site for site, _ in sites.most_common(limit)]
+
+
+def cluster_failures(failures: Iterable[TestFailure]) -> List[FailureCluster]:
+    """Bucket failures by signature, largest cluster first"""
+    clusters: Dict[str, FailureCluster] = {}
+    for failure in failures:
+        signature = failure_signature(failure)
+        cluster = clusters.get(signature)
+        if cluster is None:
+            cluster = clusters[signature] = FailureCluster(signature)
+        cluster.failures.append(failure)
+    return sorted(clusters.values(), key=lambda c: (-len(c.failures), c.signature))
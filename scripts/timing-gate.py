@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Fail CI on statistically significant test-timing regressions.
+
+Compares per-test and per-command durations from several baseline runs
+against several candidate runs (see testtiming.py for the statistics).
+
+Usage:
+    python3 scripts/timing-gate.py --baseline base-*.log --candidate cand-*.log
+"""
+
+import argparse
+import sys
+
+from testtiming import collect_durations, find_slowdowns, format_slowdowns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistical test-timing regression gate")
+    parser.add_argument("--baseline", nargs="+", required=True, metavar="LOG",
+                        help="Logs from the reference build")
+    parser.add_argument("--candidate", nargs="+", required=True, metavar="LOG",
+                        help="Logs from the build under test")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="False discovery rate for the Mann-Whitney tests (default: 0.05)")
+    parser.add_argument("--min-effect", type=float, default=0.33,
+                        help="Minimum Cliff's delta to report (default: 0.33, a medium effect)")
+    parser.add_argument("--min-slowdown", type=float, default=0.10,
+                        help="Minimum relative increase of the median (default: 0.10 = 10%%)")
+    parser.add_argument("--min-samples", type=int, default=3,
+                        help="Skip tests with fewer samples per side (default: 3)")
+    parser.add_argument("--limit", type=int, default=50, help="Rows to show per table")
+    args = parser.parse_args()
+
+    try:
+        base_cases, base_commands = collect_durations(args.baseline)
+        cand_cases, cand_commands = collect_durations(args.candidate)
+    except FileNotFoundError as e:
+        print(f"Error: {e.filename} not found", file=sys.stderr)
+        sys.exit(2)
+
+    options = dict(alpha=args.alpha, min_effect=args.min_effect,
+                   min_slowdown=args.min_slowdown, min_samples=args.min_samples)
+    command_slowdowns = find_slowdowns(base_commands, cand_commands, **options)
+    case_slowdowns = find_slowdowns(base_cases, cand_cases, **options)
+
+    print("=" * 80)
+    print("TEST TIMING REGRESSION GATE")
+    print("=" * 80)
+    print(f"Baseline runs: {len(args.baseline)}   Candidate runs: {len(args.candidate)}")
+    print(f"Criteria: BH-adjusted q <= {args.alpha}, Cliff's delta >= {args.min_effect}, "
+          f"median +{args.min_slowdown:.0%}")
+    print()
+    print(format_slowdowns("Commands", command_slowdowns, args.limit))
+    print()
+    print(format_slowdowns("Test cases", case_slowdowns, args.limit))
+
+    sys.exit(1 if command_slowdowns or case_slowdowns else 0)
+
+
+if __name__ == "__main__":
+    main()